@@ -0,0 +1,42 @@
+from .generators import bathymetry_raster, seismic_lines
+
+
+class CalculateResiduals:
+    """Residuals between the riverbed of seismic lines and a bathymetry raster."""
+
+    params = ([20, 100, 400], ["tin", "bilinear", "nearest"])
+    param_names = ["n_lines", "method"]
+    timeout = 300
+
+    def setup(self, n_lines, method):
+        if method == "tin" and n_lines > 100:
+            raise NotImplementedError("Too slow to benchmark")
+        self.data = seismic_lines(n_lines, 500, reflectors=["bathy"])
+        self.raster = bathymetry_raster(5.0)
+
+    def time_calculate_residuals(self, n_lines, method):
+        self.data.waka.calculate_residuals("time", self.raster, method=method)
+
+    def peakmem_calculate_residuals(self, n_lines, method):
+        self.data.waka.calculate_residuals("time", self.raster, method=method)
+
+
+class CalculateResidualsFile:
+    """Residuals against a tiled GeoTIFF, of which only the needed blocks are read."""
+
+    params = [20, 100]
+    param_names = ["n_lines"]
+
+    def setup_cache(self):
+        raster = bathymetry_raster(1.0).rio.write_crs(28992)
+        raster.rio.to_raster("bathymetry.tif", tiled=True, compress="deflate")
+        return "bathymetry.tif"
+
+    def setup(self, path, n_lines):
+        self.data = seismic_lines(n_lines, 500, reflectors=["bathy"])
+
+    def time_calculate_residuals(self, path, n_lines):
+        self.data.waka.calculate_residuals("time", path, method="bilinear")
+
+    def peakmem_calculate_residuals(self, path, n_lines):
+        self.data.waka.calculate_residuals("time", path, method="bilinear")
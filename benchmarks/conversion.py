@@ -0,0 +1,36 @@
+from wakatools.utils import calculate_depth
+
+from .generators import seismic_lines
+
+
+class CalculateDepth:
+    """Convert the time of reflectors below the riverbed to depth for each line."""
+
+    params = ([20, 100, 400], ["vectorised", "loop"])
+    param_names = ["n_lines", "method"]
+    timeout = 600
+
+    def setup(self, n_lines, method):
+        if method == "loop" and n_lines > 20:
+            raise NotImplementedError("Too slow to benchmark")
+        self.data = seismic_lines(n_lines, 500)
+
+    def time_calculate_depth(self, n_lines, method):
+        calculate_depth(self.data, method=method)
+
+    def peakmem_calculate_depth(self, n_lines, method):
+        calculate_depth(self.data, method=method)
+
+
+class CalculateDepthParallel:
+    """Convert time to depth with the seismic lines distributed over workers."""
+
+    params = ([100, 400], ["thread", "process"])
+    param_names = ["n_lines", "executor"]
+    timeout = 600
+
+    def setup(self, n_lines, executor):
+        self.data = seismic_lines(n_lines, 500)
+
+    def time_calculate_depth(self, n_lines, executor):
+        calculate_depth(self.data, n_jobs=-1, executor=executor)
@@ -0,0 +1,104 @@
+"""
+Generators of synthetic, but realistically structured, river survey data for the
+benchmarks. All generators are deterministic for a given seed.
+
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from wakatools.io import kingdom_exports
+from wakatools.utils.spatial import GridSpecs
+
+# Survey area of a river reach, in metres
+REACH_LENGTH = 5000.0
+REACH_WIDTH = 400.0
+REFLECTORS = ["bathy", "reflector1", "reflector2", "reflector3"]
+
+
+def riverbed(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Smooth two-way travel time of the riverbed with a deeper channel."""
+    channel = np.exp(-(((y - REACH_WIDTH / 2) / (REACH_WIDTH / 5)) ** 2))
+    return 0.004 + 0.003 * channel + 0.0005 * np.sin(x / 150)
+
+
+def seismic_lines(
+    n_lines: int,
+    traces_per_line: int,
+    reflectors: list[str] = REFLECTORS,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Parallel seismic lines across the river with several reflectors below the riverbed,
+    in the layout of a Geocard7 export read with `read_seismics`.
+
+    """
+    rng = np.random.default_rng(seed)
+    x_line = np.linspace(0, REACH_LENGTH, n_lines)
+    x = np.repeat(x_line, traces_per_line) + rng.normal(0, 1, n_lines * traces_per_line)
+    y = np.tile(np.linspace(0, REACH_WIDTH, traces_per_line), n_lines)
+    bathy = riverbed(x, y)
+
+    lines = []
+    for depth, reflector in enumerate(reflectors):
+        layer = bathy + depth * 0.002 + rng.normal(0, 1e-5, len(x)) * (depth > 0)
+        lines.append(
+            pd.DataFrame(
+                {
+                    "x": x,
+                    "y": y,
+                    "time": np.round(layer, 6),
+                    "pointcount": np.tile(np.arange(traces_per_line) + 1.0, n_lines),
+                    "pointcountint": np.tile(np.arange(traces_per_line) + 1, n_lines),
+                    "amplitude": np.round(rng.normal(0, 1000, len(x)), 3),
+                    "noclue": 2,
+                    "ID": np.repeat(
+                        [f"line{i}" for i in range(n_lines)], traces_per_line
+                    ),
+                    "reflector": reflector,
+                }
+            )
+        )
+    data = pd.concat(lines, ignore_index=True)
+    return kingdom_exports._apply_column_dtypes(data)
+
+
+def borehole_tops(n_boreholes: int, seed: int = 0) -> pd.DataFrame:
+    """Scattered borehole locations with the top of a layer below the riverbed."""
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(0, REACH_LENGTH, n_boreholes)
+    y = rng.uniform(0, REACH_WIDTH, n_boreholes)
+    top = -5 - 2000 * riverbed(x, y) + rng.normal(0, 0.2, n_boreholes)
+    return pd.DataFrame({"x": x, "y": y, "top": top})
+
+
+def target_grid(resolution: float, chunks: int = None) -> xr.DataArray:
+    """Target grid covering the survey area."""
+    return GridSpecs(
+        bbox=(0, 0, REACH_LENGTH, REACH_WIDTH), resolution=resolution, chunks=chunks
+    ).to_grid()
+
+
+def bathymetry_raster(resolution: float) -> xr.DataArray:
+    """Raster of the riverbed time on a regular grid covering the survey area."""
+    grid = target_grid(resolution)
+    return grid + riverbed(grid["x"], grid["y"])
+
+
+def write_geocard7(filename: str | Path, n_lines: int, traces_per_line: int) -> Path:
+    """Write synthetic seismic lines to a Geocard7 export file."""
+    kingdom_exports.write_geocard7(seismic_lines(n_lines, traces_per_line), filename)
+    return Path(filename)
+
+
+def write_single_horizon(
+    filename: str | Path, n_lines: int, traces_per_line: int
+) -> Path:
+    """Write the riverbed of synthetic seismic lines to a single horizon export file."""
+    data = seismic_lines(n_lines, traces_per_line, reflectors=["bathy"])
+    data["trace"] = data["pointcount"]
+    kingdom_exports.write_single_horizon(data, filename)
+    return Path(filename)
@@ -0,0 +1,89 @@
+import wakatools as waka
+
+from .generators import borehole_tops, seismic_lines, target_grid
+
+
+class TinSurface:
+    """Interpolate the riverbed of seismic lines onto grids of increasing size."""
+
+    params = ([20, 100, 400], [10.0, 2.0, 1.0])
+    param_names = ["n_lines", "resolution"]
+
+    def setup(self, n_lines, resolution):
+        data = seismic_lines(n_lines, 500, reflectors=["bathy"])
+        self.data = data[["x", "y", "time"]]
+        self.grid = target_grid(resolution)
+
+    def time_tin_surface(self, n_lines, resolution):
+        waka.interpolation.tin_surface(self.data, value="time", target_grid=self.grid)
+
+    def peakmem_tin_surface(self, n_lines, resolution):
+        waka.interpolation.tin_surface(self.data, value="time", target_grid=self.grid)
+
+
+class Griddata:
+    """Interpolate the riverbed of seismic lines with `scipy.interpolate.griddata`."""
+
+    params = ([20, 100, 400], ["linear", "nearest"])
+    param_names = ["n_lines", "method"]
+
+    def setup(self, n_lines, method):
+        data = seismic_lines(n_lines, 500, reflectors=["bathy"])
+        self.data = data[["x", "y", "time"]]
+        self.grid = target_grid(2.0)
+
+    def time_griddata(self, n_lines, method):
+        waka.interpolation.griddata(
+            self.data, value="time", target_grid=self.grid, method=method
+        )
+
+    def peakmem_griddata(self, n_lines, method):
+        waka.interpolation.griddata(
+            self.data, value="time", target_grid=self.grid, method=method
+        )
+
+
+class Rbf:
+    """Interpolate scattered borehole tops with global and local RBF models."""
+
+    params = ([100, 1000, 5000], [None, 50])
+    param_names = ["n_boreholes", "neighbors"]
+    timeout = 300
+
+    def setup(self, n_boreholes, neighbors):
+        self.data = borehole_tops(n_boreholes)
+        self.grid = target_grid(10.0)
+
+    def time_rbf(self, n_boreholes, neighbors):
+        waka.interpolation.rbf(
+            self.data, value="top", target_grid=self.grid, neighbors=neighbors
+        )
+
+    def peakmem_rbf(self, n_boreholes, neighbors):
+        waka.interpolation.rbf(
+            self.data, value="top", target_grid=self.grid, neighbors=neighbors
+        )
+
+
+class KDTreeInterpolators:
+    """Interpolate the riverbed of seismic lines with the KD-tree based methods."""
+
+    params = ([20, 100], ["idw", "natural_neighbour"])
+    param_names = ["n_lines", "method"]
+    timeout = 300
+
+    def setup(self, n_lines, method):
+        data = seismic_lines(n_lines, 500, reflectors=["bathy"])
+        self.data = data[["x", "y", "time"]]
+        self.grid = target_grid(2.0)
+        self.interpolate = getattr(waka.interpolation, method)
+
+    def time_interpolate(self, n_lines, method):
+        self.interpolate(
+            self.data, value="time", target_grid=self.grid, max_distance=100
+        )
+
+    def peakmem_interpolate(self, n_lines, method):
+        self.interpolate(
+            self.data, value="time", target_grid=self.grid, max_distance=100
+        )
@@ -0,0 +1,64 @@
+from wakatools import read_seismics
+
+from .generators import write_geocard7, write_single_horizon
+
+# Number of seismic lines of 1000 traces in the export files
+SIZES = [10, 100, 500]
+
+
+class ReadGeocard7:
+    """Read Kingdom Geocard7 (multi-horizon) exports of increasing size."""
+
+    params = (SIZES, [False, True])
+    param_names = ["n_lines", "compact"]
+    timeout = 600
+
+    def setup_cache(self):
+        return {
+            n_lines: write_geocard7(f"geocard7_{n_lines}.dat", n_lines, 1000)
+            for n_lines in SIZES
+        }
+
+    def time_read_seismics(self, files, n_lines, compact):
+        read_seismics(files[n_lines], "multi-horizon", compact=compact)
+
+    def peakmem_read_seismics(self, files, n_lines, compact):
+        read_seismics(files[n_lines], "multi-horizon", compact=compact)
+
+
+class ReadSingleHorizon:
+    """Read Kingdom “X Y Line Trace Time Amplitude” exports of increasing size."""
+
+    params = (SIZES, [False, True])
+    param_names = ["n_lines", "compact"]
+    timeout = 600
+
+    def setup_cache(self):
+        return {
+            n_lines: write_single_horizon(
+                f"single_horizon_{n_lines}.dat", n_lines, 1000
+            )
+            for n_lines in SIZES
+        }
+
+    def time_read_seismics(self, files, n_lines, compact):
+        read_seismics(files[n_lines], "single-horizon", compact=compact)
+
+    def peakmem_read_seismics(self, files, n_lines, compact):
+        read_seismics(files[n_lines], "single-horizon", compact=compact)
+
+
+class ReadMultipleFiles:
+    """Read a glob of Geocard7 exports, one file per survey day."""
+
+    params = [1, -1]
+    param_names = ["n_jobs"]
+    timeout = 600
+
+    def setup_cache(self):
+        for day in range(8):
+            write_geocard7(f"survey_day{day}.dat", 50, 1000)
+        return "survey_day*.dat"
+
+    def time_read_seismics(self, pattern, n_jobs):
+        read_seismics(pattern, "multi-horizon", n_jobs=n_jobs)
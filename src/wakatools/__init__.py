@@ -1,4 +1,5 @@
 from wakatools import base, interpolation
 from wakatools.io.read import read_borehole_xml, read_seismics
+from wakatools.utils.profiling import get_profiler, profile, set_profiling
 
 __version__ = "0.1.0"
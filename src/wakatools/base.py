@@ -1,9 +1,89 @@
+import weakref
+import zlib
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Literal
+
+import geopandas as gpd
 import numpy as np
 import pandas as pd
 import rioxarray  # noqa: F401 (register `rio` accessor and ignore "unused import" warning)
 import xarray as xr
+from scipy.spatial import cKDTree
+
+from .utils import scaling, spatial
+
+# Cached results per DataFrame or DataArray, removed when the object is garbage
+# collected. Pandas creates a new accessor on each attribute access, so results cannot
+# be cached on the accessor itself.
+_object_cache: dict[int, dict] = {}
+
+
+def _cache_for(obj) -> dict:
+    key = id(obj)
+    if key not in _object_cache:
+        _object_cache[key] = {}
+        weakref.finalize(obj, _object_cache.pop, key, None)
+    return _object_cache[key]
+
+
+def _fingerprint(*arrays: np.ndarray) -> tuple:
+    """
+    Cheap version token of arrays to detect changes of cached inputs.
+
+    """
+    return tuple(
+        (array.shape, array.dtype.str, zlib.crc32(np.ascontiguousarray(array)))
+        for array in arrays
+    )
+
+
+def _memoise(obj, name: str, version: tuple, func: Callable):
+    """
+    Get a cached result for an object or compute and cache it with `func` when it is
+    not cached yet or the cached result belongs to a different version of the object.
+
+    """
+    cache = _cache_for(obj)
+    cached = cache.get(name)
+    if cached is None or cached[0] != version:
+        cached = version, func()
+        cache[name] = cached
+    return cached[1]
+
 
-from .utils import scaling
+def _block_coordinates(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Coordinates of all cells of a grid with 1D axes `x` and `y` as an array of shape
+    (len(y) * len(x), 2) in row-major order.
+
+    """
+    coordinates = np.empty((len(y) * len(x), 2), dtype=np.result_type(x, y))
+    coordinates[:, 0] = np.tile(x, len(y))
+    coordinates[:, 1] = np.repeat(y, len(x))
+    return coordinates
+
+
+def _bbox_positions(
+    tree: cKDTree, x: np.ndarray, y: np.ndarray, bbox: tuple
+) -> np.ndarray:
+    """
+    Sorted positions of the coordinates `x` and `y` in a bounding box, including
+    coordinates on the edges, found with a KD-tree of the coordinates.
+
+    """
+    xmin, ymin, xmax, ymax = bbox
+    centre = [(xmin + xmax) / 2, (ymin + ymax) / 2]
+    half_size = max(xmax - xmin, ymax - ymin) / 2
+
+    # Query the square around the bbox with the Chebyshev distance (p=inf)
+    candidates = np.asarray(
+        tree.query_ball_point(centre, half_size, p=np.inf), dtype=int
+    )
+    candidates.sort()
+    x, y = x[candidates], y[candidates]
+    inside = (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
+    return candidates[inside]
 
 
 @pd.api.extensions.register_dataframe_accessor("waka")
@@ -22,10 +102,16 @@ class DataFrameAccessor:
         if not {"x", "y"}.issubset(set(pandas_obj.columns)):
             raise ValueError("DataFrame must have 'x' and 'y' columns.")
 
+    def _version(self) -> tuple:
+        return _fingerprint(
+            self._df["x"].to_numpy(dtype="float64", na_value=np.nan),
+            self._df["y"].to_numpy(dtype="float64", na_value=np.nan),
+        )
+
     def bounds(self) -> tuple:
         """
         Get the bounding box from the coordinates of the DataFrame as xmin, ymin, xmax,
-        ymax.
+        ymax. The result is cached for the DataFrame until the "x" or "y" values change.
 
         Returns
         -------
@@ -33,6 +119,9 @@ class DataFrameAccessor:
             An xmin, ymin, xmax, ymax tuple of the bounding box.
 
         """
+        return _memoise(self._df, "bounds", self._version(), self._bounds)
+
+    def _bounds(self) -> tuple:
         xmin = self._df["x"].min()
         ymin = self._df["y"].min()
         xmax = self._df["x"].max()
@@ -75,16 +164,280 @@ class DataFrameAccessor:
         ys = scaling.scale(self._df["y"].values, min_=ymin, max_=ymax)
         return np.c_[xs, ys]
 
-    def get_raster_values(self, raster: xr.DataArray) -> np.ndarray:
+    @property
+    def sindex(self) -> cKDTree:
+        """
+        Spatial index of the "x" and "y" coordinates in the DataFrame as a
+        `scipy.spatial.cKDTree`. The index is built on first access and cached for the
+        DataFrame. It is rebuilt when the "x" or "y" values in the DataFrame change.
+
+        Returns
+        -------
+        cKDTree
+            KD-tree of the DataFrame coordinates. Indices returned by queries on the
+            tree are positional indices in the DataFrame.
+
+        """
+        return _memoise(
+            self._df, "sindex", self._version(), lambda: cKDTree(self.coordinates())
+        )
+
+    def nearest(
+        self,
+        points: np.ndarray,
+        k: int = 1,
+        max_distance: float = np.inf,
+        workers: int = 1,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k nearest DataFrame coordinates to query points using the spatial index
+        of the DataFrame.
+
+        Parameters
+        ----------
+        points : np.ndarray
+            Array of shape (2,) or (M, 2) with the x and y coordinates of the query
+            points.
+        k : int, optional
+            Number of nearest neighbours to find. The default is 1.
+        max_distance : float, optional
+            Only return neighbours within this distance. The default is np.inf.
+        workers : int, optional
+            Number of workers to query the index in parallel. Use -1 for all available
+            CPUs. The default is 1.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            Distances to the nearest neighbours and their positional indices in the
+            DataFrame, with shape (M,) for k=1 or (M, k) otherwise. Missing neighbours
+            have an infinite distance and index equal to the length of the DataFrame.
+
+        """
+        return self.sindex.query(
+            points, k=k, distance_upper_bound=max_distance, workers=workers
+        )
+
+    def query_radius(
+        self, points: np.ndarray, radius: float, workers: int = 1
+    ) -> np.ndarray:
+        """
+        Find all DataFrame coordinates within a radius of query points using the spatial
+        index of the DataFrame.
+
+        Parameters
+        ----------
+        points : np.ndarray
+            Array of shape (2,) or (M, 2) with the x and y coordinates of the query
+            points.
+        radius : float
+            Search radius around the query points.
+        workers : int, optional
+            Number of workers to query the index in parallel. Use -1 for all available
+            CPUs. The default is 1.
+
+        Returns
+        -------
+        np.ndarray
+            Sorted positional indices in the DataFrame for a single query point, or an
+            object array of shape (M,) with the indices for each query point.
+
+        """
+        return self.sindex.query_ball_point(
+            points, radius, workers=workers, return_sorted=True
+        )
+
+    def clip(self, bbox: tuple) -> pd.DataFrame:
+        """
+        Select the rows of the DataFrame with coordinates in a bounding box, including
+        coordinates on the edges of the bounding box. Candidates are found with the
+        spatial index of the DataFrame.
+
+        Parameters
+        ----------
+        bbox : tuple
+            Bounding box (xmin, ymin, xmax, ymax) to select the DataFrame rows in.
+
+        Returns
+        -------
+        pd.DataFrame
+            Rows of the DataFrame within the bounding box in the original order.
+
+        """
+        x = self._df["x"].to_numpy(dtype="float64", na_value=np.nan)
+        y = self._df["y"].to_numpy(dtype="float64", na_value=np.nan)
+        return self._df.iloc[_bbox_positions(self.sindex, x, y, bbox)]
+
+    def thin(
+        self,
+        tolerance: float,
+        method: Literal["grid", "merge"] = "grid",
+        aggregate: Literal["mean", "median", "first", "priority"] = "mean",
+        value: str | list[str] = None,
+        priority: str = None,
+    ) -> pd.DataFrame:
+        """
+        Thin duplicate and nearly coincident points in the DataFrame, for example picks
+        at crossing seismic lines or overlapping surveys, to a single point per group.
+        Groups are found with a hash grid or with the spatial index of the DataFrame, so
+        thinning runs in near-linear time.
+
+        Parameters
+        ----------
+        tolerance : float
+            Size of the grid cells for `method="grid"` or the distance within which
+            points are merged for `method="merge"`.
+        method : {"grid", "merge"}, optional
+            "grid" keeps one point per cell of a grid with cells of `tolerance` by
+            `tolerance`, aligned to the lower left corner of the points. "merge" merges
+            the points within `tolerance` of a seed point into a group, where the seeds
+            are more than `tolerance` apart, so groups never extend further than
+            `tolerance` from their seed. The default is "grid".
+        aggregate : {"mean", "median", "first", "priority"}, optional
+            How to combine the points in a group. "mean" and "median" aggregate the
+            coordinates and `value` columns, "first" keeps the first point in the
+            DataFrame and "priority" keeps the point with the highest value in the
+            `priority` column. Other columns are taken from the first point in each
+            group. The default is "mean".
+        value : str | list[str], optional
+            Columns to aggregate with "mean" or "median". The default is None, then all
+            numeric columns are aggregated.
+        priority : str, optional
+            Column with the priority of each point, required for "priority".
+
+        Returns
+        -------
+        pd.DataFrame
+            Thinned DataFrame with a row for each group in the order of the first point
+            of each group, indexed by the index of that point.
+
+        Raises
+        ------
+        ValueError
+            If an unknown method or aggregation is given, or if no priority column is
+            given for "priority".
+
+        Examples
+        --------
+        Merge picks within 0.1 m of each other before triangulation:
+
+        >>> thinned = seismics.waka.thin(0.1, method="merge", value="time")
+
+        """
+        if aggregate not in {"mean", "median", "first", "priority"}:
+            raise ValueError(f"Unknown aggregation: {aggregate}")
+        if aggregate == "priority" and priority is None:
+            raise ValueError(
+                "A 'priority' column is required for priority aggregation."
+            )
+
+        labels = self._thin_groups(tolerance, method)
+        first = np.flatnonzero(~pd.Series(labels).duplicated().to_numpy())
+        if len(first) == len(self._df):
+            return self._df.copy()
+
+        if aggregate == "first":
+            return self._df.iloc[first]
+        if aggregate == "priority":
+            priorities = pd.Series(self._df[priority].to_numpy(float))
+            keep = priorities.fillna(-np.inf).groupby(labels).idxmax()
+            return self._df.iloc[keep.to_numpy()]
+
+        if value is None:
+            value = self._df.select_dtypes("number").columns.drop(["x", "y"]).tolist()
+        columns = ["x", "y", value] if isinstance(value, str) else ["x", "y", *value]
+
+        thinned = self._df.iloc[first].copy()
+        aggregated = self._df[columns].groupby(labels).agg(aggregate)
+        for column in columns:
+            thinned[column] = aggregated[column].to_numpy()
+
+        if isinstance(thinned, gpd.GeoDataFrame):
+            thinned[thinned.geometry.name] = gpd.points_from_xy(
+                thinned["x"], thinned["y"], crs=thinned.crs
+            )
+        return thinned
+
+    def _thin_groups(self, tolerance: float, method: str) -> np.ndarray:
+        """
+        Group labels of the points for `thin`, numbered in the order of the first point
+        in each group.
+
+        """
+        if method == "grid":
+            xmin, ymin, _, _ = self.bounds()
+            col = np.floor((self._df["x"].to_numpy() - xmin) / tolerance).astype(int)
+            row = np.floor((self._df["y"].to_numpy() - ymin) / tolerance).astype(int)
+            keys = row * (col.max() + 1) + col
+        elif method == "merge":
+            keys = self._merge_seeds(tolerance)
+        else:
+            raise ValueError(f"Unknown thinning method: {method}")
+
+        labels, _ = pd.factorize(keys)
+        return labels
+
+    def _merge_seeds(self, tolerance: float) -> np.ndarray:
         """
-        Read raster values from a given xarray DataArray nearest to the "x" and "y"
-        coordinates in the DataFrame. This assumes that the raster's coordinates are in
-        the same coordinate reference system as the DataFrame coordinates.
+        Clustering of the points for `thin` with method "merge" into groups around seed
+        points that are more than `tolerance` apart, so a group never extends further
+        than `tolerance` from its seed. Returns the position of the seed of each point.
+
+        The seeds are a maximal independent set of the graph of pairs within
+        `tolerance`, found in rounds on the pair arrays (Luby, 1986). Each point gets a
+        fixed pseudo-random priority. In each round, the ungrouped points without an
+        ungrouped neighbour of higher priority become seeds, and their ungrouped
+        neighbours join the adjacent seed with the highest priority. This takes
+        O(log n) rounds in expectation.
+
+        """
+        n = len(self._df)
+        seeds = np.arange(n)
+        pairs = self.sindex.query_pairs(tolerance, output_type="ndarray")
+        if len(pairs) == 0:
+            return seeds
+
+        priority = np.random.default_rng(0).permutation(n)
+        by_priority = np.empty(n, dtype=int)
+        by_priority[priority] = seeds
+
+        # Pairs in both directions with the priorities of both points
+        first, second = np.r_[pairs[:, 0], pairs[:, 1]], np.r_[pairs[:, 1], pairs[:, 0]]
+        first_priority, second_priority = priority[first], priority[second]
+        ungrouped = np.ones(n, dtype=bool)
+        while len(first):
+            beaten = np.zeros(n, dtype=bool)
+            beaten[first[second_priority > first_priority]] = True
+            is_seed = ungrouped & ~beaten
+
+            joins = is_seed[first] & ~is_seed[second]
+            members = second[joins]
+            best = np.full(n, -1)
+            np.maximum.at(best, members, first_priority[joins])
+            seeds[members] = by_priority[best[members]]
+
+            ungrouped[is_seed] = False
+            ungrouped[members] = False
+            remaining = ungrouped[first] & ungrouped[second]
+            first, second = first[remaining], second[remaining]
+            first_priority = first_priority[remaining]
+            second_priority = second_priority[remaining]
+        return seeds
+
+    def get_raster_values(self, raster: str | Path | xr.DataArray) -> np.ndarray:
+        """
+        Read raster values from a given raster nearest to the "x" and "y" coordinates in
+        the DataFrame. This assumes that the raster's coordinates are in the same
+        coordinate reference system as the DataFrame coordinates.
+
+        Raster files and lazily opened rasters are not loaded entirely. Only the
+        internal blocks of the raster that contain DataFrame coordinates are read (see
+        `wakatools.utils.spatial.sample_raster`).
 
         Parameters
         ----------
-        raster : xr.DataArray
-            The raster DataArray from which to read values.
+        raster : str | Path | xr.DataArray
+            Location of a raster file or the raster DataArray from which to read values.
 
         Returns
         -------
@@ -94,25 +447,41 @@ class DataFrameAccessor:
         """
         from geost.utils.spatial import get_raster_values
 
+        raster = spatial.open_raster(raster)
+        if spatial.is_regular(raster):
+            return spatial.sample_raster(
+                raster, self._df["x"].values, self._df["y"].values, method="nearest"
+            )
         return get_raster_values(self._df["x"], self._df["y"], raster)
 
     def calculate_residuals(
         self,
         value: str,
-        raster: xr.DataArray,
+        raster: str | Path | xr.DataArray,
+        method: Literal["tin", "bilinear", "nearest"] = "tin",
     ) -> np.ndarray:
         """
         Calculate residuals between the values in the DataFrame and the raster values at
-        the DataFrame coordinates. The raster values at the DataFrame coordinates are
-        obtained using TIN interpolation.
+        the DataFrame coordinates. By default, the raster values at the DataFrame
+        coordinates are obtained using TIN interpolation. With "bilinear" or "nearest",
+        regular rasters are sampled directly from the fractional cell indices of the
+        coordinates and only the raster blocks containing DataFrame coordinates are
+        read, which is much faster for large rasters.
 
         Parameters
         ----------
         value : str
             The column name in the DataFrame containing the values to compare against the
             raster.
-        raster : xr.DataArray
-            The raster DataArray to compare against.
+        raster : str | Path | xr.DataArray
+            Location of a raster file or the raster DataArray to compare against.
+        method : {"tin", "bilinear", "nearest"}, optional
+            Method to sample the raster at the DataFrame coordinates. "tin" uses TIN
+            interpolation over the raster cell centres, which requires reading the
+            entire raster. "bilinear" and "nearest" use fast index arithmetic on
+            regular rasters, where bilinear sampling is NaN if a surrounding raster cell
+            is NaN; irregular rasters are still sampled with TIN interpolation. The
+            default is "tin".
 
         Returns
         -------
@@ -123,9 +492,17 @@ class DataFrameAccessor:
         """
         from wakatools.interpolation import _tin
 
-        raster_at_coords = _tin(
-            raster.waka.grid_coordinates(), raster.values.ravel(), self.coordinates()
-        )
+        raster = spatial.open_raster(raster)
+        if method != "tin" and spatial.is_regular(raster):
+            raster_at_coords = spatial.sample_raster(
+                raster, self._df["x"].values, self._df["y"].values, method=method
+            )
+        else:
+            raster_at_coords = _tin(
+                raster.waka.grid_coordinates(),
+                raster.values.ravel(),
+                self.coordinates(),
+            )
         residuals = (raster_at_coords - self._df[value].values).round(3)
         return residuals
 
@@ -146,9 +523,31 @@ class DataArrayAccessor:
         if not {"x", "y"}.issubset(set(xarray_obj.dims)):
             raise ValueError("DataArray must have 'x' and 'y' dimensions.")
 
+    def _version(self) -> tuple:
+        return _fingerprint(self._da.coords["x"].values, self._da.coords["y"].values)
+
+    def grid_axes(self) -> tuple[np.ndarray, np.ndarray, tuple[int, int]]:
+        """
+        Get the x and y coordinates of the grid as 1D axes together with the grid shape.
+        This describes the same grid cells as `grid_coordinates` without materialising
+        an array of all cell coordinates.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, tuple[int, int]]
+            The x coordinates with shape (nx,), the y coordinates with shape (ny,) and
+            the shape (ny, nx) of the grid.
+
+        """
+        x = self._da.coords["x"].values
+        y = self._da.coords["y"].values
+        return x, y, (len(y), len(x))
+
     def grid_coordinates(self) -> np.ndarray:
         """
-        Get an array of all grid coordinates in the DataArray in the shape (N, 2).
+        Get an array of all grid coordinates in the DataArray in the shape (N, 2). The
+        result is cached for the DataArray until the "x" or "y" coordinates change and
+        is therefore read-only.
 
         Returns
         -------
@@ -156,10 +555,15 @@ class DataArrayAccessor:
             An array of shape (N, 2) containing all grid coordinates.
 
         """
-        xgrid, ygrid = np.meshgrid(
-            self._da.coords["x"].values, self._da.coords["y"].values
+        return _memoise(
+            self._da, "grid_coordinates", self._version(), self._grid_coordinates
         )
-        return np.c_[xgrid.ravel(), ygrid.ravel()]
+
+    def _grid_coordinates(self) -> np.ndarray:
+        x, y, _ = self.grid_axes()
+        coordinates = _block_coordinates(x, y)
+        coordinates.flags.writeable = False
+        return coordinates
 
     def grid_coordinates_scaled(self, bbox: tuple = None) -> np.ndarray:
         """
@@ -179,9 +583,86 @@ class DataArrayAccessor:
             An array of shape (N, 2) containing all scaled grid coordinates.
 
         """
+        xs, ys = self._scaled_axes(bbox)
+        return _block_coordinates(xs, ys)
+
+    def _scaled_axes(self, bbox: tuple = None) -> tuple[np.ndarray, np.ndarray]:
         xmin, ymin, xmax, ymax = self._da.rio.bounds() if bbox is None else bbox
 
         xs = scaling.scale(self._da.coords["x"].values, min_=xmin, max_=xmax)
         ys = scaling.scale(self._da.coords["y"].values, min_=ymin, max_=ymax)
-        xgrid, ygrid = np.meshgrid(xs, ys)
-        return np.c_[xgrid.ravel(), ygrid.ravel()]
+        return xs, ys
+
+    def grid_blocks(
+        self, block_size: int = None, tile_shape: tuple[int, int] = None
+    ) -> list[tuple[slice, slice]]:
+        """
+        Split the grid into blocks of cells, either in strips of whole rows or in 2D
+        tiles. Without `block_size` or `tile_shape`, the grid is a single block.
+
+        Parameters
+        ----------
+        block_size : int, optional
+            Maximum number of grid cells in a strip of whole rows. Strips contain at
+            least one row. The default is None.
+        tile_shape : tuple[int, int], optional
+            Number of rows and columns (ny, nx) in each tile. Tiles at the bottom and
+            right edges of the grid can be smaller. Takes precedence over `block_size`.
+            The default is None.
+
+        Returns
+        -------
+        list[tuple[slice, slice]]
+            The row and column slices of each block in row-major order.
+
+        """
+        _, _, shape = self.grid_axes()
+        return spatial.grid_blocks(shape, block_size, tile_shape)
+
+    def iter_grid_coordinates(
+        self,
+        block_size: int = None,
+        tile_shape: tuple[int, int] = None,
+        scaled: bool = False,
+        bbox: tuple = None,
+    ) -> Iterator[tuple[tuple[slice, slice], np.ndarray]]:
+        """
+        Iterate over the grid coordinates in blocks (see `grid_blocks`). Only the
+        coordinates of one block are created at a time, so this is the streaming form
+        of `grid_coordinates` and `grid_coordinates_scaled` for large grids.
+
+        Parameters
+        ----------
+        block_size : int, optional
+            Maximum number of grid cells in a strip of whole rows. The default is None.
+        tile_shape : tuple[int, int], optional
+            Number of rows and columns (ny, nx) in each tile. The default is None.
+        scaled : bool, optional
+            If True, the coordinates are scaled to between 0 and 1 like in
+            `grid_coordinates_scaled`. The default is False.
+        bbox : tuple, optional
+            Bounding box (xmin, ymin, xmax, ymax) to use for scaling. If None, the
+            bounding box of the DataArray is used. The default is None.
+
+        Yields
+        ------
+        tuple[tuple[slice, slice], np.ndarray]
+            The row and column slices of the block in the grid and an array of shape
+            (M, 2) with the coordinates of the block cells in row-major order.
+
+        Examples
+        --------
+        Evaluate a function block by block and write the result into an output grid:
+
+        >>> out = np.full(grid.shape, np.nan)
+        >>> for (rows, cols), coords in grid.waka.iter_grid_coordinates(tile_shape=(256, 256)):
+        ...     out[rows, cols] = func(coords).reshape(out[rows, cols].shape)
+
+        """
+        if scaled:
+            x, y = self._scaled_axes(bbox)
+        else:
+            x, y, _ = self.grid_axes()
+
+        for rows, cols in self.grid_blocks(block_size, tile_shape):
+            yield (rows, cols), _block_coordinates(x[cols], y[rows])
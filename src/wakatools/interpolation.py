@@ -1,15 +1,35 @@
+import json
+import math
+import warnings
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, as_completed, wait
+from dataclasses import asdict, dataclass
+from functools import partial
+from pathlib import Path
+from typing import Literal
+
 import geopandas as gpd
 import numpy as np
 import pandas as pd
 import xarray as xr
 
-from wakatools.validation import validate_input
+from wakatools.base import _bbox_positions, _block_coordinates, _fingerprint
+from wakatools.utils import profiling, scaling, spatial
+from wakatools.utils.parallel import ExecutorType, create_executor, n_workers
+from wakatools.utils.spatial import GridSpecs
+from wakatools.validation import validate_columns, validate_input
 
 
 @validate_input
 def tin_surface(
-    *data: pd.DataFrame | gpd.GeoDataFrame, value: str, target_grid: xr.DataArray
-) -> xr.DataArray:
+    *data: pd.DataFrame | gpd.GeoDataFrame,
+    value: str | list[str],
+    target_grid: xr.DataArray | GridSpecs,
+    interpolator: "TinInterpolator" = None,
+    block_size: int = None,
+    thin: float = None,
+    thin_method: Literal["grid", "merge"] = "merge",
+) -> xr.DataArray | xr.Dataset:
     """
     Interpolate a TIN (Triangulated Irregular Network) surface from a Pandas DataFrame
     containing x,y,value for a set of points using a target grid. The interpolation is
@@ -24,30 +44,440 @@ def tin_surface(
     data : pd.DataFrame | gpd.GeoDataFrame
         One or more DataFrame or GeoDataFrame instances containing 'x', 'y', and 'value'
         columns representing the points to interpolate from.
-    value : str
-        The name of the column in `data` that contains the values to interpolate.
-    target_grid : xr.DataArray
-        Target grid as an xarray DataArray on which to interpolate the values.
+    value : str | list[str]
+        The name of the column in `data` that contains the values to interpolate. A list
+        of column names interpolates all columns at once.
+    target_grid : xr.DataArray | GridSpecs
+        Target grid as an xarray DataArray on which to interpolate the values, or the
+        GridSpecs of the target grid. If the target grid is chunked with Dask, the
+        interpolation is evaluated lazily for each chunk and the result is a
+        Dask-backed DataArray or Dataset.
+    interpolator : TinInterpolator, optional
+        Precomputed triangulation of the input points to reuse, for example when the
+        same data is interpolated onto several target grids. Must be created from the
+        coordinates of the concatenated input data. The default is None, then a new
+        triangulation is created.
+    block_size : int, optional
+        Maximum number of grid cells to interpolate at once. If given, the target grid
+        is processed in blocks of whole rows that are written into a preallocated
+        output array, so that the memory of intermediate arrays is bounded by the block
+        size instead of the size of the target grid. The default is None, then all grid
+        cells are interpolated at once.
+    thin : float, optional
+        Thin the input points with this tolerance into the mean of each group before
+        the triangulation (see `DataFrameAccessor.thin`). Duplicate points slow down
+        the triangulation and give degenerate triangles. An `interpolator` must then
+        be created from the thinned points. The default is None, then the input points
+        are not thinned.
+    thin_method : {"grid", "merge"}, optional
+        Method to thin the input points with if `thin` is given, see
+        `DataFrameAccessor.thin`. The default is "merge".
 
     Returns
     -------
-    xr.DataArray
-        Interpolated values on the target grid as an xarray DataArray.
+    xr.DataArray | xr.Dataset
+        Interpolated values on the target grid as an xarray DataArray. If `value` is a
+        list of columns, an xarray Dataset with a variable for each column.
 
     """
-    data = pd.concat(data, ignore_index=True)
+    data = _concat_points(data, value)
+    if thin is not None:
+        data = data.waka.thin(thin, method=thin_method, value=value)
+
+    if interpolator is None:
+        interpolator = TinInterpolator(data.waka.coordinates())
 
-    interpolated = _tin(
-        data.waka.coordinates(), data[value].values, target_grid.waka.grid_coordinates()
+    return _interpolate_grid(
+        partial(interpolator.interpolate, data[value].values),
+        value,
+        target_grid,
+        block_size,
     )
 
-    return xr.DataArray(
-        interpolated.reshape(target_grid.shape),
+
+def _concat_points(
+    data: tuple[pd.DataFrame | gpd.GeoDataFrame, ...], value: str | list[str]
+) -> pd.DataFrame:
+    """
+    Concatenate the 'x', 'y' and value columns of the input data. Other columns are not
+    copied and the value columns keep their dtype, so large or compact seismic
+    DataFrames can be interpolated without intermediate copies of unused columns.
+
+    """
+    columns = ["x", "y", value] if isinstance(value, str) else ["x", "y", *value]
+    return pd.concat([df[columns] for df in data], ignore_index=True)
+
+
+def _interpolate_grid(
+    func: Callable[[np.ndarray], np.ndarray],
+    value: str | list[str],
+    target_grid: xr.DataArray,
+    block_size: int = None,
+    workers: int = 1,
+) -> xr.DataArray | xr.Dataset:
+    """
+    Evaluate an interpolation function, which maps query points of shape (M, 2) to
+    interpolated values of shape (M,) or (M, K), on all cells of the target grid. If the
+    target grid is chunked with Dask, the result is evaluated lazily per chunk. With
+    more than one worker, blocks of rows are evaluated in parallel.
+
+    """
+    if target_grid.chunks is not None:
+        return _interpolate_lazy(func, value, target_grid)
+
+    if block_size is None and workers != 1:
+        # Several blocks per worker to balance the load between workers
+        block_size = math.ceil(target_grid.size / (4 * n_workers(workers)))
+
+    if block_size is None:
+        interpolated = func(target_grid.waka.grid_coordinates())
+    else:
+        value_shape = () if isinstance(value, str) else (len(value),)
+        interpolated = _interpolate_blocks(
+            func, target_grid, block_size, value_shape, workers
+        )
+
+    return _to_grid(interpolated, value, target_grid)
+
+
+def _interpolate_lazy(
+    func: Callable[[np.ndarray], np.ndarray],
+    value: str | list[str],
+    target_grid: xr.DataArray,
+) -> xr.DataArray | xr.Dataset:
+    """
+    Lazily evaluate an interpolation function on a Dask-chunked target grid. Each chunk
+    is interpolated independently so the output has the same chunks as the target grid
+    and is only computed when the result is loaded or written.
+
+    """
+    x, y, _ = target_grid.waka.grid_axes()
+    return _evaluate_lazy(partial(_interpolate_cells, func, x, y), value, target_grid)
+
+
+def _interpolate_cells(
+    func: Callable[[np.ndarray], np.ndarray],
+    x: np.ndarray,
+    y: np.ndarray,
+    rows: slice,
+    cols: slice,
+) -> np.ndarray:
+    """
+    Evaluate an interpolation function on the grid cells in a block of rows and columns
+    of a grid with axes `x` and `y`.
+
+    """
+    return func(_block_coordinates(x[cols], y[rows]))
+
+
+def _evaluate_lazy(
+    func: Callable[[slice, slice], np.ndarray],
+    value: str | list[str],
+    target_grid: xr.DataArray,
+) -> xr.DataArray | xr.Dataset:
+    """
+    Lazily evaluate a function, which maps a block of rows and columns of the target
+    grid to the values of shape (M,) or (M, K) of the cells in the block, on each chunk
+    of a Dask-chunked target grid with `dask.array.blockwise`. The function is wrapped
+    once with `dask.delayed`, so it is serialised once for the graph instead of into
+    every task.
+
+    """
+    import dask
+    import dask.array
+
+    ychunks, xchunks = target_grid.chunks
+    n_values = None if isinstance(value, str) else len(value)
+
+    # The 1D axes are expanded into the 2D chunks of the grid, which Dask would
+    # otherwise warn about as an increase in the number of chunks
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", dask.array.PerformanceWarning)
+        interpolated = dask.array.blockwise(
+            _evaluate_chunk,
+            "yx" if n_values is None else "yxk",
+            dask.delayed(func),
+            None,
+            dask.array.arange(sum(xchunks), chunks=(xchunks,)),
+            "x",
+            dask.array.arange(sum(ychunks), chunks=(ychunks,)),
+            "y",
+            n_values,
+            None,
+            new_axes={} if n_values is None else {"k": n_values},
+            meta=np.empty((0, 0) if n_values is None else (0, 0, 0)),
+        )
+
+    if n_values is None:
+        return xr.DataArray(
+            interpolated, coords=target_grid.coords, dims=target_grid.dims
+        )
+    return xr.Dataset(
+        {
+            column: (target_grid.dims, interpolated[..., i])
+            for i, column in enumerate(value)
+        },
         coords=target_grid.coords,
-        dims=target_grid.dims,
     )
 
 
+def _evaluate_chunk(
+    func: Callable[[slice, slice], np.ndarray],
+    cols: np.ndarray,
+    rows: np.ndarray,
+    n_values: int | None,
+) -> np.ndarray:
+    """
+    Evaluate a function of a block of rows and columns (see `_evaluate_lazy`) on the
+    chunk with column and row indices `cols` and `rows`. Returns an array of shape
+    (ny, nx) or (ny, nx, K) for K value columns.
+
+    """
+    shape = (len(rows), len(cols))
+    interpolated = func(
+        slice(rows[0], rows[0] + shape[0]), slice(cols[0], cols[0] + shape[1])
+    )
+    if n_values is None:
+        return interpolated.reshape(shape)
+    return interpolated.reshape(*shape, n_values)
+
+
+def _interpolate_blocks(
+    func: Callable[[np.ndarray], np.ndarray],
+    target_grid: xr.DataArray,
+    block_size: int,
+    value_shape: tuple = (),
+    workers: int = 1,
+) -> np.ndarray:
+    """
+    Evaluate an interpolation function on the target grid in blocks of rows and write
+    the results into a preallocated array of shape (M,) or (M, K), where `value_shape`
+    is the trailing shape (K,) of the interpolated values for each point. Blocks are
+    evaluated in a thread pool if more than one worker is used.
+
+    """
+    x, y, (ny, nx) = target_grid.waka.grid_axes()
+    interpolated = np.full((ny, nx, *value_shape), np.nan)
+
+    def evaluate(block: tuple[tuple[slice, slice], np.ndarray]):
+        (rows, cols), coordinates = block
+        out = interpolated[rows, cols]
+        out[...] = func(coordinates).reshape(out.shape)
+
+    blocks = target_grid.waka.iter_grid_coordinates(block_size)
+    if workers == 1:
+        for block in blocks:
+            evaluate(block)
+    else:
+        # Create the coordinates of a block in the worker that evaluates it, so only
+        # the blocks that are being evaluated are in memory
+        def evaluate_slices(slices: tuple[slice, slice]):
+            rows, cols = slices
+            evaluate((slices, _block_coordinates(x[cols], y[rows])))
+
+        with create_executor("thread", workers) as executor:
+            list(
+                executor.map(evaluate_slices, target_grid.waka.grid_blocks(block_size))
+            )
+
+    return interpolated.reshape(ny * nx, *value_shape)
+
+
+def _to_grid(
+    interpolated: np.ndarray, value: str | list[str], target_grid: xr.DataArray
+) -> xr.DataArray | xr.Dataset:
+    """
+    Reshape interpolated values of shape (M,) or (M, K) onto the target grid. Returns a
+    DataArray if a single value column was interpolated or a Dataset with a variable for
+    each column if `value` is a list of columns.
+
+    """
+    if isinstance(value, str):
+        return xr.DataArray(
+            interpolated.reshape(target_grid.shape),
+            coords=target_grid.coords,
+            dims=target_grid.dims,
+        )
+
+    return xr.Dataset(
+        {
+            column: (target_grid.dims, interpolated[:, i].reshape(target_grid.shape))
+            for i, column in enumerate(value)
+        },
+        coords=target_grid.coords,
+    )
+
+
+class TinInterpolator:
+    """
+    Reusable TIN (Triangulated Irregular Network) interpolator. The Delaunay
+    triangulation of the input points is computed once on initialisation and can be
+    evaluated many times for different query points or for different value arrays
+    belonging to the same input points. Instances can be pickled, so a triangulation
+    can be shared with worker processes.
+
+    New points can be added with :meth:`add_points`, which reports the triangles that
+    changed so that results can be updated only where needed (see
+    `update_tin_surface`).
+
+    Parameters
+    ----------
+    points : np.ndarray
+        An array of shape (N, 2) containing the x,y coordinates of the input points.
+
+    Examples
+    --------
+    Triangulate the survey points once and interpolate two different values onto the
+    same target grid:
+
+    >>> tin = TinInterpolator(survey.waka.coordinates())
+    >>> weights = tin.weights(target_grid.waka.grid_coordinates())
+    >>> z = tin.interpolate(survey["z"].values, weights=weights)
+    >>> time = tin.interpolate(survey["time"].values, weights=weights)
+
+    """
+
+    def __init__(self, points: np.ndarray):
+        from scipy.spatial import Delaunay
+
+        with profiling.stage("tin.triangulate", n_points=len(points)):
+            self.triangulation = Delaunay(points)
+
+    @property
+    def npoints(self) -> int:
+        """Number of input points in the triangulation."""
+        return self.triangulation.npoints
+
+    @property
+    def simplices(self) -> np.ndarray:
+        """Indices of the input points forming each triangle, shape (S, 3)."""
+        return self.triangulation.simplices
+
+    @property
+    def transform(self) -> np.ndarray:
+        """Affine transform to barycentric coordinates per triangle, shape (S, 3, 2)."""
+        return self.triangulation.transform
+
+    def add_points(self, points: np.ndarray) -> np.ndarray:
+        """
+        Add points to the triangulation. The new points get the indices following the
+        existing input points, so values for the updated triangulation are the
+        existing values followed by the values of the new points.
+
+        Parameters
+        ----------
+        points : np.ndarray
+            An array of shape (P, 2) containing the x,y coordinates of the new points.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean array of shape (S,) that is True for the triangles of the updated
+            triangulation that did not exist before the points were added. Only query
+            points within these triangles have different interpolated values.
+
+        """
+        from scipy.spatial import Delaunay
+
+        # Triangles are identified by their sorted vertex indices
+        previous = pd.MultiIndex.from_arrays(np.sort(self.simplices, axis=1).T)
+        points = np.concatenate([self.triangulation.points, points])
+        with profiling.stage("tin.triangulate", n_points=len(points)):
+            self.triangulation = Delaunay(points)
+        current = pd.MultiIndex.from_arrays(np.sort(self.simplices, axis=1).T)
+        return ~current.isin(previous)
+
+    def weights(self, query_points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the enclosing triangle of each query point and calculate the barycentric
+        coordinates of the query points within these triangles. The result can be
+        passed to :meth:`interpolate` to evaluate multiple value arrays without
+        repeating the simplex lookup.
+
+        Parameters
+        ----------
+        query_points : np.ndarray
+            An array of shape (M, 2) containing the x,y coordinates of the query points.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            Tuple of an array of shape (M,) with the index of the enclosing triangle of
+            each query point (-1 outside the convex hull) and an array of shape (M, 3)
+            with the barycentric coordinates.
+
+        """
+        with profiling.stage("tin.find_simplex", n_queries=len(query_points)):
+            simplices = self.triangulation.find_simplex(query_points)
+
+        with profiling.stage("tin.barycentric", n_queries=len(query_points)):
+            x = self.transform[simplices, :2]
+            y = query_points - self.transform[simplices, 2]
+            barycentric = np.einsum("ijk,ik->ij", x, y)
+            return simplices, np.c_[barycentric, 1 - barycentric.sum(axis=1)]
+
+    def interpolate(
+        self,
+        values: np.ndarray,
+        query_points: np.ndarray = None,
+        weights: tuple[np.ndarray, np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Interpolate values at query points by taking a weighted average of the values
+        at the vertices of the enclosing triangle, using the barycentric coordinates.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            An array of shape (N,) or (N, K) containing the values associated with each
+            input point of the triangulation. Multiple value columns are interpolated
+            in a single pass.
+        query_points : np.ndarray, optional
+            An array of shape (M, 2) containing the x,y coordinates of the query points
+            to interpolate. Ignored if `weights` are given.
+        weights : tuple[np.ndarray, np.ndarray], optional
+            Precomputed result of :meth:`weights` for the query points.
+
+        Returns
+        -------
+        np.ndarray
+            An array of shape (M,) or (M, K) containing the interpolated values at the
+            query points. Query points outside the convex hull of the input points are
+            NaN.
+
+        Raises
+        ------
+        ValueError
+            If neither `query_points` nor `weights` are given or if the number of values
+            does not match the number of input points.
+
+        """
+        if weights is None:
+            if query_points is None:
+                raise ValueError("Either 'query_points' or 'weights' must be given.")
+            weights = self.weights(query_points)
+
+        values = np.asarray(values)
+        if len(values) != self.npoints:
+            raise ValueError(
+                f"Expected {self.npoints} values for the triangulation, got {len(values)}"
+            )
+
+        simplices, bary_coords = weights
+        with profiling.stage("tin.weighting", n_queries=len(simplices)):
+            corner_values = values[self.simplices[simplices]]
+            if corner_values.ndim > 2:
+                bary_coords = bary_coords[..., np.newaxis]
+
+            interpolated = np.nansum(corner_values * bary_coords, axis=1)
+            interpolated[simplices < 0] = np.nan  # Outside the convex hull of points
+
+        return interpolated
+
+    def __call__(self, values: np.ndarray, query_points: np.ndarray) -> np.ndarray:
+        return self.interpolate(values, query_points)
+
+
 def _tin(
     points: np.ndarray, values: np.ndarray, query_points: np.ndarray
 ) -> np.ndarray:
@@ -73,34 +503,132 @@ def _tin(
         An array of shape (M,) containing the interpolated values at the query points.
 
     """
-    from scipy.spatial import Delaunay
+    return TinInterpolator(points).interpolate(values, query_points)
+
+
+def update_tin_surface(
+    surface: xr.DataArray | xr.Dataset,
+    *data: pd.DataFrame | gpd.GeoDataFrame,
+    value: str | list[str],
+    interpolator: TinInterpolator,
+) -> xr.DataArray:
+    """
+    Update a TIN surface in place after new points were added to the input data,
+    without interpolating all grid cells again. The new points are added to the
+    triangulation of the surface and only the grid cells within triangles that changed
+    are interpolated again.
+
+    Parameters
+    ----------
+    surface : xr.DataArray | xr.Dataset
+        In-memory result of `tin_surface` created with `interpolator`, which is updated
+        in place.
+    data : pd.DataFrame | gpd.GeoDataFrame
+        All input points: the points the surface was created from, in the same order,
+        followed by the new points.
+    value : str | list[str]
+        The name or names of the columns in `data` that were interpolated.
+    interpolator : TinInterpolator
+        Triangulation of the points the surface was created from. The new points are
+        added to this triangulation.
+
+    Returns
+    -------
+    xr.DataArray
+        Boolean mask of the grid cells of the surface that were updated. The bounding
+        box (xmin, ymin, xmax, ymax) of the updated cells is stored in the "dirty_bbox"
+        attribute, or None if no cells were updated.
 
-    def _calculate_barycentric_coordinates(tri, simplex, points):
-        x = tri.transform[simplex, :2]
-        y = points - tri.transform[simplex, 2]
-        barycentric = np.einsum("ijk,ik->ij", x, y)
-        coordinates = np.c_[barycentric, 1 - barycentric.sum(axis=1)]
-        return coordinates
+    Raises
+    ------
+    ValueError
+        If the surface is not in memory or `data` has fewer points than the
+        triangulation.
 
-    tri = Delaunay(points)
-    simplices = tri.find_simplex(query_points)
-    bary_coords = _calculate_barycentric_coordinates(tri, simplices, query_points)
+    Examples
+    --------
+    Create a surface that can be updated and add a new survey line later:
 
-    corner_values = values[tri.simplices[simplices]]
+    >>> tin = TinInterpolator(survey.waka.coordinates())
+    >>> surface = tin_surface(survey, value="z", target_grid=grid, interpolator=tin)
+    >>> survey = pd.concat([survey, new_line], ignore_index=True)
+    >>> dirty = update_tin_surface(surface, survey, value="z", interpolator=tin)
 
-    interpolated = np.nansum(corner_values * bary_coords, axis=1)
-    interpolated[simplices < 0] = np.nan  # Outside the convex hull of points
+    """
+    validate_columns(data, value)
+    data = _concat_points(data, value)
+    if isinstance(surface, xr.DataArray):
+        dirty = xr.zeros_like(surface, dtype=bool)
+        variables = [surface]
+    else:
+        dirty = xr.zeros_like(surface[value[0]], dtype=bool)
+        variables = surface.data_vars.values()
+    dirty.attrs = {"dirty_bbox": None}
 
-    return interpolated
+    if any(not isinstance(var.data, np.ndarray) for var in variables):
+        raise ValueError("Only in-memory surfaces can be updated in place.")
+
+    npoints = interpolator.npoints
+    if len(data) < npoints:
+        raise ValueError(
+            f"Expected at least {npoints} points for the triangulation, got {len(data)}"
+        )
+
+    if len(data) == npoints:
+        return dirty
+
+    changed = interpolator.add_points(data.waka.coordinates()[npoints:])
+    if not changed.any():
+        return dirty
+
+    # Only grid cells within the bounding box of the changed triangles can change
+    vertices = interpolator.triangulation.points[interpolator.simplices[changed]]
+    xmin, ymin = vertices.reshape(-1, 2).min(axis=0)
+    xmax, ymax = vertices.reshape(-1, 2).max(axis=0)
+
+    x, y, _ = dirty.waka.grid_axes()
+    cols = np.flatnonzero((x >= xmin) & (x <= xmax))
+    rows = np.flatnonzero((y >= ymin) & (y <= ymax))
+    if len(cols) == 0 or len(rows) == 0:
+        return dirty
+    rows, cols = slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1)
+
+    simplices, bary_coords = interpolator.weights(_block_coordinates(x[cols], y[rows]))
+    inside = simplices >= 0
+    inside[inside] = changed[simplices[inside]]
+    interpolated = interpolator.interpolate(
+        data[value].values, weights=(simplices[inside], bary_coords[inside])
+    )
+
+    window = dirty.data[rows, cols]
+    window[...] = inside.reshape(window.shape)
+    if isinstance(value, str):
+        surface.data[rows, cols][window] = interpolated
+    else:
+        for i, column in enumerate(value):
+            surface[column].data[rows, cols][window] = interpolated[:, i]
+
+    updated_x = x[cols][window.any(axis=0)]
+    updated_y = y[rows][window.any(axis=1)]
+    if len(updated_x) > 0:
+        xres, yres = (abs(r) for r in dirty.rio.resolution())
+        dirty.attrs["dirty_bbox"] = (
+            float(updated_x.min() - xres / 2),
+            float(updated_y.min() - yres / 2),
+            float(updated_x.max() + xres / 2),
+            float(updated_y.max() + yres / 2),
+        )
+    return dirty
 
 
 @validate_input
 def griddata(
     *data: pd.DataFrame | gpd.GeoDataFrame,
-    value: str,
-    target_grid: xr.DataArray,
+    value: str | list[str],
+    target_grid: xr.DataArray | GridSpecs,
+    block_size: int = None,
     **kwargs,
-) -> xr.DataArray:
+) -> xr.DataArray | xr.Dataset:
     """
     Interpolate values from a Pandas DataFrame containing x,y,value for a set of points
     onto a target grid using SciPy's griddata function.
@@ -110,47 +638,84 @@ def griddata(
     data : pd.DataFrame | gpd.GeoDataFrame
         One or more DataFrame or GeoDataFrame instances containing 'x', 'y', and 'value'
         columns representing the points to interpolate from.
-    value : str
-        The name of the column in `data` that contains the values to interpolate.
-    target_grid : xr.DataArray
-        Target grid as an xarray DataArray on which to interpolate the values.
+    value : str | list[str]
+        The name of the column in `data` that contains the values to interpolate. A list
+        of column names interpolates all columns at once.
+    target_grid : xr.DataArray | GridSpecs
+        Target grid as an xarray DataArray on which to interpolate the values, or the
+        GridSpecs of the target grid. If the target grid is chunked with Dask, the
+        interpolation is evaluated lazily for each chunk and the result is a
+        Dask-backed DataArray or Dataset.
+    block_size : int, optional
+        Maximum number of grid cells to interpolate at once. If given, the target grid
+        is processed in blocks of whole rows that are written into a preallocated
+        output array (see `DataArrayAccessor.iter_grid_coordinates`). The default is
+        None, then all grid cells are interpolated at once.
     **kwargs
         Additional keyword arguments to pass to `scipy.interpolate.griddata`, such as
         `method` which can be 'linear', 'nearest', or 'cubic'. See SciPy documentation
-        for more details.
+        for more details. The interpolator behind the chosen method is created once, so
+        the same model is shared by all chunks of a Dask-chunked target grid.
 
     Returns
     -------
-    xr.DataArray
-        Interpolated values on the target grid as an xarray DataArray.
+    xr.DataArray | xr.Dataset
+        Interpolated values on the target grid as an xarray DataArray. If `value` is a
+        list of columns, an xarray Dataset with a variable for each column.
 
     """
-    from scipy.interpolate import griddata as scipy_griddata
-
-    data = pd.concat(data, ignore_index=True)
+    data = _concat_points(data, value)
 
-    grid_points = target_grid.waka.grid_coordinates()
-    interpolated = scipy_griddata(
-        points=data.waka.coordinates(),
-        values=data[value].values,
-        xi=grid_points,
-        **kwargs,
+    interpolator = _griddata_interpolator(
+        data.waka.coordinates(), data[value].values, **kwargs
     )
 
-    return xr.DataArray(
-        interpolated.reshape(target_grid.shape),
-        coords=target_grid.coords,
-        dims=target_grid.dims,
+    return _interpolate_grid(interpolator, value, target_grid, block_size)
+
+
+def _griddata_interpolator(
+    points: np.ndarray,
+    values: np.ndarray,
+    method: Literal["linear", "nearest", "cubic"] = "linear",
+    fill_value: float = np.nan,
+    rescale: bool = False,
+) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Create the SciPy interpolator that `scipy.interpolate.griddata` uses for 2D input
+    points, so it can be evaluated multiple times without recreating it.
+
+    """
+    from scipy.interpolate import (
+        CloughTocher2DInterpolator,
+        LinearNDInterpolator,
+        NearestNDInterpolator,
     )
 
+    if method == "nearest":
+        return NearestNDInterpolator(points, values, rescale=rescale)
+    elif method == "linear":
+        return LinearNDInterpolator(
+            points, values, fill_value=fill_value, rescale=rescale
+        )
+    elif method == "cubic":
+        return CloughTocher2DInterpolator(
+            points, values, fill_value=fill_value, rescale=rescale
+        )
+    raise ValueError(f"Unknown interpolation method: {method}")
+
 
 @validate_input
 def rbf(
     *data: pd.DataFrame | gpd.GeoDataFrame,
-    value: str,
-    target_grid: xr.DataArray,
+    value: str | list[str],
+    target_grid: xr.DataArray | GridSpecs,
+    neighbors: int = None,
+    block_size: int = None,
+    workers: int = 1,
+    thin: float = None,
+    thin_method: Literal["grid", "merge"] = "merge",
     **kwargs,
-) -> xr.DataArray:
+) -> xr.DataArray | xr.Dataset:
     """
     Interpolate values from a Pandas DataFrame containing x,y,value for a set of points
     onto a target grid using Radial Basis Function (RBF) interpolation.
@@ -160,23 +725,63 @@ def rbf(
     data : pd.DataFrame | gpd.GeoDataFrame
         One or more DataFrame or GeoDataFrame instances containing 'x', 'y', and 'value'
         columns representing the points to interpolate from.
-    value : str
-        The name of the column in `data` that contains the values to interpolate.
-    target_grid : xr.DataArray
-        Target grid as an xarray DataArray on which to interpolate the values.
+    value : str | list[str]
+        The name of the column in `data` that contains the values to interpolate. A list
+        of column names interpolates all columns at once.
+    target_grid : xr.DataArray | GridSpecs
+        Target grid as an xarray DataArray on which to interpolate the values, or the
+        GridSpecs of the target grid. If the target grid is chunked with Dask, the
+        interpolation is evaluated lazily for each chunk and the result is a
+        Dask-backed DataArray or Dataset.
+    neighbors : int, optional
+        Number of nearest input points, found with a KD-tree, that are used to fit a
+        local RBF model for each grid cell. The default is None, then all input points
+        are used in a single global model. See the Notes for the trade-off between
+        accuracy and throughput.
+    block_size : int, optional
+        Maximum number of grid cells to interpolate at once. The target grid is then
+        processed in blocks of whole rows. The default is None, then all grid cells are
+        interpolated at once, or, if more than one worker is used, a block size is
+        chosen that gives each worker several blocks.
+    workers : int, optional
+        Number of threads to evaluate blocks of the target grid in parallel. Use -1 to
+        use all available CPUs. The default is 1.
+    thin : float, optional
+        Thin the input points with this tolerance into the mean of each group before
+        fitting the RBF model (see `DataFrameAccessor.thin`). Duplicate points make
+        the RBF system singular and nearly coincident points make it ill-conditioned
+        and larger. The default is None, then the input points are not thinned.
+    thin_method : {"grid", "merge"}, optional
+        Method to thin the input points with if `thin` is given, see
+        `DataFrameAccessor.thin`. The default is "merge".
     **kwargs
         Additional keyword arguments to pass to `scipy.interpolate.RBFInterpolator`,
         such as `kernel`, `epsilon`, etc. See SciPy documentation for more details.
 
     Returns
     -------
-    xr.DataArray
-        Interpolated values on the target grid as an xarray DataArray.
+    xr.DataArray | xr.Dataset
+        Interpolated values on the target grid as an xarray DataArray. If `value` is a
+        list of columns, an xarray Dataset with a variable for each column.
+
+    Notes
+    -----
+    The global RBF model (`neighbors=None`) solves a dense linear system of all N input
+    points, which costs O(N^3) time and O(N^2) memory and is only practical up to a few
+    thousand points. With `neighbors=k`, a local system of k points is solved for each
+    distinct neighbourhood, which costs roughly O(M k^3) for M grid cells and scales to
+    hundreds of thousands of points. The local model is exact at the input points but
+    is only continuous within regions sharing the same neighbourhood, so small steps
+    can occur where the neighbourhood changes. Larger values of `neighbors` give
+    smoother surfaces closer to the global model at a higher cost; values between 30
+    and 100 are usually a good balance for seismic picks.
 
     """
     from scipy.interpolate import RBFInterpolator
 
-    data = pd.concat(data, ignore_index=True)
+    data = _concat_points(data, value)
+    if thin is not None:
+        data = data.waka.thin(thin, method=thin_method, value=value)
 
     # Use scaled coordinates for better numerical stability
     scaled_coords = data.waka.coordinates_scaled(bbox=target_grid.rio.bounds())
@@ -184,14 +789,929 @@ def rbf(
     rbf = RBFInterpolator(
         scaled_coords,
         data[value].values,
+        neighbors=neighbors,
         **kwargs,
     )
 
-    grid_points = target_grid.waka.grid_coordinates_scaled()
-    interpolated = rbf(grid_points)
+    return _interpolate_grid(
+        partial(_evaluate_scaled, rbf, target_grid.rio.bounds()),
+        value,
+        target_grid,
+        block_size,
+        workers,
+    )
 
-    return xr.DataArray(
-        interpolated.reshape(target_grid.shape),
-        coords=target_grid.coords,
-        dims=target_grid.dims,
+
+def _evaluate_scaled(
+    func: Callable[[np.ndarray], np.ndarray], bbox: tuple, query_points: np.ndarray
+) -> np.ndarray:
+    """
+    Evaluate an interpolation function for query points that are scaled to between 0
+    and 1 based on a bounding box (xmin, ymin, xmax, ymax).
+
+    """
+    xmin, ymin, xmax, ymax = bbox
+    xs = scaling.scale(query_points[:, 0], min_=xmin, max_=xmax)
+    ys = scaling.scale(query_points[:, 1], min_=ymin, max_=ymax)
+    return func(np.c_[xs, ys])
+
+
+KDTREE_BLOCK_SIZE = 100_000
+
+
+@validate_input
+def idw(
+    *data: pd.DataFrame | gpd.GeoDataFrame,
+    value: str | list[str],
+    target_grid: xr.DataArray | GridSpecs,
+    power: int | float = 2,
+    k: int = 12,
+    max_distance: int | float = np.inf,
+    block_size: int = KDTREE_BLOCK_SIZE,
+    workers: int = -1,
+) -> xr.DataArray | xr.Dataset:
+    """
+    Interpolate values from a Pandas DataFrame containing x,y,value for a set of points
+    onto a target grid using Inverse Distance Weighting (IDW). Each grid cell is the
+    weighted average of the `k` nearest input points within `max_distance`, with
+    weights 1 / distance^power. Grid cells that coincide with an input point get the
+    value of that point.
+
+    Parameters
+    ----------
+    data : pd.DataFrame | gpd.GeoDataFrame
+        One or more DataFrame or GeoDataFrame instances containing 'x', 'y', and 'value'
+        columns representing the points to interpolate from.
+    value : str | list[str]
+        The name of the column in `data` that contains the values to interpolate. A list
+        of column names interpolates all columns at once.
+    target_grid : xr.DataArray | GridSpecs
+        Target grid as an xarray DataArray on which to interpolate the values, or the
+        GridSpecs of the target grid. If the target grid is chunked with Dask, the
+        interpolation is evaluated lazily for each chunk and the result is a
+        Dask-backed DataArray or Dataset.
+    power : int | float, optional
+        Power of the inverse distance weights. Higher powers give more weight to the
+        nearest points. The default is 2.
+    k : int, optional
+        Number of nearest input points to use for each grid cell. The default is 12.
+    max_distance : int | float, optional
+        Only input points within this distance of a grid cell are used. Grid cells
+        without input points within this distance are NaN. The default is np.inf.
+    block_size : int, optional
+        Maximum number of grid cells to query at once. The target grid is processed in
+        blocks of whole rows to bound the memory of the (block_size, k) neighbour
+        arrays. The default is 100,000.
+    workers : int, optional
+        Number of workers for the KD-tree queries. The default is -1, which uses all
+        available CPUs.
+
+    Returns
+    -------
+    xr.DataArray | xr.Dataset
+        Interpolated values on the target grid as an xarray DataArray. If `value` is a
+        list of columns, an xarray Dataset with a variable for each column.
+
+    """
+    data = _concat_points(data, value)
+    query = partial(
+        _query_neighbours,
+        data.waka.sindex,
+        k=k,
+        max_distance=max_distance,
+        workers=workers,
+    )
+    return _interpolate_grid(
+        partial(_idw, query, data[value].values, power), value, target_grid, block_size
+    )
+
+
+def _query_neighbours(
+    tree, query_points: np.ndarray, k: int, max_distance: float, workers: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Query the k nearest input points of query points in a KD-tree. Returns the
+    distances and indices with shape (M, k), where missing neighbours have index 0, and
+    a mask of shape (M, k) of the neighbours that were found.
+
+    """
+    distances, idx = tree.query(
+        query_points, k=k, distance_upper_bound=max_distance, workers=workers
+    )
+    if k == 1:
+        distances, idx = distances[:, np.newaxis], idx[:, np.newaxis]
+    found = np.isfinite(distances)
+    idx = np.where(found, idx, 0)
+    return distances, idx, found
+
+
+def _idw(
+    query: Callable, values: np.ndarray, power: float, query_points: np.ndarray
+) -> np.ndarray:
+    """
+    Evaluate inverse distance weighting at query points with neighbours from `query`
+    (see `_query_neighbours`) for values of shape (N,) or (N, K).
+
+    """
+    distances, idx, found = query(query_points)
+
+    with np.errstate(divide="ignore"):
+        weights = np.where(found, distances ** -float(power), 0.0)
+
+    # Query points on top of input points only use the coinciding points
+    coincide = found & (distances == 0)
+    on_point = coincide.any(axis=1)
+    weights[on_point] = coincide[on_point]
+
+    neighbour_values = values[idx]
+    if neighbour_values.ndim > 2:
+        weights = np.broadcast_to(weights[..., np.newaxis], neighbour_values.shape)
+    weights = np.where(np.isnan(neighbour_values), 0.0, weights)
+
+    total = weights.sum(axis=1)
+    with np.errstate(invalid="ignore"):
+        interpolated = np.nansum(weights * neighbour_values, axis=1) / total
+    interpolated[total == 0] = np.nan
+    return interpolated
+
+
+@validate_input
+def natural_neighbour(
+    *data: pd.DataFrame | gpd.GeoDataFrame,
+    value: str | list[str],
+    target_grid: xr.DataArray | GridSpecs,
+    max_distance: int | float = None,
+    block_size: int = None,
+    workers: int = -1,
+) -> xr.DataArray | xr.Dataset:
+    """
+    Interpolate values from a Pandas DataFrame containing x,y,value for a set of points
+    onto a regular target grid using discrete natural neighbour (Sibson) interpolation.
+
+    Each grid cell c is assigned the value of its nearest input point, found with a
+    KD-tree, at distance r(c). Every grid cell q is then the average of the values
+    assigned to all cells c with q in the circle around c with radius r(c). This is the
+    discrete approximation of Sibson's natural neighbour interpolation by Park et al.
+    (2006), which gives smooth surfaces that fill gaps between sparse survey lines and
+    honour the input points.
+
+    Parameters
+    ----------
+    data : pd.DataFrame | gpd.GeoDataFrame
+        One or more DataFrame or GeoDataFrame instances containing 'x', 'y', and 'value'
+        columns representing the points to interpolate from.
+    value : str | list[str]
+        The name of the column in `data` that contains the values to interpolate. A list
+        of column names interpolates all columns at once.
+    target_grid : xr.DataArray | GridSpecs
+        Regular target grid as an xarray DataArray on which to interpolate the values,
+        or the GridSpecs of the target grid. If the target grid is chunked with Dask,
+        each chunk padded by the overlap is interpolated lazily and the result is a
+        Dask-backed DataArray or Dataset.
+    max_distance : int | float, optional
+        Only grid cells within this distance of an input point are interpolated, other
+        grid cells are NaN. This is also the overlap between blocks or chunks of the
+        target grid. The default is None, then all grid cells are interpolated and the
+        overlap is the largest distance from a grid cell to its nearest input point,
+        which takes an extra pass of KD-tree queries over the grid.
+    block_size : int, optional
+        Maximum number of grid cells to interpolate at once. The target grid is then
+        processed in blocks of whole rows, each padded by the overlap, so that the
+        memory of the KD-tree queries and FFTs scales with the block size instead of
+        the grid size. The default is None, then all grid cells are interpolated in a
+        single block.
+    workers : int, optional
+        Number of workers for the KD-tree queries. The default is -1, which uses all
+        available CPUs.
+
+    Returns
+    -------
+    xr.DataArray | xr.Dataset
+        Interpolated values on the target grid as an xarray DataArray. If `value` is a
+        list of columns, an xarray Dataset with a variable for each column.
+
+    References
+    ----------
+    Park, S. W., Linsen, L., Kreylos, O., Owens, J. D., & Hamann, B. (2006). Discrete
+    Sibson interpolation. IEEE Transactions on Visualization and Computer Graphics,
+    12(2), 243-253.
+
+    """
+    data = _concat_points(data, value)
+    tree = data.waka.sindex
+    values = data[value].values
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+
+    x, y, (ny, nx) = target_grid.waka.grid_axes()
+    resolution = tuple(abs(r) for r in target_grid.rio.resolution())
+    lazy = target_grid.chunks is not None
+
+    halo = (0, 0)
+    if block_size is not None or lazy:
+        # Blocks are padded by the largest circle radius, so that the circles around
+        # the cells outside a block that reach into the block are included
+        reach = max_distance
+        if reach is None:
+            reach = _max_nearest_distance(
+                tree, x, y, block_size or KDTREE_BLOCK_SIZE, workers
+            )
+        cell_size = min(resolution)
+        reach = np.round(reach / cell_size) * cell_size
+        halo = (int(reach // resolution[1]), int(reach // resolution[0]))
+
+    interpolate_block = partial(
+        _natural_neighbour_block,
+        tree,
+        values,
+        x,
+        y,
+        resolution,
+        halo,
+        np.inf if max_distance is None else max_distance,
+        {},  # Cache of the disc spectra, which are the same for most blocks
+        workers,
+    )
+    if lazy:
+        return _evaluate_lazy(interpolate_block, value, target_grid)
+
+    interpolated = np.full((ny, nx, values.shape[1]), np.nan)
+    for rows, cols in spatial.grid_blocks((ny, nx), block_size):
+        out = interpolated[rows, cols]
+        out[...] = interpolate_block(rows, cols).reshape(out.shape)
+
+    interpolated = interpolated.reshape(ny * nx, -1)
+    if isinstance(value, str):
+        interpolated = interpolated[:, 0]
+    return _to_grid(interpolated, value, target_grid)
+
+
+def _max_nearest_distance(
+    tree, x: np.ndarray, y: np.ndarray, block_size: int, workers: int
+) -> float:
+    """
+    Largest distance from a cell of a grid with axes `x` and `y` to its nearest input
+    point. The grid is queried in blocks of rows to bound the memory.
+
+    """
+    largest = 0.0
+    for rows, cols in spatial.grid_blocks((len(y), len(x)), block_size):
+        distances, _ = tree.query(
+            _block_coordinates(x[cols], y[rows]), k=1, workers=workers
+        )
+        largest = max(largest, distances.max(initial=0.0))
+    return largest
+
+
+def _natural_neighbour_block(
+    tree,
+    values: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    resolution: tuple[float, float],
+    halo: tuple[int, int],
+    max_distance: float,
+    kernels: dict,
+    workers: int,
+    rows: slice,
+    cols: slice,
+) -> np.ndarray:
+    """
+    Discrete natural neighbour interpolation of values of shape (N, K) on the cells in
+    a block of rows and columns of a grid with axes `x` and `y`. Only the block padded
+    by `halo` rows and columns is queried and spread, so the memory scales with the
+    size of the block. Returns the interpolated values of shape (M, K).
+
+    """
+    xres, yres = resolution
+    cell_size = min(xres, yres)
+    halo_rows, halo_cols = halo
+    window_rows = slice(
+        max(rows.start - halo_rows, 0), min(rows.stop + halo_rows, len(y))
+    )
+    window_cols = slice(
+        max(cols.start - halo_cols, 0), min(cols.stop + halo_cols, len(x))
+    )
+    block = (
+        slice(rows.start - window_rows.start, rows.stop - window_rows.start),
+        slice(cols.start - window_cols.start, cols.stop - window_cols.start),
+    )
+
+    distances, idx, found = _query_neighbours(
+        tree,
+        _block_coordinates(x[window_cols], y[window_rows]),
+        k=1,
+        max_distance=max_distance,
+        workers=workers,
+    )
+    shape = (window_rows.stop - window_rows.start, window_cols.stop - window_cols.start)
+    distances, idx, found = (a.reshape(shape) for a in (distances, idx, found))
+
+    # Circles are grouped by their radius in whole cells and spread by convolving the
+    # values of each group with a disc of that radius
+    radius = np.where(found, np.round(distances / cell_size), -1).astype(int)
+
+    interpolated = np.full(
+        (rows.stop - rows.start, cols.stop - cols.start, values.shape[1]), np.nan
     )
+    for i in range(values.shape[1]):
+        assigned = values[idx, i]
+        valid = found & ~np.isnan(assigned)
+        total, count = _spread_discs(
+            np.where(valid, assigned, 0.0),
+            np.where(valid, radius, -1),
+            cell_size,
+            resolution,
+            kernels,
+            workers,
+        )
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result = total[block] / count[block]
+        result[count[block] < 0.5] = np.nan  # Allow rounding errors of the FFT
+        result[~found[block]] = np.nan
+        interpolated[..., i] = result
+    return interpolated.reshape(-1, values.shape[1])
+
+
+def _spread_discs(
+    values: np.ndarray,
+    radius: np.ndarray,
+    cell_size: float,
+    resolution: tuple[float, float],
+    kernels: dict,
+    workers: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Spread the values of grid cells over the cells within a disc around each cell,
+    where `radius` is the radius of the disc in multiples of `cell_size` (-1 to skip a
+    cell). Returns the sum and the number of values spread onto each cell.
+
+    The cells are convolved with a disc kernel for each radius. The convolutions are
+    summed in the frequency domain, so each radius only needs a single forward FFT of
+    the grid. The sum and the number of values are the real and imaginary part of a
+    single complex grid. Kernel spectra are cached in `kernels` for reuse.
+
+    """
+    from scipy import fft
+
+    xres, yres = resolution
+    radii = np.unique(radius[radius >= 0])
+    if len(radii) == 0:
+        return np.zeros(values.shape), np.zeros(values.shape)
+
+    # All kernels are centred in a frame that fits the largest disc
+    half_rows = int(radii[-1] * cell_size // yres)
+    half_cols = int(radii[-1] * cell_size // xres)
+    fshape = (
+        fft.next_fast_len(values.shape[0] + 2 * half_rows, real=False),
+        fft.next_fast_len(values.shape[1] + 2 * half_cols, real=False),
+    )
+    spread = np.where(radius >= 0, values + 1j, 0)
+
+    spectrum = np.zeros(fshape, dtype=complex)
+    for r in radii:
+        key = (r, half_rows, half_cols, fshape)
+        if key not in kernels:
+            kernel = np.zeros((2 * half_rows + 1, 2 * half_cols + 1))
+            disc = _disc(r * cell_size, xres, yres)
+            dr = (kernel.shape[0] - disc.shape[0]) // 2
+            dc = (kernel.shape[1] - disc.shape[1]) // 2
+            kernel[dr : dr + disc.shape[0], dc : dc + disc.shape[1]] = disc
+            kernels[key] = fft.fft2(kernel, s=fshape, workers=workers)
+
+        group = np.where(radius == r, spread, 0)
+        spectrum += fft.fft2(group, s=fshape, workers=workers) * kernels[key]
+
+    summed = fft.ifft2(spectrum, workers=workers)
+    summed = summed[
+        half_rows : half_rows + values.shape[0], half_cols : half_cols + values.shape[1]
+    ]
+    return summed.real, summed.imag
+
+
+def _disc(radius: float, xres: float, yres: float) -> np.ndarray:
+    """
+    Kernel of the grid cells within a radius of the centre cell for a grid with cell
+    sizes `xres` and `yres`.
+
+    """
+    nrows, ncols = int(radius // yres), int(radius // xres)
+    dy = np.arange(-nrows, nrows + 1)[:, np.newaxis] * yres
+    dx = np.arange(-ncols, ncols + 1) * xres
+    return (dx**2 + dy**2 <= radius**2 + 1e-9).astype(float)
+
+
+VARIOGRAM_MODELS = {
+    "spherical": lambda h: 1.5 * np.minimum(h, 1) - 0.5 * np.minimum(h, 1) ** 3,
+    "exponential": lambda h: 1 - np.exp(-3 * h),
+    "gaussian": lambda h: 1 - np.exp(-3 * h**2),
+}
+
+
+@dataclass
+class Variogram:
+    """
+    Variogram model for kriging. The semivariance at distance h > 0 is
+    nugget + (sill - nugget) * f(h / range), where f is the spherical, exponential or
+    gaussian model scaled so that `range` is the (practical) distance at which the
+    semivariance reaches the sill.
+
+    Parameters
+    ----------
+    model : {"spherical", "exponential", "gaussian"}, optional
+        Variogram model. The default is "spherical".
+    nugget : float, optional
+        Semivariance at infinitely small distances. The default is 0.
+    sill : float, optional
+        Semivariance at distances beyond the range. The default is 1.
+    range : float, optional
+        Distance at which the semivariance reaches the sill. The default is 1.
+
+    Raises
+    ------
+    ValueError
+        If the variogram model is unknown.
+
+    Examples
+    --------
+    Fit a variogram model to the empirical variogram of survey points:
+
+    >>> empirical = empirical_variogram(survey, value="z")
+    >>> variogram = Variogram.fit(empirical, model="exponential")
+
+    """
+
+    model: Literal["spherical", "exponential", "gaussian"] = "spherical"
+    nugget: float = 0.0
+    sill: float = 1.0
+    range: float = 1.0
+
+    def __post_init__(self):
+        if self.model not in VARIOGRAM_MODELS:
+            raise ValueError(f"Unknown variogram model: {self.model}")
+
+    def __call__(self, distance: np.ndarray) -> np.ndarray:
+        """Semivariance at the given distances."""
+        distance = np.asarray(distance, dtype=float)
+        structure = VARIOGRAM_MODELS[self.model](distance / self.range)
+        semivariance = self.nugget + (self.sill - self.nugget) * structure
+        return np.where(distance > 0, semivariance, 0.0)
+
+    def covariance(self, distance: np.ndarray) -> np.ndarray:
+        """Covariance at the given distances, which is the sill minus the semivariance."""
+        return self.sill - self(distance)
+
+    @classmethod
+    def fit(
+        cls,
+        empirical: pd.DataFrame,
+        model: Literal["spherical", "exponential", "gaussian"] = "spherical",
+    ) -> "Variogram":
+        """
+        Fit a variogram model to an empirical variogram with weighted least squares,
+        where lags with more point pairs get more weight.
+
+        Parameters
+        ----------
+        empirical : pd.DataFrame
+            Empirical variogram with 'lag', 'semivariance' and 'npairs' columns (see
+            `empirical_variogram`).
+        model : {"spherical", "exponential", "gaussian"}, optional
+            Variogram model to fit. The default is "spherical".
+
+        Returns
+        -------
+        Variogram
+            Fitted variogram model.
+
+        """
+        from scipy.optimize import curve_fit
+
+        if model not in VARIOGRAM_MODELS:
+            raise ValueError(f"Unknown variogram model: {model}")
+
+        lag = empirical["lag"].values
+        semivariance = empirical["semivariance"].values
+
+        def func(h, nugget, partial_sill, range_):
+            return nugget + partial_sill * VARIOGRAM_MODELS[model](h / range_)
+
+        max_lag = lag.max()
+        p0 = (0.0, max(semivariance.max(), 1e-12), max_lag / 2)
+        (nugget, partial_sill, range_), _ = curve_fit(
+            func,
+            lag,
+            semivariance,
+            p0=p0,
+            sigma=1 / np.sqrt(empirical["npairs"].values),
+            bounds=([0, 0, 1e-6 * max_lag], [np.inf, np.inf, np.inf]),
+        )
+        return cls(model, float(nugget), float(nugget + partial_sill), float(range_))
+
+
+def empirical_variogram(
+    *data: pd.DataFrame | gpd.GeoDataFrame,
+    value: str,
+    n_lags: int = 20,
+    max_lag: int | float = None,
+    sample_size: int = 5000,
+    block_size: int = 1000,
+    seed: int = None,
+) -> pd.DataFrame:
+    """
+    Compute the empirical variogram of values from a Pandas DataFrame containing
+    x,y,value for a set of points. The semivariance of all point pairs is averaged in
+    bins of the distance between the points.
+
+    Large DataFrames are randomly sampled to `sample_size` points first. The pair
+    distances are computed in blocks of `block_size` points at a time, so the memory
+    use is bounded by `block_size` * `sample_size` instead of the number of pairs.
+
+    Parameters
+    ----------
+    data : pd.DataFrame | gpd.GeoDataFrame
+        One or more DataFrame or GeoDataFrame instances containing 'x', 'y', and 'value'
+        columns.
+    value : str
+        The name of the column in `data` that contains the values.
+    n_lags : int, optional
+        Number of distance bins. The default is 20.
+    max_lag : int | float, optional
+        Maximum distance between point pairs. The default is None, then half of the
+        diagonal of the bounding box of the points is used.
+    sample_size : int, optional
+        Maximum number of points to use. The default is 5000.
+    block_size : int, optional
+        Number of points to compute the pair distances for at once. The default is
+        1000.
+    seed : int, optional
+        Seed of the random sample of points. The default is None.
+
+    Returns
+    -------
+    pd.DataFrame
+        Empirical variogram with the mean 'lag' distance, mean 'semivariance' and
+        number of point pairs 'npairs' for each distance bin with point pairs.
+
+    """
+    validate_columns(data, value)
+    data = _concat_points(data, value).dropna(subset=[value])
+    if len(data) > sample_size:
+        data = data.sample(sample_size, random_state=seed)
+
+    coordinates = data.waka.coordinates()
+    values = data[value].values
+    if max_lag is None:
+        xmin, ymin, xmax, ymax = data.waka.bounds()
+        max_lag = np.hypot(xmax - xmin, ymax - ymin) / 2
+
+    lags = np.zeros(n_lags)
+    semivariance = np.zeros(n_lags)
+    npairs = np.zeros(n_lags)
+    n = len(data)
+    for start in range(0, n, block_size):
+        # Pairs of the points in the block with all points after them
+        stop = min(start + block_size, n)
+        other = slice(start + 1, n)
+        distance = np.hypot(
+            coordinates[start:stop, 0, np.newaxis] - coordinates[other, 0],
+            coordinates[start:stop, 1, np.newaxis] - coordinates[other, 1],
+        )
+        upper = np.arange(start, stop)[:, np.newaxis] < np.arange(other.start, n)
+        pairs = upper & (distance < max_lag)
+
+        bins = (distance[pairs] / max_lag * n_lags).astype(int)
+        squared = (values[start:stop, np.newaxis] - values[other])[pairs] ** 2
+        lags += np.bincount(bins, weights=distance[pairs], minlength=n_lags)
+        semivariance += np.bincount(bins, weights=0.5 * squared, minlength=n_lags)
+        npairs += np.bincount(bins, minlength=n_lags)
+
+    has_pairs = npairs > 0
+    return pd.DataFrame(
+        {
+            "lag": lags[has_pairs] / npairs[has_pairs],
+            "semivariance": semivariance[has_pairs] / npairs[has_pairs],
+            "npairs": npairs[has_pairs].astype(int),
+        }
+    )
+
+
+KRIGING_BLOCK_SIZE = 10_000
+
+
+@validate_input
+def kriging(
+    *data: pd.DataFrame | gpd.GeoDataFrame,
+    value: str,
+    target_grid: xr.DataArray | GridSpecs,
+    variogram: Variogram | Literal["spherical", "exponential", "gaussian"] = (
+        "spherical"
+    ),
+    k: int = 16,
+    max_distance: int | float = np.inf,
+    block_size: int = KRIGING_BLOCK_SIZE,
+    workers: int = -1,
+    **variogram_kwargs,
+) -> xr.Dataset:
+    """
+    Interpolate values from a Pandas DataFrame containing x,y,value for a set of points
+    onto a target grid using ordinary kriging in a moving neighbourhood. Each grid cell
+    is estimated from its `k` nearest input points within `max_distance`, found with a
+    KD-tree, so no covariance matrix of all input points is needed.
+
+    The kriging systems are solved in batches of `block_size` grid cells, which bounds
+    the memory to arrays of shape (block_size, k + 1, k + 1).
+
+    Parameters
+    ----------
+    data : pd.DataFrame | gpd.GeoDataFrame
+        One or more DataFrame or GeoDataFrame instances containing 'x', 'y', and 'value'
+        columns representing the points to interpolate from.
+    value : str
+        The name of the column in `data` that contains the values to interpolate.
+    target_grid : xr.DataArray | GridSpecs
+        Target grid as an xarray DataArray on which to interpolate the values, or the
+        GridSpecs of the target grid. If the target grid is chunked with Dask, the
+        interpolation is evaluated lazily for each chunk.
+    variogram : Variogram | {"spherical", "exponential", "gaussian"}, optional
+        Variogram model, or the name of a model to fit to the empirical variogram of
+        the input points (see `empirical_variogram` and `Variogram.fit`). The default
+        is "spherical".
+    k : int, optional
+        Number of nearest input points to use for each grid cell. The default is 16.
+    max_distance : int | float, optional
+        Only input points within this distance of a grid cell are used. Grid cells
+        without input points within this distance are NaN. The default is np.inf.
+    block_size : int, optional
+        Number of grid cells to solve the kriging systems for at once. The default is
+        10,000.
+    workers : int, optional
+        Number of workers for the KD-tree queries. The default is -1, which uses all
+        available CPUs.
+    **variogram_kwargs
+        Additional keyword arguments for `empirical_variogram` if the variogram is
+        fitted, such as `n_lags`, `max_lag` or `sample_size`.
+
+    Returns
+    -------
+    xr.Dataset
+        Dataset with the kriging 'estimate' and kriging 'variance' on the target grid.
+        The parameters of the variogram model are stored in the attributes.
+
+    """
+    data = _concat_points(data, value).dropna(subset=[value])
+    if not isinstance(variogram, Variogram):
+        empirical = empirical_variogram(data, value=value, **variogram_kwargs)
+        variogram = Variogram.fit(empirical, model=variogram)
+
+    query = partial(
+        _query_neighbours,
+        data.waka.sindex,
+        k=k,
+        max_distance=max_distance,
+        workers=workers,
+    )
+    krige = partial(
+        _krige, query, data.waka.coordinates(), data[value].values, variogram
+    )
+    result = _interpolate_grid(krige, ["estimate", "variance"], target_grid, block_size)
+    result.attrs.update(
+        {f"variogram_{key}": param for key, param in asdict(variogram).items()}
+    )
+    return result
+
+
+def _krige(
+    query: Callable,
+    coordinates: np.ndarray,
+    values: np.ndarray,
+    variogram: Variogram,
+    query_points: np.ndarray,
+) -> np.ndarray:
+    """
+    Solve the ordinary kriging systems of query points with neighbours from `query`
+    (see `_query_neighbours`) in a single batch. Returns the estimate and the kriging
+    variance as an array of shape (M, 2).
+
+    """
+    distances, idx, found = query(query_points)
+    interpolated = np.full((len(query_points), 2), np.nan)
+    has_neighbours = found.any(axis=1)
+    distances, idx, found = (a[has_neighbours] for a in (distances, idx, found))
+    m, k = idx.shape
+
+    neighbours = coordinates[idx]
+    pair_distance = np.linalg.norm(
+        neighbours[:, :, np.newaxis] - neighbours[:, np.newaxis], axis=-1
+    )
+    pairs = found[:, :, np.newaxis] & found[:, np.newaxis]
+
+    # Neighbours that were not found get an identity row and column with zero weight.
+    # A small jitter on the diagonal keeps systems with duplicate points solvable.
+    diagonal = np.arange(k)
+    lhs = np.zeros((m, k + 1, k + 1))
+    lhs[:, :k, :k] = np.where(pairs, variogram.covariance(pair_distance), 0.0)
+    lhs[:, diagonal, diagonal] += np.where(found, 1e-10 * variogram.sill, 1.0)
+    lhs[:, :k, k] = found
+    lhs[:, k, :k] = found
+
+    rhs = np.zeros((m, k + 1))
+    rhs[:, :k] = np.where(found, variogram.covariance(distances), 0.0)
+    rhs[:, k] = 1.0
+
+    solution = np.linalg.solve(lhs, rhs[..., np.newaxis])[..., 0]
+    weights, lagrange = solution[:, :k], solution[:, k]
+
+    interpolated[has_neighbours, 0] = np.sum(weights * values[idx], axis=1)
+    variance = variogram.sill - np.sum(weights * rhs[:, :k], axis=1) - lagrange
+    interpolated[has_neighbours, 1] = np.maximum(variance, 0.0)
+    return interpolated
+
+
+TILED_METHODS = {
+    "tin": tin_surface,
+    "griddata": griddata,
+    "rbf": rbf,
+    "idw": idw,
+    "natural_neighbour": natural_neighbour,
+}
+
+
+def interpolate_tiled(
+    *data: pd.DataFrame | gpd.GeoDataFrame,
+    value: str,
+    target_grid: GridSpecs | xr.DataArray,
+    output: str | Path,
+    method: Literal["tin", "griddata", "rbf", "idw", "natural_neighbour"] = "tin",
+    tile_size: int = 1024,
+    halo: int | float = None,
+    n_jobs: int = 1,
+    executor: ExecutorType = "process",
+    resume: bool = True,
+    dtype: str = "float32",
+    **kwargs,
+) -> Path:
+    """
+    Interpolate values from one or more DataFrames onto a grid that is too large to fit
+    in memory. The grid is split into square tiles that are interpolated independently
+    and written straight into a tiled GeoTIFF or a Zarr store, so the memory use is
+    bounded by the tile size instead of the size of the grid.
+
+    For each tile, the input points within the tile plus a halo around it are selected
+    with the spatial index of the input data (see `DataFrameAccessor.clip`). The halo
+    must be large enough to contain the points that influence the interpolation at the
+    tile edges, otherwise there can be seams or gaps between tiles.
+
+    Tiles are interpolated in a pool of workers while the main process writes the
+    finished tiles. Each written tile is recorded in a sidecar file next to the output
+    ("<output>.tiles"), so an interrupted job resumes by skipping the tiles that were
+    already written.
+
+    Parameters
+    ----------
+    data : pd.DataFrame | gpd.GeoDataFrame
+        One or more DataFrame or GeoDataFrame instances containing 'x', 'y', and 'value'
+        columns representing the points to interpolate from.
+    value : str
+        The name of the column in `data` that contains the values to interpolate.
+    target_grid : GridSpecs | xr.DataArray
+        Specifications of the target grid, or a regular target grid to take the
+        specifications from.
+    output : str | Path
+        Location of the output. A ".zarr" suffix writes a Zarr store, which requires
+        Zarr and Dask, otherwise a GeoTIFF is written.
+    method : {"tin", "griddata", "rbf", "idw", "natural_neighbour"}, optional
+        Interpolation function to use for each tile: `tin_surface`, `griddata`, `rbf`,
+        `idw` or `natural_neighbour`. The default is "tin".
+    tile_size : int, optional
+        Number of rows and columns of the tiles, which must be a multiple of 16 for
+        GeoTIFF output. The default is 1024.
+    halo : int | float, optional
+        Distance around each tile, in the units of the grid, to select input points in.
+        The default is None, then a quarter of the tile extent is used.
+    n_jobs : int, optional
+        Number of workers to interpolate tiles in parallel, or -1 for all available
+        CPUs. The default is 1, then tiles are interpolated in the main process.
+    executor : {"thread", "process"}, optional
+        Type of pool to use if more than one worker is used. The default is "process".
+    resume : bool, optional
+        If True, continue writing an existing output and skip the tiles that were
+        already written. An output can only be resumed with the same grid, tiling,
+        halo, method, keyword arguments and input points. If False, the output is
+        overwritten. The default is True.
+    dtype : str, optional
+        Data type of the output values. The default is "float32".
+    **kwargs
+        Additional keyword arguments for the interpolation function.
+
+    Returns
+    -------
+    Path
+        Location of the output.
+
+    Raises
+    ------
+    ValueError
+        If an unknown interpolation method is given or an existing output cannot be
+        resumed because it was written for a different grid, tiling, method, keyword
+        arguments or input points.
+
+    """
+    from wakatools.io.tiles import GeoTiffTileWriter, TileLog, ZarrTileWriter
+
+    if method not in TILED_METHODS:
+        raise ValueError(f"Unknown interpolation method: {method}")
+    validate_columns(data, value)
+
+    points = _concat_points(data, value)
+    if not isinstance(target_grid, GridSpecs):
+        target_grid = GridSpecs.from_grid(target_grid)
+    if halo is None:
+        halo = tile_size * max(target_grid.resolution) / 4
+
+    columns = [points[column].to_numpy(dtype="float64") for column in points]
+    output = Path(output)
+    layout = {
+        "shape": list(target_grid.shape),
+        "transform": list(target_grid.transform)[:6],
+        "tile_size": tile_size,
+        "halo": halo,
+        "value": value,
+        "method": method,
+        "kwargs": kwargs,
+        "points": _fingerprint(*columns),
+    }
+    # Compare the layout as it is read back from the JSON header of the log
+    layout = json.loads(json.dumps(layout, default=str))
+    log = TileLog(output, layout, resume)
+    overwrite = not log.completed
+    if output.suffix == ".zarr":
+        writer = ZarrTileWriter(output, target_grid, tile_size, dtype, overwrite, value)
+    else:
+        writer = GeoTiffTileWriter(output, target_grid, tile_size, dtype, overwrite)
+
+    # Select the points of each tile from a single spatial index
+    tree = points.waka.sindex
+    x, y = columns[0], columns[1]
+
+    def tiles():
+        for rows, cols in spatial.grid_blocks(
+            target_grid.shape, tile_shape=(tile_size, tile_size)
+        ):
+            tile = (rows.start, cols.start)
+            if tile in log:
+                continue
+
+            specs = target_grid.window(rows, cols)
+            bbox = spatial.buffer_bbox(specs.bounds, halo)
+            tile_points = points.iloc[_bbox_positions(tree, x, y, bbox)]
+            if len(tile_points) == 0:
+                log.add(tile)  # Unwritten tiles are nodata
+                continue
+            yield (rows, cols), tile_points, specs
+
+    def write(slices: tuple[slice, slice], values: np.ndarray):
+        rows, cols = slices
+        with profiling.stage("interpolate_tiled.write", n_cells=values.size):
+            writer.write(rows, cols, values)
+        log.add((rows.start, cols.start))
+
+    interpolate = partial(_interpolate_tile, method, value, kwargs)
+    if n_jobs == 1:
+        for slices, tile_points, specs in tiles():
+            write(slices, interpolate(tile_points, specs))
+        return output
+
+    # Limit the number of submitted tiles to bound the memory of pending results
+    max_pending = 2 * n_workers(n_jobs)
+    with create_executor(executor, n_jobs) as pool:
+        pending = {}
+        for slices, tile_points, specs in tiles():
+            pending[pool.submit(interpolate, tile_points, specs)] = slices
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    write(pending.pop(future), future.result())
+        for future in as_completed(pending):
+            write(pending[future], future.result())
+
+    return output
+
+
+def _interpolate_tile(
+    method: str, value: str, kwargs: dict, points: pd.DataFrame, specs: GridSpecs
+) -> np.ndarray:
+    """
+    Interpolate the points onto a single tile of a tiled grid. Tiles with too few or
+    collinear points for a triangulation are NaN.
+
+    """
+    from scipy.spatial import QhullError
+
+    try:
+        interpolated = TILED_METHODS[method](
+            points, value=value, target_grid=specs, **kwargs
+        )
+    except QhullError:
+        return np.full(specs.shape, np.nan)
+    return interpolated.values
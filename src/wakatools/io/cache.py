@@ -0,0 +1,262 @@
+import contextlib
+import hashlib
+import json
+import os
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+
+CACHE_FOLDER = ".wakatools_cache"
+CACHE_SUFFIX = ".feather"
+CACHE_FORMAT_VERSION = 2
+CATEGORIES_METADATA = b"wakatools.categories"
+
+
+@dataclass
+class CacheSettings:
+    """
+    Settings of the on-disk cache for parsed export files.
+
+    Attributes
+    ----------
+    directory : str | Path, optional
+        Directory to store all cache files in. The default is None, then the cache files
+        are stored in a ".wakatools_cache" folder next to each export file.
+    max_size : int
+        Maximum total size in bytes of the cache files in a cache directory. When the
+        limit is exceeded, the least recently used cache files are removed. The default
+        is 2 GiB.
+
+    """
+
+    directory: str | Path = None
+    max_size: int = 2 * 1024**3
+
+
+settings = CacheSettings()
+
+
+def set_cache(directory: str | Path = None, max_size: int = None, reset: bool = False):
+    """
+    Configure the on-disk cache for parsed export files. Settings that are not given
+    are kept.
+
+    Parameters
+    ----------
+    directory : str | Path, optional
+        Directory to store all cache files in. The default is None, then the current
+        directory is kept.
+    max_size : int, optional
+        Maximum total size in bytes of the cache files in a cache directory. The default
+        is None, then the current limit is kept.
+    reset : bool, optional
+        If True, restore the default settings before applying `directory` and
+        `max_size`, so that the cache files are stored in a ".wakatools_cache" folder
+        next to each export file again. The default is False.
+
+    Examples
+    --------
+    Store all cache files in one directory and limit the cache to 500 MiB:
+
+    >>> set_cache("~/.cache/wakatools", max_size=500 * 1024**2)
+
+    Store the cache files next to the export files again:
+
+    >>> set_cache(reset=True)
+
+    """
+    if reset:
+        default = CacheSettings()
+        settings.directory, settings.max_size = default.directory, default.max_size
+    if directory is not None:
+        settings.directory = directory
+    if max_size is not None:
+        settings.max_size = max_size
+
+
+def cache_key(filename: str | Path, reader: Callable, **kwargs) -> str:
+    """
+    Create the cache key of an export file, which is based on the absolute path, size
+    and modification time of the file and the reader function and its options.
+
+    Parameters
+    ----------
+    filename : str | Path
+        Path to the export file.
+    reader : Callable
+        Reader function used to parse the file.
+    **kwargs
+        Options passed to the reader function.
+
+    Returns
+    -------
+    str
+        Hexadecimal hash of the file properties and reader options.
+
+    """
+    path = Path(filename).resolve()
+    stat = path.stat()
+    properties = {
+        "path": str(path),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "reader": f"{reader.__module__}.{reader.__qualname__}",
+        "options": kwargs,
+        "version": CACHE_FORMAT_VERSION,
+    }
+    encoded = json.dumps(properties, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def cache_directory(filename: str | Path) -> Path:
+    """
+    Get the cache directory of an export file from the cache settings.
+
+    Parameters
+    ----------
+    filename : str | Path
+        Path to the export file.
+
+    Returns
+    -------
+    Path
+        Directory to store the cache file of the export file in.
+
+    """
+    if settings.directory is not None:
+        return Path(settings.directory)
+    return Path(filename).resolve().parent / CACHE_FOLDER
+
+
+def read_cached(
+    filename: str | Path, reader: Callable[..., pd.DataFrame], **kwargs
+) -> pd.DataFrame:
+    """
+    Read an export file with a reader function and store the result in the on-disk
+    cache, or load the result from the cache if the file was read before with the same
+    reader and options and has not changed since.
+
+    Parameters
+    ----------
+    filename : str | Path
+        Path to the export file.
+    reader : Callable[..., pd.DataFrame]
+        Reader function to parse the file if it is not in the cache.
+    **kwargs
+        Options to pass to the reader function.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with the parsed content of the file.
+
+    """
+    directory = cache_directory(filename)
+    key = cache_key(filename, reader, **kwargs)
+    path = directory / f"{Path(filename).stem}-{key[:16]}{CACHE_SUFFIX}"
+
+    if path.exists():
+        os.utime(path)  # Mark as recently used for the eviction policy
+        return _load(path)
+
+    data = reader(filename, **kwargs)
+
+    directory.mkdir(parents=True, exist_ok=True)
+    _store(data, path)
+    evict(directory, settings.max_size)
+    return data
+
+
+def evict(directory: str | Path, max_size: int):
+    """
+    Remove the least recently used cache files from a cache directory until the total
+    size of the cache files is at most `max_size` bytes.
+
+    Parameters
+    ----------
+    directory : str | Path
+        Cache directory to clean up.
+    max_size : int
+        Maximum total size in bytes of the cache files in the directory.
+
+    """
+    files = [(f, f.stat()) for f in Path(directory).glob(f"*{CACHE_SUFFIX}")]
+    files.sort(key=lambda f: f[1].st_mtime_ns, reverse=True)
+
+    total_size = 0
+    for file, stat in files:
+        total_size += stat.st_size
+        if total_size > max_size:
+            # Files that are still memory-mapped cannot be removed on Windows
+            with contextlib.suppress(PermissionError):
+                file.unlink(missing_ok=True)
+
+
+def clear(directory: str | Path = None):
+    """
+    Remove all cache files from a cache directory.
+
+    Parameters
+    ----------
+    directory : str | Path, optional
+        Cache directory to clear. The default is None, then the directory from the cache
+        settings is cleared.
+
+    """
+    directory = settings.directory if directory is None else directory
+    if directory is None:
+        raise ValueError("No cache directory given or configured to clear.")
+
+    for file in Path(directory).glob(f"*{CACHE_SUFFIX}"):
+        file.unlink(missing_ok=True)
+
+
+def _store(data: pd.DataFrame, path: Path):
+    """
+    Write a DataFrame as uncompressed Feather file with a single record batch, so that
+    the columns are contiguous in the file and can be memory-mapped without copying.
+    The file is written to a temporary file first to prevent partial cache files. Arrow
+    does not keep the dtype of the categories of categorical columns, so these are
+    stored in the schema metadata.
+
+    """
+    table = pa.Table.from_pandas(data)
+    categories = {
+        column: str(data[column].cat.categories.dtype)
+        for column in data.select_dtypes("category")
+    }
+    metadata = {**table.schema.metadata, CATEGORIES_METADATA: json.dumps(categories)}
+    table = table.replace_schema_metadata(metadata)
+
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    feather.write_feather(
+        table, tmp_path, compression="uncompressed", chunksize=max(len(data), 1)
+    )
+    os.replace(tmp_path, path)
+
+
+def _load(path: Path) -> pd.DataFrame:
+    """
+    Read a cached DataFrame from a memory-mapped Feather file and restore the dtype of
+    the categories of categorical columns. Numeric columns without missing values are
+    read-only views of the memory map, so they are only paged in when they are used.
+    Other columns are converted to pandas and are copied.
+
+    """
+    table = feather.read_table(path, memory_map=True)
+    metadata = table.schema.metadata or {}
+    data = table.to_pandas(split_blocks=True, self_destruct=True)
+    del table  # Released column by column by self_destruct
+
+    categories = json.loads(metadata.get(CATEGORIES_METADATA, b"{}"))
+    for column, dtype in categories.items():
+        categorical = data[column].cat
+        if str(categorical.categories.dtype) != dtype:
+            data[column] = categorical.set_categories(
+                categorical.categories.astype(dtype)
+            )
+    return data
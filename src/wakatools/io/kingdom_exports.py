@@ -1,17 +1,57 @@
+import io
+import locale
+import mmap
 import re
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
 
 COLUMN_DTYPE_SCHEMA = {
     "x": "float64",
     "y": "float64",
     "time": "float64",
-    "ID": "String",
+    "pointcount": "float64",
+    "pointcountint": "int64",
+    "amplitude": "float64",
+    "noclue": "int64",
+    "ID": "string",
     "reflector": "string",
 }
 
+COMPACT_COLUMN_DTYPE_SCHEMA = {
+    "pointcount": "int32",
+    "pointcountint": "int32",
+    "trace": "int32",
+    "noclue": "int32",
+    "ID": "category",
+    "reflector": "category",
+}
+
+FLOAT32_COLUMNS = ["time", "amplitude"]
+
+GEOCARD7_COLUMNS = [
+    "x",
+    "y",
+    "time",
+    "pointcount",
+    "pointcountint",
+    "amplitude",
+    "noclue",
+    "ID",
+]
+
+SINGLE_HORIZON_COLUMNS = ["x", "y", "ID", "trace", "time", "amplitude"]
+
+# Fixed-width line layouts of Kingdom exports, used by the writers
+GEOCARD7_FORMAT = "%16.8E%16.8E%15.2f%10.2f%15d%14.7g%2d %s\n"
+GEOCARD7_SNAPPING_PARAMETERS = "SNAPPING PARAMETERS 2    20 2"
+SINGLE_HORIZON_FORMAT = "%.5f,%.5f,%s,%7.2f,%7.4f,%.6g\n"
+
+WRITE_CHUNK_SIZE = 100_000
+
 
 def _apply_column_dtypes(df: pd.DataFrame) -> pd.DataFrame:
     for column, dtype in COLUMN_DTYPE_SCHEMA.items():
@@ -20,60 +60,240 @@ def _apply_column_dtypes(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def geocard7(filename: str | Path) -> pd.DataFrame:
+def to_compact(df: pd.DataFrame, float32: bool = False) -> pd.DataFrame:
+    """
+    Convert a seismic DataFrame to compact column dtypes according to
+    `COMPACT_COLUMN_DTYPE_SCHEMA`: categorical "ID" and "reflector" columns and 32-bit
+    integer trace counters. Counter columns are only converted if all values are whole
+    numbers. The number of bytes saved is stored in ``DataFrame.attrs["memory_saved"]``.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame containing seismic data.
+    float32 : bool, optional
+        If True, also store the "time" and "amplitude" columns as 32-bit floats. The
+        default is False.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with compact column dtypes.
+
+    """
+    dtypes = {}
+    for column, dtype in COMPACT_COLUMN_DTYPE_SCHEMA.items():
+        if column in df.columns and (dtype == "category" or _is_int32(df[column])):
+            dtypes[column] = dtype
+
+    if float32:
+        dtypes.update({c: "float32" for c in FLOAT32_COLUMNS if c in df.columns})
+
+    compact = df.astype(dtypes)
+    compact.attrs["memory_saved"] = int(
+        df.memory_usage(deep=True).sum() - compact.memory_usage(deep=True).sum()
+    )
+    return compact
+
+
+def _is_int32(series: pd.Series) -> bool:
+    """
+    Check if a numeric Series only contains whole numbers that fit in a 32-bit integer.
+
+    """
+    if not pd.api.types.is_numeric_dtype(series) or series.isna().any():
+        return False
+    values = series.to_numpy()
+    return bool(
+        np.all(values == np.round(values))
+        and values.min(initial=0) >= np.iinfo("int32").min
+        and values.max(initial=0) <= np.iinfo("int32").max
+    )
+
+
+def _union_categories(frames: list[pd.DataFrame]) -> list[pd.DataFrame]:
+    """
+    Give the categorical columns of DataFrames the union of their categories, so that
+    the columns stay categorical when the DataFrames are concatenated.
+
+    """
+    for column in frames[0].select_dtypes("category").columns:
+        categories = union_categoricals([df[column] for df in frames]).categories
+        for df in frames:
+            df[column] = df[column].cat.set_categories(categories)
+    return frames
+
+
+def geocard7(
+    filename: str | Path, compact: bool = False, float32: bool = False
+) -> pd.DataFrame:
     """
     Parse a Kingdom Geocard7 seismic export file and return a DataFrame
     containing the seismic data.
 
+    The file is memory-mapped and scanned for the PROFILE and EOD lines that delimit
+    the section of each horizon. The numeric data of each section is parsed in bulk
+    straight from the memory map and typed according to `COLUMN_DTYPE_SCHEMA`, so the
+    file is never read into memory as a whole. The file is decoded with the preferred
+    encoding of the locale, like files opened in text mode.
+
     Parameters
     ----------
     filename : str
         Path to the Geocard7 seismic export file.
+    compact : bool, optional
+        If True, return the data with compact column dtypes, see :func:`to_compact`.
+        The number of bytes saved is stored in ``DataFrame.attrs["memory_saved"]``. The
+        default is False.
+    float32 : bool, optional
+        If True and `compact` is True, store the "time" and "amplitude" columns as
+        32-bit floats. The default is False.
 
     Returns
     -------
     pd.DataFrame
         DataFrame containing the seismic data.
 
-    """
-    with open(filename) as f:
-        text = f.read()
+    Raises
+    ------
+    ValueError
+        If the file does not contain any PROFILE sections.
 
-    # Match sections starting with PROFILE and capturing up to EOD
-    pattern = re.compile(r"(PROFILE.*?)(?=PROFILE|EOD|$)", re.DOTALL)
-    matches = pattern.findall(text)
+    """
+    dtypes = {column: COLUMN_DTYPE_SCHEMA[column] for column in GEOCARD7_COLUMNS}
+    encoding = locale.getpreferredencoding(False)
 
     all_horizons = []
-    for horizon in matches:
-        lines = horizon.strip().splitlines()
-        data = lines[2:]
-        title = re.search(r"PROFILE\s+(.*?)\s*\(", lines[0])
-        if title:
-            horizon_name = title.group(1)
-        else:
-            horizon_name = "unknown"
-
-        data = pd.DataFrame([d.split() for d in data])
-        data.columns = [
-            "x",
-            "y",
-            "time",
-            "pointcount",
-            "pointcountint",
-            "amplitude",
-            "noclue",
-            "ID",
-        ]
-
-        data["reflector"] = horizon_name
-        all_horizons.append(data)
-
-    return pd.concat(all_horizons, ignore_index=True)
+    if Path(filename).stat().st_size == 0:  # Empty files cannot be memory-mapped
+        raise ValueError(f"No PROFILE sections found in {filename}")
+
+    with (
+        open(filename, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer,
+    ):
+        for header, start, end in _geocard7_sections(buffer, encoding):
+            if not _NON_WHITESPACE.search(buffer, start, end):
+                continue
+
+            title = re.search(r"PROFILE\s+(.*?)\s*\(", header)
+            if title:
+                horizon_name = title.group(1)
+            else:
+                horizon_name = "unknown"
+
+            with memoryview(buffer) as view, view[start:end] as section:
+                data = pd.read_csv(
+                    _MemoryReader(section),
+                    sep=r"\s+",
+                    header=None,
+                    names=GEOCARD7_COLUMNS,
+                    dtype=dtypes,
+                    encoding=encoding,
+                )
+            data["reflector"] = pd.Series(
+                horizon_name, index=data.index, dtype=COLUMN_DTYPE_SCHEMA["reflector"]
+            )
+            if compact:
+                # Compact each section to keep the peak memory close to the output size
+                data = to_compact(data, float32)
+            all_horizons.append(data)
+
+    if not all_horizons:
+        raise ValueError(f"No PROFILE sections found in {filename}")
+
+    if not compact:
+        return pd.concat(all_horizons, ignore_index=True)
+
+    memory_default = sum(
+        df.memory_usage(index=False, deep=True).sum() + df.attrs["memory_saved"]
+        for df in all_horizons
+    )
+    data = pd.concat(_union_categories(all_horizons), ignore_index=True)
+    data.attrs["memory_saved"] = int(
+        memory_default - data.memory_usage(index=False, deep=True).sum()
+    )
+    return data
+
+
+_NON_WHITESPACE = re.compile(rb"\S")
+
+
+class _MemoryReader(io.RawIOBase):
+    """
+    Read-only binary file object over a memoryview, so that a section of a
+    memory-mapped file can be parsed with `pd.read_csv` without copying the section.
+
+    """
+
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        n = min(len(b), len(self._view) - self._pos)
+        b[:n] = self._view[self._pos : self._pos + n]
+        self._pos += n
+        return n
+
+
+def _find_line_start(buffer: bytes, keyword: bytes, pos: int) -> int:
+    """
+    Find the first line starting with `keyword` from position `pos` in a buffer, where
+    `pos` must be the start of a line. Returns -1 if no such line is found.
+
+    """
+    if buffer[pos : pos + len(keyword)] == keyword:
+        return pos
+    found = buffer.find(b"\n" + keyword, pos)
+    return found if found == -1 else found + 1
+
+
+def _end_of_line(buffer: bytes, pos: int) -> int:
+    """Position of the start of the next line after position `pos` in a buffer."""
+    end = buffer.find(b"\n", pos)
+    return len(buffer) if end == -1 else end + 1
+
+
+def _geocard7_sections(
+    buffer: bytes, encoding: str = "utf-8"
+) -> Iterator[tuple[str, int, int]]:
+    """
+    Iterate over the PROFILE sections in the buffer of a Geocard7 file. Yields the
+    PROFILE header line of each section, decoded with `encoding`, and the start and end
+    positions of the data lines in the section. The data starts after the header and
+    snapping parameters lines and ends before the next PROFILE or EOD line or at the
+    end of the file.
+
+    The buffer is scanned forward only: the next EOD line is only searched for again
+    once a section starts after it, and not at all once no EOD line is left.
+
+    """
+    eod = 0
+    start = _find_line_start(buffer, b"PROFILE", 0)
+    while start != -1:
+        header_end = _end_of_line(buffer, start)
+        header = buffer[start:header_end].decode(encoding).strip()
+        data_start = _end_of_line(buffer, header_end)
+
+        next_profile = _find_line_start(buffer, b"PROFILE", data_start)
+        if eod != -1 and eod < data_start:
+            eod = _find_line_start(buffer, b"EOD", data_start)
+        data_end = min(
+            (pos for pos in (next_profile, eod) if pos != -1), default=len(buffer)
+        )
+        yield header, min(data_start, data_end), data_end
+
+        start = next_profile
 
 
 def single_horizon(
     filename: str | Path,
     columns: Sequence[str] | None = None,
+    compact: bool = False,
+    float32: bool = False,
 ) -> pd.DataFrame:
     """
     Reads a Kingdom export file containing data from a single seismic horizon into a
@@ -87,6 +307,13 @@ def single_horizon(
             Path to the Kingdom export file
     columns : Sequence[str] | None, optional 'X Y Line Trace Time Amplitude'
         Optional input for column names if export is different, by default None
+    compact : bool, optional
+        If True, return the data with compact column dtypes, see :func:`to_compact`.
+        The number of bytes saved is stored in ``DataFrame.attrs["memory_saved"]``. The
+        default is False.
+    float32 : bool, optional
+        If True and `compact` is True, store the "time" and "amplitude" columns as
+        32-bit floats. The default is False.
 
     Returns
     -------
@@ -99,13 +326,101 @@ def single_horizon(
         If length of the columns do not match the dataframe length, raise ValueError.
 
     """
-    data = pd.read_csv(filename)
+    data = pd.read_csv(filename, header=None)
 
     if columns is None:
-        columns = ["x", "y", "ID", "trace", "time", "amplitude"]
+        columns = SINGLE_HORIZON_COLUMNS
 
     if len(columns) != data.shape[1]:
         raise ValueError(f"Expected {len(columns)} columns, got {data.shape[1]}")
 
     data.columns = list(columns)
+    if compact:
+        data = to_compact(data, float32)
     return data
+
+
+def write_geocard7(df: pd.DataFrame, filename: str | Path):
+    """
+    Write seismic data to a Kingdom Geocard7 export file. The data of each reflector is
+    written as a PROFILE section, terminated by an EOD line, in the fixed-width layout
+    of Kingdom's Geocard7 exports. Sections are formatted and written in chunks, so
+    large DataFrames are streamed to disk. Files written by this function are read back
+    by :func:`geocard7` to the same data, and writing that data again reproduces the
+    file byte-for-byte.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame containing the seismic data with the columns of a Geocard7 export
+        (see `GEOCARD7_COLUMNS`) and a "reflector" column.
+    filename : str | Path
+        Path of the Geocard7 file to write.
+
+    Raises
+    ------
+    ValueError
+        If the DataFrame is missing required columns.
+
+    """
+    _check_columns(df, [*GEOCARD7_COLUMNS, "reflector"])
+
+    with open(filename, "w", newline="\n") as f:
+        for number, (reflector, data) in enumerate(
+            df.groupby("reflector", sort=False, observed=True), start=1
+        ):
+            f.write(f"PROFILE {reflector} () TYPE 1 {number}\n")
+            f.write(f"{GEOCARD7_SNAPPING_PARAMETERS}\n")
+            _write_formatted(f, data[GEOCARD7_COLUMNS], GEOCARD7_FORMAT)
+            f.write(f"EOD {reflector} ()\n")
+
+
+def write_single_horizon(
+    df: pd.DataFrame,
+    filename: str | Path,
+    columns: Sequence[str] | None = None,
+):
+    """
+    Write seismic data of a single horizon to a Kingdom “X Y Line Trace Time Amplitude”
+    export file, which can be read with :func:`single_horizon`. Rows are formatted and
+    written in chunks, so large DataFrames are streamed to disk.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame containing the seismic data.
+    filename : str | Path
+        Path of the export file to write.
+    columns : Sequence[str] | None, optional
+        Columns in `df` to write as x, y, line, trace, time and amplitude, by default
+        None, then the columns "x", "y", "ID", "trace", "time" and "amplitude" are used.
+
+    Raises
+    ------
+    ValueError
+        If the DataFrame is missing required columns.
+
+    """
+    columns = SINGLE_HORIZON_COLUMNS if columns is None else list(columns)
+    _check_columns(df, columns)
+
+    with open(filename, "w", newline="\n") as f:
+        _write_formatted(f, df[columns], SINGLE_HORIZON_FORMAT)
+
+
+def _check_columns(df: pd.DataFrame, columns: Sequence[str]):
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        raise ValueError(f"DataFrame is missing required columns: {missing}")
+
+
+def _write_formatted(f, df: pd.DataFrame, line_format: str):
+    """
+    Write the rows of a DataFrame to an opened text file using a %-style line format,
+    formatting the rows in chunks of `WRITE_CHUNK_SIZE` rows.
+
+    """
+    for start in range(0, len(df), WRITE_CHUNK_SIZE):
+        chunk = df.iloc[start : start + WRITE_CHUNK_SIZE]
+        rows = zip(*(chunk[column].tolist() for column in chunk.columns))
+        f.write("".join(line_format % row for row in rows))
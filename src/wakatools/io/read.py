@@ -1,9 +1,18 @@
+import glob
+import warnings
+from collections.abc import Callable
+from functools import partial
 from pathlib import Path
 from typing import Iterable, Literal
 
 import geost
+import numpy as np
+import pandas as pd
 
 from wakatools.io import kingdom_exports
+from wakatools.io.cache import read_cached
+from wakatools.utils import profiling
+from wakatools.utils.parallel import ExecutorType, create_executor
 from wakatools.utils.spatial import buffer_bbox
 
 BOREHOLE_READERS = {
@@ -24,6 +33,9 @@ SeismicFile = Literal["single-horizon", "multi-horizon"]
 def read_seismics(
     files: str | Path | Iterable[str | Path],
     type_: SeismicFile,
+    n_jobs: int = 1,
+    executor: ExecutorType = "thread",
+    cache: bool = False,
     **kwargs,
 ):
     """
@@ -33,7 +45,8 @@ def read_seismics(
     Parameters
     ----------
     files : str | Path | Iterable[str  |  Path]
-        Seismic data files
+        Seismic data file, glob pattern (e.g. "exports/*.dat") or iterable of files and
+        glob patterns.
     type_ : SeismicFile, optional
         Type of seismic data file, this can be single-horizon or
         multi-horizon. Type of data file is based on the export method:
@@ -43,6 +56,19 @@ def read_seismics(
         Supported files types:
         - multi-horizon
         - single-horizon
+    n_jobs : int, optional
+        Number of files to parse concurrently when multiple files are read. Use -1 to
+        use all available CPUs. The default is 1.
+    executor : {"thread", "process"}, optional
+        Type of pool to parse multiple files in. The default is "thread".
+    cache : bool, optional
+        If True, store the parsed data of each file in a columnar on-disk cache and
+        reuse it on subsequent reads of the same, unchanged file with the same reader
+        options. Cached data is loaded with memory-mapping instead of parsing the text.
+        See :func:`wakatools.io.cache.set_cache` to configure the cache directory and
+        size limit. The default is False.
+    **kwargs
+        Additional keyword arguments to pass to the specific reader function.
 
     Returns
     -------
@@ -50,17 +76,116 @@ def read_seismics(
         DataFrame with seismic data from file. Format is based on input type,
         contains at least columns: [x, y, ID, time]
 
+        When multiple files or a glob pattern are given, the data of all files is
+        concatenated with categorical "ID" and "reflector" columns and a categorical
+        "source" column with the file each row was read from. Files that cannot be read
+        are skipped with a warning and reported in ``DataFrame.attrs["read_errors"]`` as
+        a dictionary of file and error message.
+
     Raises
     ------
     ValueError
-        If input file is (yet) unsupported.
+        If input file is (yet) unsupported, a glob pattern matches no files or none of
+        multiple files can be read.
 
     """
     reader = SEISMIC_READERS.get(type_)
     if reader is None:
         raise ValueError(f"Unsupported or wrong type: {type_}")
 
-    return reader(files, **kwargs)
+    if cache:
+        reader = partial(read_cached, reader=reader)
+    reader = partial(_read_seismic_file, reader)
+
+    with profiling.stage("read_seismics", type_=type_) as record:
+        if isinstance(files, (str, Path)) and not glob.has_magic(str(files)):
+            data = reader(files, **kwargs)
+            record["n_files"] = 1
+        else:
+            files = _expand_files(files)
+            data = _read_multiple_seismics(files, reader, n_jobs, executor, **kwargs)
+            record["n_files"] = len(files)
+        record["n_rows"] = len(data)
+
+    return data
+
+
+def _read_seismic_file(
+    reader: Callable[..., pd.DataFrame], file: str | Path, **kwargs
+) -> pd.DataFrame:
+    """Read a single seismic file, which is profiled as a separate stage."""
+    with profiling.stage("read_seismics.file", file=str(file)) as record:
+        data = reader(file, **kwargs)
+        record["n_rows"] = len(data)
+    return data
+
+
+def _expand_files(files: str | Path | Iterable[str | Path]) -> list[Path]:
+    """
+    Expand a file, glob pattern or iterable of files and glob patterns to a list of
+    files.
+
+    """
+    if isinstance(files, (str, Path)):
+        files = [files]
+
+    expanded = []
+    for file in files:
+        if glob.has_magic(str(file)):
+            matches = sorted(glob.glob(str(file)))
+            if not matches:
+                raise ValueError(f"No files found matching: {file}")
+            expanded.extend(Path(match) for match in matches)
+        else:
+            expanded.append(Path(file))
+    return expanded
+
+
+def _read_multiple_seismics(
+    files: list[Path],
+    reader: Callable[..., pd.DataFrame],
+    n_jobs: int,
+    executor: ExecutorType,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Read multiple seismic files concurrently and concatenate the results in the order of
+    the files. Failures are collected per file instead of stopping at the first file
+    that cannot be read.
+
+    """
+    with create_executor(executor, min(n_jobs, len(files))) as pool:
+        futures = [pool.submit(reader, file, **kwargs) for file in files]
+
+    sources, data, errors = [], [], {}
+    for file, future in zip(files, futures):
+        try:
+            data.append(future.result())
+            sources.append(str(file))
+        except Exception as e:
+            errors[str(file)] = f"{type(e).__name__}: {e}"
+
+    if not data:
+        raise ValueError(f"None of the seismic files could be read: {errors}")
+
+    if errors:
+        warnings.warn(
+            f"Skipped {len(errors)} of {len(files)} seismic files that could not be "
+            f"read: {list(errors)}",
+            stacklevel=3,
+        )
+
+    lengths = [len(df) for df in data]
+    data = pd.concat(data, ignore_index=True)
+    for column in ("ID", "reflector"):
+        if column in data.columns:
+            data[column] = data[column].astype("category")
+    codes, categories = pd.factorize(np.array(sources))
+    data["source"] = pd.Categorical.from_codes(
+        np.repeat(codes, lengths), categories=categories
+    )
+    data.attrs["read_errors"] = errors
+    return data
 
 
 def read_borehole_xml(
@@ -0,0 +1,174 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import xarray as xr
+
+from wakatools.utils.spatial import GridSpecs
+
+
+class TileLog:
+    """
+    Sidecar file next to a tiled output that records which tiles were written, so an
+    interrupted job can be resumed by skipping these tiles. The first line holds the
+    grid and tiling of the output, the other lines the row and column offset of each
+    completed tile.
+
+    Parameters
+    ----------
+    output : str | Path
+        Location of the tiled output file or store.
+    layout : dict
+        JSON serialisable description of the grid and tiling of the output and of
+        the inputs that were used to compute it.
+    resume : bool
+        If True, the completed tiles of an existing log are kept. Otherwise, a new log
+        is started.
+
+    Raises
+    ------
+    ValueError
+        If an existing log was written for a different grid, tiling or input.
+
+    """
+
+    def __init__(self, output: str | Path, layout: dict, resume: bool):
+        output = Path(output)
+        self.path = output.with_name(f"{output.name}.tiles")
+        self.completed = set()
+
+        if resume and output.exists() and self.path.exists():
+            header, *tiles = self.path.read_text().splitlines()
+            if json.loads(header) != layout:
+                raise ValueError(
+                    f"Cannot resume {output}: it was written for a different grid, "
+                    "tiling or input. Use resume=False to overwrite it."
+                )
+            self.completed = {tuple(json.loads(tile)) for tile in tiles}
+        else:
+            self.path.write_text(json.dumps(layout) + "\n")
+
+    def __contains__(self, tile: tuple[int, int]) -> bool:
+        return tuple(tile) in self.completed
+
+    def add(self, tile: tuple[int, int]):
+        with open(self.path, "a") as f:
+            f.write(json.dumps(list(tile)) + "\n")
+        self.completed.add(tuple(tile))
+
+
+class GeoTiffTileWriter:
+    """
+    Write tiles of a grid into a tiled, single band GeoTIFF with NaN as nodata. Blocks of
+    the GeoTIFF that are never written read as nodata. The file is reopened for each
+    tile so that every written tile is flushed to disk.
+
+    Parameters
+    ----------
+    path : str | Path
+        Location of the GeoTIFF.
+    specs : GridSpecs
+        Specifications of the full grid.
+    tile_size : int
+        Size of the internal GeoTIFF blocks, which must be a multiple of 16.
+    dtype : str
+        Data type of the raster values.
+    overwrite : bool
+        If True, a new GeoTIFF is created even if the file exists.
+
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        specs: GridSpecs,
+        tile_size: int,
+        dtype: str,
+        overwrite: bool,
+    ):
+        import rasterio
+
+        if tile_size % 16 != 0:
+            raise ValueError(
+                f"tile_size must be a multiple of 16 for GeoTIFF output, got {tile_size}."
+            )
+
+        self.path = Path(path)
+        if overwrite or not self.path.exists():
+            ny, nx = specs.shape
+            profile = dict(
+                driver="GTiff",
+                height=ny,
+                width=nx,
+                count=1,
+                dtype=dtype,
+                crs=specs.crs,
+                transform=specs.transform,
+                nodata=np.nan,
+                tiled=True,
+                blockxsize=tile_size,
+                blockysize=tile_size,
+                compress="deflate",
+                BIGTIFF="IF_SAFER",
+            )
+            with rasterio.open(self.path, "w", **profile):
+                pass
+
+    def write(self, rows: slice, cols: slice, values: np.ndarray):
+        import rasterio
+        from rasterio.windows import Window
+
+        window = Window.from_slices(rows, cols)
+        with rasterio.open(self.path, "r+") as dst:
+            dst.write(values.astype(dst.dtypes[0]), 1, window=window)
+
+
+class ZarrTileWriter:
+    """
+    Write tiles of a grid into a Zarr store with a single variable, chunked by tile.
+    Chunks that are never written read as NaN. Requires Zarr and Dask.
+
+    Parameters
+    ----------
+    path : str | Path
+        Location of the Zarr store.
+    specs : GridSpecs
+        Specifications of the full grid.
+    tile_size : int
+        Chunk size of the variable in the Zarr store.
+    dtype : str
+        Data type of the values.
+    overwrite : bool
+        If True, a new store is created even if the store exists.
+    name : str
+        Name of the variable in the Zarr store.
+
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        specs: GridSpecs,
+        tile_size: int,
+        dtype: str,
+        overwrite: bool,
+        name: str,
+    ):
+        self.path = Path(path)
+        self.name = name
+        self.dtype = dtype
+        if overwrite or not self.path.exists():
+            # Lazy grid, so only the metadata and coordinates are written here
+            grid = GridSpecs(
+                crs=specs.crs,
+                transform=specs.transform,
+                shape=specs.shape,
+                chunks=tile_size,
+            ).to_grid()
+            grid = xr.full_like(grid, np.nan, dtype=dtype)
+            grid.to_dataset(name=name).to_zarr(self.path, mode="w", compute=False)
+
+    def write(self, rows: slice, cols: slice, values: np.ndarray):
+        tile = xr.DataArray(values.astype(self.dtype), dims=("y", "x"))
+        tile = tile.to_dataset(name=self.name)
+        tile.to_zarr(self.path, region={"y": rows, "x": cols})
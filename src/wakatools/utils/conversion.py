@@ -1,12 +1,21 @@
+from functools import partial
+from typing import Literal
+
 import numpy as np
 import pandas as pd
 import shapely
 
 from wakatools.constants import SeismicVelocity
+from wakatools.utils import profiling
+from wakatools.utils.parallel import ExecutorType, create_executor
+
+ConversionMethod = Literal["vectorised", "loop"]
 
 
 def calculate_absolute_time(
-    line1: shapely.LineString, line2: shapely.LineString
+    line1: shapely.LineString,
+    line2: shapely.LineString,
+    method: ConversionMethod = "vectorised",
 ) -> np.ndarray:
     """
     Calculate the absolute time difference between two seismic lines.
@@ -18,21 +27,69 @@ def calculate_absolute_time(
         typically the bathymetry.
     line2 : shapely.LineString
         Second seismic line as a shapely LineString object.
+    method : {"vectorised", "loop"}, optional
+        Method to project the points of `line2` onto `line1`. "vectorised" projects all
+        points at once using a spatial index on the segments of `line1`, "loop" projects
+        the points one by one and is kept for regression comparison. The default is
+        "vectorised".
 
     Returns
     -------
     np.ndarray
         Absolute time difference between the two seismic lines.
+
+    Raises
+    ------
+    ValueError
+        If an unknown method is given.
+
     """
-    return np.array(
-        [
-            p.z - line1.interpolate(line1.project(p)).z
-            for p in shapely.points(line2.coords)
-        ]
+    if method == "vectorised":
+        return _absolute_time(line1, shapely.get_coordinates(line2, include_z=True))
+    elif method == "loop":
+        return np.array(
+            [
+                p.z - line1.interpolate(line1.project(p)).z
+                for p in shapely.points(line2.coords)
+            ]
+        )
+    raise ValueError(f"Unknown conversion method: {method}")
+
+
+def _absolute_time(line: shapely.LineString, coordinates: np.ndarray) -> np.ndarray:
+    """
+    Calculate the time difference between points with x,y,time coordinates of shape
+    (N, 3) and a reference line. Each point is projected onto the nearest segment of the
+    line, found with a spatial index on the line segments, and the time of the line is
+    linearly interpolated at the projected location.
+
+    """
+    vertices = shapely.get_coordinates(line, include_z=True)
+    start, end = vertices[:-1], vertices[1:]
+
+    segments = shapely.linestrings(np.stack([start[:, :2], end[:, :2]], axis=1))
+    tree = shapely.STRtree(segments)
+    _, nearest = tree.query_nearest(
+        shapely.points(coordinates[:, :2]), all_matches=False
+    )
+
+    origin = start[nearest]
+    direction = end[nearest] - origin
+    length = (direction[:, :2] ** 2).sum(axis=1)
+    fraction = np.divide(
+        ((coordinates[:, :2] - origin[:, :2]) * direction[:, :2]).sum(axis=1),
+        length,
+        out=np.zeros_like(length),
+        where=length > 0,
     )
+    fraction = np.clip(fraction, 0.0, 1.0)
 
+    return coordinates[:, 2] - (origin[:, 2] + fraction * direction[:, 2])
 
-def _time_to_depth(df: pd.DataFrame) -> pd.Series:
+
+def _time_to_depth(
+    df: pd.DataFrame, method: ConversionMethod = "vectorised"
+) -> pd.Series:
     """
     Convert seismic two-way travel time to depth using a constant
     seismic velocity model.
@@ -41,33 +98,54 @@ def _time_to_depth(df: pd.DataFrame) -> pd.Series:
     ----------
     df : pd.DataFrame
         Seismic dataframe with columns 'x', 'y', 'time', and 'reflector'.
+    method : {"vectorised", "loop"}, optional
+        Method to project the reflectors onto the bathymetry. The default is
+        "vectorised".
 
     Returns
     -------
     pd.Series
         Depth values corresponding to the input seismic data.
     """
-    bathy_line = shapely.linestrings(
-        df.loc[df["reflector"] == "bathy", ["x", "y", "time"]].values
-    )
+    # Lines grouped with groupby.apply have the line ID as name instead of an ID column
+    line = df["ID"].iloc[0] if "ID" in df.columns else getattr(df, "name", None)
+    with profiling.stage("calculate_depth.line", line=line, n_points=len(df)):
+        bathy_line = shapely.linestrings(
+            df.loc[df["reflector"] == "bathy", ["x", "y", "time"]].values
+        )
 
-    depth = pd.Series(index=df.index)
-    for ref in df["reflector"].unique():
-        if ref == "bathy":
-            continue
+        if method == "vectorised":
+            # Project all reflector points of the line in one batch
+            is_reflector = (df["reflector"] != "bathy").to_numpy()
+            time = _absolute_time(
+                bathy_line, df.loc[is_reflector, ["x", "y", "time"]].to_numpy(float)
+            )
+            depth = pd.Series(np.nan, index=df.index)
+            depth[is_reflector] = time * (SeismicVelocity.SEDIMENT / 2.0)
+            return depth
 
-        ref_line = shapely.linestrings(
-            df.loc[df["reflector"] == ref, ["x", "y", "time"]].values
-        )
+        depth = pd.Series(index=df.index)
+        for ref in df["reflector"].unique():
+            if ref == "bathy":
+                continue
+
+            ref_line = shapely.linestrings(
+                df.loc[df["reflector"] == ref, ["x", "y", "time"]].values
+            )
 
-        time = calculate_absolute_time(bathy_line, ref_line)
+            time = calculate_absolute_time(bathy_line, ref_line, method=method)
 
-        depth.loc[df["reflector"] == ref] = time * (SeismicVelocity.SEDIMENT / 2.0)
+            depth.loc[df["reflector"] == ref] = time * (SeismicVelocity.SEDIMENT / 2.0)
 
-    return depth
+        return depth
 
 
-def calculate_depth(df: pd.DataFrame) -> pd.Series:
+def calculate_depth(
+    df: pd.DataFrame,
+    method: ConversionMethod = "vectorised",
+    n_jobs: int = 1,
+    executor: ExecutorType = "thread",
+) -> pd.Series:
     """
     Calculate the depth with respect to the bathymetry reflector for deeper reflectors in
     a Pandas DataFrame containing seismic data. This converts seismic two-way travel time
@@ -76,7 +154,23 @@ def calculate_depth(df: pd.DataFrame) -> pd.Series:
     Parameters
     ----------
     df : pd.DataFrame
-        Seismic dataframe with columns 'x', 'y', 'time', and 'reflector'.
+        Seismic dataframe with columns 'x', 'y', 'time', and 'reflector'. Compact
+        DataFrames with categorical 'ID' and 'reflector' columns and a float32 'time'
+        column are supported without converting the columns.
+    method : {"vectorised", "loop"}, optional
+        Method to project the reflector points onto the bathymetry line. "vectorised"
+        projects all reflector points of a seismic line at once onto the nearest
+        bathymetry segments using a spatial index, "loop" projects each point separately
+        with shapely and is kept for regression comparison. Both methods give the same
+        depths. The default is "vectorised".
+    n_jobs : int, optional
+        Number of seismic lines to process in parallel. Use -1 to use all available
+        CPUs. The default is 1, then the lines are processed one after another.
+    executor : {"thread", "process"}, optional
+        Pool to distribute the seismic lines over when `n_jobs` is not 1. Threads avoid
+        copying the data to worker processes and run in parallel because shapely
+        releases the GIL, processes also parallelise the Pandas overhead per line. The
+        default is "thread".
 
     Returns
     -------
@@ -85,11 +179,33 @@ def calculate_depth(df: pd.DataFrame) -> pd.Series:
         data.
 
     """
-    if df["ID"].nunique() == 1:
-        depth = _time_to_depth(df)
-    else:
-        depth = df.groupby("ID", group_keys=False).apply(
-            lambda x: _time_to_depth(x), include_groups=False
-        )
+    with profiling.stage("calculate_depth", n_points=len(df)) as record:
+        record["n_lines"] = df["ID"].nunique()
+        if record["n_lines"] == 1:
+            depth = _time_to_depth(df, method)
+        elif n_jobs == 1:
+            depth = df.groupby("ID", group_keys=False, observed=True).apply(
+                lambda x: _time_to_depth(x, method), include_groups=False
+            )
+        else:
+            depth = _time_to_depth_parallel(df, method, n_jobs, executor)
 
     return depth.fillna(0.0)
+
+
+def _time_to_depth_parallel(
+    df: pd.DataFrame,
+    method: ConversionMethod,
+    n_jobs: int,
+    executor: ExecutorType,
+) -> pd.Series:
+    """
+    Convert seismic two-way travel time to depth for each seismic line in a pool of
+    workers. The results are combined in the same order of lines as `groupby("ID")`, so
+    the output is identical to processing the lines one after another.
+
+    """
+    lines = [line for _, line in df.groupby("ID", observed=True)]
+    with create_executor(executor, n_jobs) as pool:
+        depths = pool.map(partial(_time_to_depth, method=method), lines)
+        return pd.concat(list(depths))
@@ -0,0 +1,57 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Literal
+
+ExecutorType = Literal["thread", "process"]
+
+EXECUTORS = {
+    "thread": ThreadPoolExecutor,
+    "process": ProcessPoolExecutor,
+}
+
+
+def n_workers(n_jobs: int) -> int:
+    """
+    Get the number of workers to use for a number of jobs, where -1 means all available
+    CPUs.
+
+    Parameters
+    ----------
+    n_jobs : int
+        Number of jobs to run in parallel or -1 for all available CPUs.
+
+    Returns
+    -------
+    int
+        Number of workers.
+
+    """
+    return os.cpu_count() if n_jobs == -1 else n_jobs
+
+
+def create_executor(executor: ExecutorType, n_jobs: int) -> Executor:
+    """
+    Create a thread or process pool executor with a number of workers.
+
+    Parameters
+    ----------
+    executor : {"thread", "process"}
+        Type of pool to create.
+    n_jobs : int
+        Number of workers in the pool or -1 for all available CPUs.
+
+    Returns
+    -------
+    concurrent.futures.Executor
+        The thread or process pool executor.
+
+    Raises
+    ------
+    ValueError
+        If an unknown executor type is given.
+
+    """
+    pool = EXECUTORS.get(executor)
+    if pool is None:
+        raise ValueError(f"Unknown executor: {executor}")
+    return pool(max_workers=n_workers(n_jobs))
@@ -0,0 +1,263 @@
+import json
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+
+class Profiler:
+    """
+    Collection of the records of profiled processing stages. Each record is a
+    dictionary with the name of the "stage", the name of the enclosing "parent" stage,
+    the "wall_time" in seconds, the "peak_memory" in bytes that was allocated on top of
+    the memory in use when the stage started, and the item counts of the stage, such as
+    "n_points".
+
+    """
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def add(self, record: dict):
+        with self._lock:
+            self.records.append(record)
+
+    def clear(self):
+        with self._lock:
+            self.records.clear()
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Records as a DataFrame with a row for each profiled stage in the order that
+        the stages finished.
+
+        """
+        return pd.DataFrame.from_records(self.records, columns=_columns(self.records))
+
+    def to_json(self, path: str | Path = None) -> str:
+        """
+        Records as a JSON array of objects, which is also written to `path` if given.
+
+        """
+        text = json.dumps(self.records, default=str, indent=2)
+        if path is not None:
+            Path(path).write_text(text)
+        return text
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Number of calls, total wall time and maximum peak memory of each stage, sorted
+        from the slowest to the fastest stage.
+
+        """
+        return (
+            self.to_dataframe()
+            .groupby("stage", sort=False)
+            .agg(
+                calls=("wall_time", "size"),
+                wall_time=("wall_time", "sum"),
+                peak_memory=("peak_memory", "max"),
+            )
+            .sort_values("wall_time", ascending=False)
+        )
+
+
+def _columns(records: list[dict]) -> list[str]:
+    columns = ["stage", "parent", "wall_time", "peak_memory"]
+    for record in records:
+        columns.extend(key for key in record if key not in columns)
+    return columns
+
+
+@dataclass
+class ProfilingSettings:
+    """
+    Settings of the instrumentation of the processing stages in wakatools.
+
+    Attributes
+    ----------
+    enabled : bool
+        If True, the wall time, peak memory and item counts of the instrumented stages
+        are recorded. The default is False.
+    memory : bool
+        If True, the peak memory of each stage is traced with `tracemalloc`, which
+        slows down allocations. The default is True.
+    profiler : Profiler
+        Collection of the records.
+
+    """
+
+    enabled: bool = False
+    memory: bool = True
+    profiler: Profiler = field(default_factory=Profiler)
+
+
+settings = ProfilingSettings()
+_active = threading.local()  # Stack of the open stages in each thread
+_tracing = False  # Whether tracemalloc was started by wakatools
+
+
+def set_profiling(enabled: bool = True, memory: bool = True):
+    """
+    Turn recording of the wall time, peak memory and item counts of the processing
+    stages in wakatools on or off. The records are collected in
+    :func:`get_profiler`.
+
+    Stages that run in worker processes (with `executor="process"`) are not recorded.
+    The peak memory of stages that run concurrently in threads includes the memory of
+    the other threads.
+
+    Parameters
+    ----------
+    enabled : bool, optional
+        If True, record the instrumented stages. The default is True.
+    memory : bool, optional
+        If True, trace the peak memory of each stage with `tracemalloc`, which slows
+        down allocations. The default is True.
+
+    Examples
+    --------
+    Find out which stages of a gridding job take the most time:
+
+    >>> wakatools.set_profiling(True)
+    >>> data = wakatools.read_seismics("survey.dat", "multi-horizon")
+    >>> surface = interpolation.tin_surface(data, value="time", target_grid=grid)
+    >>> wakatools.get_profiler().summary()
+
+    """
+    settings.enabled = enabled
+    settings.memory = memory
+    _trace_memory(enabled and memory)
+
+
+def get_profiler() -> Profiler:
+    """Profiler with the records of the stages that were profiled."""
+    return settings.profiler
+
+
+@contextmanager
+def profile(memory: bool = True) -> Iterator[Profiler]:
+    """
+    Context manager to record the processing stages within the block into a new
+    :class:`Profiler`. Profiling is restored to the previous settings afterwards.
+
+    Parameters
+    ----------
+    memory : bool, optional
+        If True, trace the peak memory of each stage with `tracemalloc`. The default is
+        True.
+
+    Yields
+    ------
+    Profiler
+        Profiler with the records of the stages within the block.
+
+    Examples
+    --------
+    >>> with profile() as profiler:
+    ...     depth = calculate_depth(data)
+    >>> profiler.to_dataframe()
+
+    """
+    previous = (settings.enabled, settings.memory, settings.profiler)
+    profiler = Profiler()
+    settings.enabled, settings.memory, settings.profiler = True, memory, profiler
+    _trace_memory(memory)
+    try:
+        yield profiler
+    finally:
+        settings.enabled, settings.memory, settings.profiler = previous
+        _trace_memory(settings.enabled and settings.memory)
+
+
+@contextmanager
+def stage(name: str, **counts) -> Iterator[dict]:
+    """
+    Context manager to record the wall time, peak memory and item counts of a
+    processing stage if profiling is enabled. Counts that are only known at the end of
+    the stage can be added to the yielded record.
+
+    Parameters
+    ----------
+    name : str
+        Name of the stage.
+    **counts
+        Item counts of the stage, such as the number of input points.
+
+    Yields
+    ------
+    dict
+        Record of the stage.
+
+    Examples
+    --------
+    >>> with stage("read_seismics", n_files=1) as record:
+    ...     data = reader(file)
+    ...     record["n_rows"] = len(data)
+
+    """
+    record = dict(counts)
+    if not settings.enabled:
+        yield record
+        return
+
+    stack = _stack()
+    parent = stack[-1] if stack else None
+    trace = settings.memory and tracemalloc.is_tracing()
+    if trace:
+        current, peak = tracemalloc.get_traced_memory()
+        if parent is not None:  # The peak is reset, so keep the peak of the parent
+            parent["peak"] = max(parent["peak"], peak)
+        tracemalloc.reset_peak()
+    frame = {"name": name, "peak": current if trace else 0}
+    stack.append(frame)
+
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        wall_time = time.perf_counter() - start
+        stack.pop()
+        peak_memory = None
+        if trace:
+            peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+            peak_memory = peak - current
+            if parent is not None:
+                parent["peak"] = max(parent["peak"], peak)
+
+        settings.profiler.add(
+            {
+                "stage": name,
+                "parent": parent["name"] if parent is not None else None,
+                "wall_time": wall_time,
+                "peak_memory": peak_memory,
+                **record,
+            }
+        )
+
+
+def _trace_memory(trace: bool):
+    """
+    Start or stop tracing memory allocations. Tracing that was started outside of
+    wakatools is never stopped.
+
+    """
+    global _tracing
+    if trace and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _tracing = True
+    elif not trace and _tracing:
+        tracemalloc.stop()
+        _tracing = False
+
+
+def _stack() -> list[dict]:
+    if not hasattr(_active, "stack"):
+        _active.stack = []
+    return _active.stack
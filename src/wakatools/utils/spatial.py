@@ -1,22 +1,66 @@
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Literal
 
 import numpy as np
 import pandas as pd
+import rioxarray
 import xarray as xr
 from affine import Affine
 
+from wakatools.utils import profiling
+
 BBox = tuple[float, float, float, float]  # xmin, ymin, xmax, ymax
 xres = yres = int | float
+SamplingMethod = Literal["bilinear", "nearest"]
 
 
 @dataclass
 class GridSpecs:
     """
-    Placeholder for method to derive a grid from various information (see Issue #1:
-    https://github.com/Deltares-research/wakatools/issues/1). Currently not used but
-    planned for future implementation to make "target_grid" optional input in interpolation
-    routines.
+    Specifications of a regular target grid with "y" and "x" dimensions. A grid is
+    defined by either a `transform` and `shape`, a `bbox` and `resolution` or a `bbox`
+    and `shape`. After initialisation, `bbox`, `resolution`, `transform` and `shape`
+    all describe the resulting grid.
+
+    The grid itself is only created with `to_grid`, which allocates no more than the
+    1D "x" and "y" coordinates for a Dask-chunked grid. GridSpecs can be given instead
+    of a target grid to the interpolation functions in `wakatools.interpolation`.
+
+    Parameters
+    ----------
+    bbox : BBox, optional
+        Bounding box (xmin, ymin, xmax, ymax) the grid must cover.
+    resolution : int | float | tuple[xres, yres], optional
+        Cell size of the grid, or separate cell sizes in x and y direction.
+    crs : int | str, optional
+        Coordinate reference system of the grid, such as an EPSG code.
+    transform : Affine, optional
+        Affine transform of the upper left corner of the grid.
+    shape : tuple[int, int], optional
+        Number of rows and columns (ny, nx) of the grid.
+    align : {"center", "corner"}, optional
+        How a grid from `bbox` and `resolution` is aligned. "center" expands the bbox to
+        multiples of the resolution, so cell edges are at multiples of the resolution
+        and the cell centres in between. "corner" starts the grid at the upper left
+        corner of the bbox. In both cases, the grid is extended to cover the bbox with
+        whole cells. The default is "center".
+    chunks : int | tuple[int, int] | str, optional
+        Dask chunks of the grid created by `to_grid`. If None, the grid is a NumPy
+        array. The default is None.
+
+    Raises
+    ------
+    ValueError
+        If the grid is not fully specified or an unknown alignment is given.
+
+    Examples
+    --------
+    >>> specs = GridSpecs(bbox=(0.3, 0.2, 4.9, 4.8), resolution=1.0)
+    >>> specs.shape, specs.bbox
+    ((5, 5), (0.0, 0.0, 5.0, 5.0))
+    >>> grid = specs.to_grid()
+
     """
 
     bbox: BBox = None
@@ -25,6 +69,194 @@ class GridSpecs:
     transform: Affine = None
     shape: tuple[int, int] = None
     align: Literal["center", "corner"] = "center"
+    chunks: int | tuple[int, int] | str = None
+
+    def __post_init__(self):
+        if self.align not in ("center", "corner"):
+            raise ValueError(f"Unknown grid alignment: {self.align}")
+
+        if self.transform is None:
+            if self.bbox is None or (self.resolution is None and self.shape is None):
+                raise ValueError(
+                    "GridSpecs requires either 'transform' and 'shape', 'bbox' and "
+                    "'resolution' or 'bbox' and 'shape'."
+                )
+            self.transform, self.shape = self._from_bbox()
+        elif self.shape is None:
+            raise ValueError("GridSpecs with a 'transform' also requires a 'shape'.")
+
+        ny, nx = self.shape
+        self.shape = (int(ny), int(nx))
+        self.resolution = (self.transform.a, -self.transform.e)
+        self.bbox = self.bounds
+
+    def _from_bbox(self) -> tuple[Affine, tuple[int, int]]:
+        xmin, ymin, xmax, ymax = self.bbox
+
+        if self.resolution is None:
+            ny, nx = self.shape
+            xres, yres = (xmax - xmin) / nx, (ymax - ymin) / ny
+            return Affine(xres, 0.0, xmin, 0.0, -yres, ymax), (ny, nx)
+
+        xres, yres = np.broadcast_to(self.resolution, 2)
+        if self.align == "center":
+            xmin, xmax = round_to_lower(xmin, xres), round_to_upper(xmax, xres)
+            ymin, ymax = round_to_lower(ymin, yres), round_to_upper(ymax, yres)
+
+        # Rounding avoids an extra cell from floating point errors in the division
+        nx = max(1, int(np.ceil(np.round((xmax - xmin) / xres, 9))))
+        ny = max(1, int(np.ceil(np.round((ymax - ymin) / yres, 9))))
+        return Affine(xres, 0.0, xmin, 0.0, -yres, ymax), (ny, nx)
+
+    @classmethod
+    def from_coordinates(
+        cls,
+        coordinates: pd.DataFrame | np.ndarray,
+        resolution: int | float | tuple["xres", "yres"],
+        crs: int | str = None,
+        align: Literal["center", "corner"] = "center",
+        chunks: int | tuple[int, int] | str = None,
+    ) -> "GridSpecs":
+        """
+        Create GridSpecs for a grid that covers point coordinates.
+
+        Parameters
+        ----------
+        coordinates : pd.DataFrame | np.ndarray
+            DataFrame with "x" and "y" columns or an array of shape (N, 2) with the
+            coordinates the grid must cover.
+        resolution : int | float | tuple[xres, yres]
+            Cell size of the grid, or separate cell sizes in x and y direction.
+        crs : int | str, optional
+            Coordinate reference system of the grid. If None, the CRS of a GeoDataFrame
+            is used. The default is None.
+        align : {"center", "corner"}, optional
+            Alignment of the grid (see `GridSpecs`). The default is "center".
+        chunks : int | tuple[int, int] | str, optional
+            Dask chunks of the grid created by `to_grid`. The default is None.
+
+        Returns
+        -------
+        GridSpecs
+            Specifications of the grid.
+
+        """
+        if isinstance(coordinates, pd.DataFrame):
+            bbox = coordinates.waka.bounds()
+            if crs is None:
+                crs = getattr(coordinates, "crs", None)
+        else:
+            coordinates = np.asarray(coordinates)
+            bbox = (*coordinates.min(axis=0), *coordinates.max(axis=0))
+
+        return cls(
+            bbox=tuple(float(b) for b in bbox),
+            resolution=resolution,
+            crs=crs,
+            align=align,
+            chunks=chunks,
+        )
+
+    @classmethod
+    def from_grid(cls, grid: xr.DataArray) -> "GridSpecs":
+        """
+        Create GridSpecs from an existing regular grid.
+
+        Parameters
+        ----------
+        grid : xr.DataArray
+            Regular grid with "y" and "x" dimensions.
+
+        Returns
+        -------
+        GridSpecs
+            Specifications of the grid.
+
+        """
+        return cls(
+            crs=grid.rio.crs,
+            transform=grid.rio.transform(),
+            shape=(grid.sizes["y"], grid.sizes["x"]),
+        )
+
+    def window(self, rows: slice, cols: slice) -> "GridSpecs":
+        """
+        Get the GridSpecs of a rectangular window of the grid.
+
+        Parameters
+        ----------
+        rows, cols : slice
+            Row and column slices of the window with explicit start and stop.
+
+        Returns
+        -------
+        GridSpecs
+            Specifications of the window.
+
+        """
+        return GridSpecs(
+            crs=self.crs,
+            transform=self.transform * Affine.translation(cols.start, rows.start),
+            shape=(rows.stop - rows.start, cols.stop - cols.start),
+        )
+
+    @property
+    def bounds(self) -> BBox:
+        """
+        Bounding box (xmin, ymin, xmax, ymax) of the grid.
+
+        """
+        ny, nx = self.shape
+        xmin, ymax = self.transform.c, self.transform.f
+        xmax = xmin + nx * self.transform.a
+        ymin = ymax + ny * self.transform.e
+        return float(xmin), float(ymin), float(xmax), float(ymax)
+
+    @property
+    def x(self) -> np.ndarray:
+        """
+        The x coordinates of the cell centres.
+
+        """
+        nx = self.shape[1]
+        return self.transform.c + (np.arange(nx) + 0.5) * self.transform.a
+
+    @property
+    def y(self) -> np.ndarray:
+        """
+        The y coordinates of the cell centres.
+
+        """
+        ny = self.shape[0]
+        return self.transform.f + (np.arange(ny) + 0.5) * self.transform.e
+
+    def to_grid(self) -> xr.DataArray:
+        """
+        Create the grid as a DataArray filled with zeros, with the CRS and transform
+        attached through rioxarray. The grid only describes the target cells, so the
+        zeros are not allocated: without `chunks`, the data is a read-only view of a
+        single zero broadcast to the grid shape (use ``grid.copy()`` for a writable
+        array), and with `chunks`, the data is a lazy Dask array that is not allocated
+        until it is computed.
+
+        Returns
+        -------
+        xr.DataArray
+            A 2D DataArray with dimensions ("y", "x") and cell centre coordinates.
+
+        """
+        if self.chunks is None:
+            data = np.broadcast_to(np.zeros(()), self.shape)
+        else:
+            import dask.array
+
+            data = dask.array.zeros(self.shape, chunks=self.chunks)
+
+        # Written in place, because rioxarray otherwise makes deep copies of the grid
+        grid = xr.DataArray(data, coords={"y": self.y, "x": self.x}, dims=("y", "x"))
+        if self.crs is not None:
+            grid.rio.write_crs(self.crs, inplace=True)
+        return grid.rio.write_transform(self.transform, inplace=True)
 
 
 def round_to_lower(value, base):
@@ -35,7 +267,9 @@ def round_to_upper(value, base):
     return np.ceil(value / base) * base
 
 
-def target_grid_from(xyz: pd.DataFrame, resolution: int | float) -> xr.DataArray:
+def target_grid_from(
+    xyz: pd.DataFrame, resolution: int | float, chunks: int | tuple[int, int] = None
+) -> xr.DataArray:
     """
     Create an interpolation target grid as an xarray.DataArray based on x and y
     locations from a DataFrame and a specified grid cell resolution.
@@ -47,6 +281,11 @@ def target_grid_from(xyz: pd.DataFrame, resolution: int | float) -> xr.DataArray
         that define the spatial boundaries of the target grid.
     resolution : int | float
         Resolution of the grid in meters
+    chunks : int | tuple[int, int], optional
+        Dask chunks to create a lazy grid. The default is None, then the grid is a
+        writable NumPy array of zeros, which allocates 8 bytes per grid cell. For large
+        grids, pass chunks or pass :class:`GridSpecs` as target grid to the
+        interpolation functions, which does not allocate the grid.
 
     Returns
     -------
@@ -56,19 +295,54 @@ def target_grid_from(xyz: pd.DataFrame, resolution: int | float) -> xr.DataArray
         input points, aligned according to the specified resolution.
 
     """
-    xmin, ymin, xmax, ymax = xyz.waka.bounds()
-    xmin = round_to_lower(xmin, resolution)
-    ymin = round_to_lower(ymin, resolution)
-    xmax = round_to_upper(xmax, resolution)
-    ymax = round_to_upper(ymax, resolution)
+    with profiling.stage("target_grid_from", n_points=len(xyz)) as record:
+        specs = GridSpecs.from_coordinates(xyz, resolution, chunks=chunks)
+        grid = specs.to_grid()
+        if chunks is None:
+            grid = grid.copy()  # Writable array, like np.zeros
+        record["n_cells"] = grid.size
+    return grid
+
+
+def grid_blocks(
+    shape: tuple[int, int], block_size: int = None, tile_shape: tuple[int, int] = None
+) -> list[tuple[slice, slice]]:
+    """
+    Split a grid of shape (ny, nx) into blocks of cells, either in strips of whole rows
+    or in 2D tiles. Without `block_size` or `tile_shape`, the grid is a single block.
 
-    # Shift xmin and ymax by 0.5 resolution to create cellcenters
-    xgrid = np.arange(xmin + (0.5 * resolution), xmax, resolution)
-    ygrid = np.arange(ymax - (0.5 * resolution), ymin, -resolution)
+    Parameters
+    ----------
+    shape : tuple[int, int]
+        Number of rows and columns (ny, nx) of the grid.
+    block_size : int, optional
+        Maximum number of grid cells in a strip of whole rows. Strips contain at least
+        one row. The default is None.
+    tile_shape : tuple[int, int], optional
+        Number of rows and columns (ny, nx) in each tile. Tiles at the bottom and right
+        edges of the grid can be smaller. Takes precedence over `block_size`. The
+        default is None.
 
-    X, _ = np.meshgrid(xgrid, ygrid)  # noqa: N806
+    Returns
+    -------
+    list[tuple[slice, slice]]
+        The row and column slices of each block in row-major order.
 
-    return xr.DataArray(np.zeros_like(X), coords=(ygrid, xgrid), dims=("y", "x"))
+    """
+    ny, nx = shape
+    if tile_shape is not None:
+        tile_rows, tile_cols = tile_shape
+    elif block_size is not None:
+        tile_rows, tile_cols = max(1, block_size // max(nx, 1)), nx
+    else:
+        tile_rows, tile_cols = ny, nx
+    tile_rows, tile_cols = max(tile_rows, 1), max(tile_cols, 1)
+
+    return [
+        (slice(row, min(row + tile_rows, ny)), slice(col, min(col + tile_cols, nx)))
+        for row in range(0, ny, tile_rows)
+        for col in range(0, nx, tile_cols)
+    ]
 
 
 def buffer_bbox(bbox: BBox, buffer: int | float) -> BBox:
@@ -76,3 +350,222 @@ def buffer_bbox(bbox: BBox, buffer: int | float) -> BBox:
 
     new_bbox = box(*bbox).buffer(buffer)
     return new_bbox.bounds
+
+
+def is_regular(raster: xr.DataArray) -> bool:
+    """
+    Check if a raster has regularly spaced "x" and "y" coordinates.
+
+    Parameters
+    ----------
+    raster : xr.DataArray
+        Raster with "x" and "y" dimensions.
+
+    Returns
+    -------
+    bool
+        True if the coordinates along both dimensions are equally spaced.
+
+    """
+    for dim in ("x", "y"):
+        steps = np.diff(raster.coords[dim].values)
+        if len(steps) > 0 and not np.allclose(steps, steps[0]):
+            return False
+    return True
+
+
+def open_raster(raster: str | Path | xr.DataArray) -> xr.DataArray:
+    """
+    Open a single band raster lazily. Raster files are opened with rioxarray without
+    reading any data, so only the parts of the raster that are selected are read from
+    disk. DataArrays are returned as is, without the "band" dimension.
+
+    Parameters
+    ----------
+    raster : str | Path | xr.DataArray
+        Location of a raster file or a DataArray with "x" and "y" dimensions.
+
+    Returns
+    -------
+    xr.DataArray
+        DataArray with "y" and "x" dimensions. Nodata values are masked as NaN for
+        raster files.
+
+    Raises
+    ------
+    ValueError
+        If the raster has more than one band.
+
+    """
+    if isinstance(raster, (str, Path)):
+        raster = rioxarray.open_rasterio(raster, mask_and_scale=True, cache=False)
+
+    if "band" in raster.dims:
+        if raster.sizes["band"] != 1:
+            raise ValueError(
+                f"Expected a single band raster, got {raster.sizes['band']} bands."
+            )
+        raster = raster.squeeze("band", drop=True)
+    return raster
+
+
+def raster_blocks(raster: xr.DataArray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Get the row and column edges of the internal blocks of a raster. These are the
+    dask chunks of the raster or, for lazily opened raster files, the internal tiles or
+    strips of the file. In-memory rasters consist of a single block.
+
+    Parameters
+    ----------
+    raster : xr.DataArray
+        Raster with "y" and "x" dimensions.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Arrays with the start index of each block along "y" and "x", followed by the
+        size of the dimension.
+
+    """
+    edges = []
+    for dim in ("y", "x"):
+        size = raster.sizes[dim]
+        if raster.chunks is not None:
+            chunks = raster.chunksizes[dim]
+            edges.append(np.r_[0, np.cumsum(chunks)])
+        else:
+            block = raster.encoding.get("preferred_chunks", {}).get(dim, size)
+            edges.append(np.r_[np.arange(0, size, block), size])
+    return tuple(edges)
+
+
+def sample_raster(
+    raster: str | Path | xr.DataArray,
+    x: np.ndarray,
+    y: np.ndarray,
+    method: SamplingMethod = "bilinear",
+) -> np.ndarray:
+    """
+    Sample a regular raster at point locations. The fractional row and column indices of
+    the points are computed from the affine transform of the raster, so no search or
+    triangulation of the raster cells is needed.
+
+    The points are grouped by the internal block of the raster (see `raster_blocks`)
+    they fall in and each block that contains points is read once. For raster files and
+    lazily opened rasters, the memory use and I/O are therefore proportional to the
+    number of sampled blocks instead of the size of the raster.
+
+    Parameters
+    ----------
+    raster : str | Path | xr.DataArray
+        Location of a raster file or a regular raster with "y" and "x" dimensions to
+        sample.
+    x, y : np.ndarray
+        Arrays of shape (N,) with the x and y coordinates of the points to sample.
+    method : {"bilinear", "nearest"}, optional
+        Sampling method. "bilinear" interpolates between the four surrounding cell
+        centres and returns NaN for points outside the cell centres of the raster or
+        when a surrounding cell with a non-zero weight is NaN. "nearest" returns the
+        value of the cell containing the point and NaN for points outside the raster.
+        The default is "bilinear".
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (N,) with the sampled raster values.
+
+    Raises
+    ------
+    ValueError
+        If an unknown sampling method is given.
+
+    """
+    raster = open_raster(raster)
+    nrows, ncols = raster.sizes["y"], raster.sizes["x"]
+
+    # Fractional indices with respect to the cell centres
+    a, b, c, d, e, f = (~raster.rio.transform())[:6]
+    x, y = np.asarray(x, dtype="float64"), np.asarray(y, dtype="float64")
+    cols = a * x + b * y + c - 0.5
+    rows = d * x + e * y + f - 0.5
+
+    if method == "nearest":
+        sampler, halo = _sample_nearest, 0
+        row = np.floor(rows + 0.5)
+        col = np.floor(cols + 0.5)
+        inside = (row >= 0) & (row < nrows) & (col >= 0) & (col < ncols)
+    elif method == "bilinear":
+        # Blocks are read with one extra row and column for the surrounding cells
+        sampler, halo = _sample_bilinear, 1
+        row = np.floor(rows)
+        col = np.floor(cols)
+        inside = (rows >= 0) & (rows <= nrows - 1) & (cols >= 0) & (cols <= ncols - 1)
+    else:
+        raise ValueError(f"Unknown sampling method: {method}")
+
+    sampled = np.full(len(rows), np.nan)
+    points = np.flatnonzero(inside)
+    if len(points) == 0:
+        return sampled
+
+    row_edges, col_edges = raster_blocks(raster)
+    row_block = np.searchsorted(row_edges, row[points], side="right") - 1
+    col_block = np.searchsorted(col_edges, col[points], side="right") - 1
+    block = row_block * len(col_edges) + col_block
+
+    order = np.argsort(block, kind="stable")
+    points, block = points[order], block[order]
+    splits = np.flatnonzero(np.diff(block)) + 1
+
+    for idx in np.split(np.arange(len(points)), splits):
+        rb, cb = divmod(block[idx[0]], len(col_edges))
+        row0, row1 = row_edges[rb], min(row_edges[rb + 1] + halo, nrows)
+        col0, col1 = col_edges[cb], min(col_edges[cb + 1] + halo, ncols)
+
+        window = raster.isel(y=slice(row0, row1), x=slice(col0, col1))
+        window = window.transpose("y", "x").values
+        selection = points[idx]
+        sampled[selection] = sampler(
+            window, rows[selection] - row0, cols[selection] - col0
+        )
+    return sampled
+
+
+def _sample_nearest(values: np.ndarray, rows: np.ndarray, cols: np.ndarray):
+    nrows, ncols = values.shape
+    row = np.floor(rows + 0.5).astype(int)
+    col = np.floor(cols + 0.5).astype(int)
+    inside = (row >= 0) & (row < nrows) & (col >= 0) & (col < ncols)
+
+    sampled = np.full(len(rows), np.nan)
+    sampled[inside] = values[row[inside], col[inside]]
+    return sampled
+
+
+def _sample_bilinear(values: np.ndarray, rows: np.ndarray, cols: np.ndarray):
+    nrows, ncols = values.shape
+    inside = (rows >= 0) & (rows <= nrows - 1) & (cols >= 0) & (cols <= ncols - 1)
+    rows, cols = rows[inside], cols[inside]
+
+    # Upper left cell, shifted inwards for points on the last row or column
+    row = np.clip(np.floor(rows).astype(int), 0, max(nrows - 2, 0))
+    col = np.clip(np.floor(cols).astype(int), 0, max(ncols - 2, 0))
+    drow = rows - row
+    dcol = cols - col
+    row1 = np.minimum(row + 1, nrows - 1)
+    col1 = np.minimum(col + 1, ncols - 1)
+
+    corners = (
+        (values[row, col], (1 - drow) * (1 - dcol)),
+        (values[row, col1], (1 - drow) * dcol),
+        (values[row1, col], drow * (1 - dcol)),
+        (values[row1, col1], drow * dcol),
+    )
+    interpolated = np.zeros(len(rows))
+    for value, weight in corners:
+        # Corners without weight do not contribute, also when these are NaN
+        interpolated += np.where(weight > 0, value * weight, 0.0)
+
+    sampled = np.full(len(inside), np.nan)
+    sampled[inside] = interpolated
+    return sampled
@@ -4,6 +4,8 @@ import geopandas as gpd
 import pandas as pd
 import xarray as xr
 
+from wakatools.utils.spatial import GridSpecs
+
 
 class MissingColumnsError(Exception):
     """
@@ -17,7 +19,8 @@ def validate_input(func):
     """
     Validate input Pandas DataFrame instance or instances before interpolation occurs.
     This checks the presence of the required columns in order for all data to be properly
-    concatenated to produce the interpolation input.
+    concatenated to produce the interpolation input. A `GridSpecs` target grid is
+    converted to a DataArray with `GridSpecs.to_grid`.
 
     Raises
     ------
@@ -27,22 +30,51 @@ def validate_input(func):
 
     @wraps(func)
     def wrapper(
-        *xyz: pd.DataFrame, value: str, target_grid: xr.DataArray, **kwargs
-    ) -> xr.DataArray:
-        required_cols = ["x", "y", value]
-        for df in xyz:
-            if not isinstance(df, (pd.DataFrame, gpd.GeoDataFrame)):
-                raise TypeError(
-                    "All input data must be Pandas DataFrame or Geopandas GeoDataFrame instances."
-                )
-
-            missing = [col for col in required_cols if col not in df.columns]
-            if missing:
-                raise MissingColumnsError(
-                    f"Interpolation data DataFrame is missing required columns: {missing}. "
-                    f"Please ensure that all input DataFrames have 'x', 'y', and '{value}' "
-                    "columns."
-                )
+        *xyz: pd.DataFrame,
+        value: str | list[str],
+        target_grid: xr.DataArray | GridSpecs,
+        **kwargs,
+    ) -> xr.DataArray | xr.Dataset:
+        validate_columns(xyz, value)
+        if isinstance(target_grid, GridSpecs):
+            target_grid = target_grid.to_grid()
         return func(*xyz, value=value, target_grid=target_grid, **kwargs)
 
     return wrapper
+
+
+def validate_columns(xyz: tuple[pd.DataFrame, ...], value: str | list[str]):
+    """
+    Check that all input DataFrames are Pandas DataFrame or GeoDataFrame instances with
+    the "x", "y" and value columns required for interpolation.
+
+    Parameters
+    ----------
+    xyz : tuple[pd.DataFrame, ...]
+        Input DataFrames to check.
+    value : str | list[str]
+        Column name or names of the values to interpolate.
+
+    Raises
+    ------
+    TypeError
+        If any of the inputs is not a DataFrame.
+    MissingColumnsError
+        If any of the input DataFrames are missing required columns.
+
+    """
+    values = [value] if isinstance(value, str) else list(value)
+    required_cols = ["x", "y", *values]
+    for df in xyz:
+        if not isinstance(df, (pd.DataFrame, gpd.GeoDataFrame)):
+            raise TypeError(
+                "All input data must be Pandas DataFrame or Geopandas GeoDataFrame instances."
+            )
+
+        missing = [col for col in required_cols if col not in df.columns]
+        if missing:
+            raise MissingColumnsError(
+                f"Interpolation data DataFrame is missing required columns: {missing}. "
+                f"Please ensure that all input DataFrames have 'x', 'y', and "
+                f"{', '.join(repr(v) for v in values)} columns."
+            )
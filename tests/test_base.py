@@ -1,8 +1,9 @@
+import geopandas as gpd
 import numpy as np
 import pandas as pd
 import pytest
 import xarray as xr
-from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_array_almost_equal, assert_array_equal
 
 import wakatools as waka  # Make sure "waka" accessor is available
 
@@ -51,6 +52,24 @@ class TestDataFrameAccessor:
         bounds = xyz_dataframe.waka.bounds()
         assert bounds == (0.3, 0.2, 4.9, 4.8)
 
+    @pytest.mark.unittest
+    def test_bounds_cached(self, xyz_dataframe):
+        bounds = xyz_dataframe.waka.bounds()
+        assert xyz_dataframe.waka.bounds() is bounds
+
+        xyz_dataframe.loc[3, "x"] = 6.0
+        assert xyz_dataframe.waka.bounds() == (0.3, 0.2, 6.0, 4.8)
+
+    @pytest.mark.unittest
+    def test_nullable_coordinates(self, xyz_dataframe):
+        nullable = xyz_dataframe.astype({"x": "Float64", "y": "Float64"})
+        assert nullable.waka.bounds() == xyz_dataframe.waka.bounds()
+        distance, idx = nullable.waka.nearest([1.8, 2.1])
+        assert distance == 0 and idx == 1
+
+        nullable.loc[3, "x"] = 6.0
+        assert nullable.waka.bounds() == (0.3, 0.2, 6.0, 4.8)
+
     @pytest.mark.unittest
     def test_coordinates(self, xyz_dataframe):
         coords = xyz_dataframe.waka.coordinates()
@@ -120,6 +139,27 @@ class TestDataFrameAccessor:
             [0.1, 0.3, 0.5, 0.4, 0.4, 0.4, 0.6, 0.5, 0.1, 0.7],
         )
 
+    @pytest.mark.unittest
+    def test_raster_values_from_file(
+        self, xyz_dataframe, bathymetry_grid, interpolation_result, tmp_path
+    ):
+        bathymetry_grid.rio.to_raster(tmp_path / "bathymetry.tif")
+        interpolation_result.rio.to_raster(tmp_path / "interpolated.tif")
+
+        values = xyz_dataframe.waka.get_raster_values(tmp_path / "bathymetry.tif")
+        assert_array_almost_equal(
+            values, xyz_dataframe.waka.get_raster_values(bathymetry_grid)
+        )
+        residuals = xyz_dataframe.waka.calculate_residuals(
+            value="z", raster=tmp_path / "interpolated.tif"
+        )
+        assert_array_almost_equal(
+            residuals,
+            xyz_dataframe.waka.calculate_residuals(
+                value="z", raster=interpolation_result
+            ),
+        )
+
     @pytest.mark.unittest
     def test_calculate_residuals(self, xyz_dataframe, interpolation_result):
         residuals = xyz_dataframe.waka.calculate_residuals(
@@ -130,6 +170,166 @@ class TestDataFrameAccessor:
             residuals, [np.nan, 0.06, 0.4, np.nan, np.nan, 0.02, 0.0, -0.26, 0.14, 0.2]
         )
 
+    @pytest.mark.parametrize(
+        "method, expected",
+        [
+            (
+                "bilinear",
+                [
+                    np.nan,
+                    0.114,
+                    0.368,
+                    np.nan,
+                    np.nan,
+                    0.024,
+                    0.012,
+                    -0.2,
+                    np.nan,
+                    np.nan,
+                ],
+            ),
+            ("nearest", [0.0, 0.0, 0.4, 0.1, 0.0, 0.2, 0.1, -0.6, 0.0, np.nan]),
+        ],
+    )
+    def test_calculate_residuals_regular_grid(
+        self, method, expected, xyz_dataframe, interpolation_result
+    ):
+        residuals = xyz_dataframe.waka.calculate_residuals(
+            value="z", raster=interpolation_result, method=method
+        )
+        assert isinstance(residuals, np.ndarray)
+        assert_array_almost_equal(residuals, expected)
+
+    @pytest.mark.unittest
+    def test_calculate_residuals_irregular_grid(
+        self, xyz_dataframe, interpolation_result
+    ):
+        # Irregular rasters are sampled with TIN interpolation
+        irregular = interpolation_result.assign_coords(x=[0.5, 1.5, 2.5, 3.5, 4.6])
+        residuals = xyz_dataframe.waka.calculate_residuals(
+            value="z", raster=irregular, method="bilinear"
+        )
+        expected = xyz_dataframe.waka.calculate_residuals(
+            value="z", raster=irregular, method="tin"
+        )
+        assert_array_almost_equal(residuals, expected)
+
+    @pytest.mark.unittest
+    def test_sindex(self, xyz_dataframe):
+        sindex = xyz_dataframe.waka.sindex
+        assert sindex.n == 10
+        assert xyz_dataframe.waka.sindex is sindex
+
+        # Changing the coordinates invalidates the cached index
+        xyz_dataframe.loc[0, "x"] = 10.0
+        assert xyz_dataframe.waka.sindex is not sindex
+        assert_array_almost_equal(xyz_dataframe.waka.sindex.data[0], [10.0, 3.6])
+
+        # Other DataFrames do not share the index
+        assert xyz_dataframe.copy().waka.sindex is not xyz_dataframe.waka.sindex
+
+    @pytest.mark.unittest
+    def test_nearest(self, xyz_dataframe):
+        points = np.array([[0.0, 0.0], [2.5, 2.0], [4.5, 4.5]])
+        distances, idx = xyz_dataframe.waka.nearest(points)
+        assert_array_equal(idx, [4, 2, 3])
+
+        coordinates = xyz_dataframe.waka.coordinates()
+        brute_force = np.linalg.norm(coordinates[idx] - points, axis=1)
+        assert_array_almost_equal(distances, brute_force)
+
+        distances, idx = xyz_dataframe.waka.nearest(points, k=2, max_distance=0.8)
+        assert idx.shape == (3, 2)
+        assert_array_equal(idx[:, 1], [10, 1, 10])
+        assert np.isinf(distances[0, 1])
+
+    @pytest.mark.unittest
+    def test_query_radius(self, xyz_dataframe):
+        idx = xyz_dataframe.waka.query_radius([2.0, 2.0], radius=1.0)
+        assert_array_equal(idx, [1, 2, 7])
+
+        idx = xyz_dataframe.waka.query_radius([[2.0, 2.0], [10.0, 10.0]], radius=1.0)
+        assert len(idx) == 2
+        assert idx[1] == []
+
+    @pytest.mark.unittest
+    def test_clip(self, xyz_dataframe):
+        clipped = xyz_dataframe.waka.clip((1.0, 1.0, 3.1, 4.0))
+        assert isinstance(clipped, pd.DataFrame)
+        assert_array_equal(clipped.index, [1, 2, 5, 7])
+
+    @pytest.mark.unittest
+    def test_thin(self):
+        points = pd.DataFrame(
+            {
+                "x": [0.1, 0.12, 5.0, 0.14, 7.3, 5.0],
+                "y": [0.1, 0.11, 5.0, 0.1, 2.0, 5.0],
+                "z": [1.0, 2.0, 3.0, 6.0, 4.0, 5.0],
+                "rank": [1, 3, 2, 2, 1, 1],
+                "ID": ["a", "b", "c", "d", "e", "f"],
+            },
+            index=[10, 11, 12, 13, 14, 15],
+        )
+
+        thinned = points.waka.thin(0.05, method="merge")
+        assert_array_equal(thinned.index, [10, 12, 14])
+        assert_array_almost_equal(thinned["x"], [0.12, 5.0, 7.3])
+        assert_array_almost_equal(thinned["z"], [3.0, 4.0, 4.0])
+        assert_array_almost_equal(thinned["rank"], [2.0, 1.5, 1.0])
+        assert thinned["ID"].tolist() == ["a", "c", "e"]
+
+        thinned = points.waka.thin(0.05, method="merge", aggregate="median", value="z")
+        assert_array_almost_equal(thinned["z"], [2.0, 4.0, 4.0])
+        assert_array_equal(thinned["rank"], [1, 2, 1])
+
+        thinned = points.waka.thin(0.05, method="merge", aggregate="first")
+        assert_array_equal(thinned.index, [10, 12, 14])
+        assert_array_equal(thinned["z"], [1.0, 3.0, 4.0])
+
+        thinned = points.waka.thin(
+            0.05, method="merge", aggregate="priority", priority="rank"
+        )
+        assert_array_equal(thinned.index, [11, 12, 14])
+
+        # Grid cells of 1 x 1 aligned to the lower left point
+        thinned = points.waka.thin(1.0, method="grid", aggregate="first")
+        assert_array_equal(thinned.index, [10, 12, 14])
+        assert_array_equal(points.waka.thin(0.01).index, [10, 11, 12, 13, 14])
+
+        unique = points.iloc[[0, 2, 4]]
+        assert_array_equal(unique.waka.thin(0.05), unique)
+
+    @pytest.mark.parametrize("method", ["grid", "merge"])
+    def test_thin_dense_line(self, method):
+        # Survey line of 200 points at 0.5 m spacing, 99.5 m long
+        line = pd.DataFrame({"x": np.arange(200) * 0.5, "y": 0.0, "z": 1.0})
+        thinned = line.waka.thin(0.6, method=method)
+        assert 99.5 / (2 * 0.6) <= len(thinned) <= 99.5 / 0.6 + 1
+        # Every point is within the extent of a group around the thinned points
+        distance = np.abs(line["x"].to_numpy()[:, np.newaxis] - thinned["x"].to_numpy())
+        assert distance.min(axis=1).max() <= 2 * 0.6
+
+    @pytest.mark.unittest
+    def test_thin_geodataframe(self):
+        points = gpd.GeoDataFrame(
+            {"x": [0.0, 0.2, 3.0], "y": [0.0, 0.0, 3.0], "z": [1.0, 2.0, 3.0]},
+            geometry=gpd.points_from_xy([0.0, 0.2, 3.0], [0.0, 0.0, 3.0]),
+            crs=28992,
+        )
+        thinned = points.waka.thin(0.5, method="merge")
+        assert isinstance(thinned, gpd.GeoDataFrame)
+        assert thinned.crs == points.crs
+        assert_array_almost_equal(thinned.geometry.x, [0.1, 3.0])
+
+    @pytest.mark.unittest
+    def test_thin_invalid(self, xyz_dataframe):
+        with pytest.raises(ValueError, match="Unknown thinning method"):
+            xyz_dataframe.waka.thin(1, method="invalid")
+        with pytest.raises(ValueError, match="Unknown aggregation"):
+            xyz_dataframe.waka.thin(1, aggregate="invalid")
+        with pytest.raises(ValueError, match="'priority' column is required"):
+            xyz_dataframe.waka.thin(1, aggregate="priority")
+
 
 class TestDataArrayAccessor:
     @pytest.mark.unittest
@@ -178,6 +378,58 @@ class TestDataArrayAccessor:
             ],
         )
 
+    @pytest.mark.unittest
+    def test_grid_coordinates_cached(self, bathymetry_grid):
+        coords = bathymetry_grid.waka.grid_coordinates()
+        assert bathymetry_grid.waka.grid_coordinates() is coords
+        assert not coords.flags.writeable
+
+        bathymetry_grid.coords["x"] = bathymetry_grid["x"] + 10
+        updated = bathymetry_grid.waka.grid_coordinates()
+        assert updated is not coords
+        assert_array_almost_equal(updated[:, 0], coords[:, 0] + 10)
+
+    @pytest.mark.unittest
+    def test_grid_axes(self, bathymetry_grid):
+        x, y, shape = bathymetry_grid.waka.grid_axes()
+        assert_array_almost_equal(x, [0.5, 1.5, 2.5, 3.5, 4.5])
+        assert_array_almost_equal(y, [4.5, 3.5, 2.5, 1.5, 0.5])
+        assert shape == (5, 5)
+
+        xgrid, ygrid = np.meshgrid(x, y)
+        assert_array_almost_equal(
+            np.c_[xgrid.ravel(), ygrid.ravel()],
+            bathymetry_grid.waka.grid_coordinates(),
+        )
+
+    @pytest.mark.parametrize(
+        "block_size, tile_shape, nblocks",
+        [(None, None, 1), (10, None, 3), (3, None, 5), (None, (2, 3), 6)],
+    )
+    def test_iter_grid_coordinates(
+        self, block_size, tile_shape, nblocks, bathymetry_grid
+    ):
+        blocks = bathymetry_grid.waka.grid_blocks(block_size, tile_shape)
+        assert len(blocks) == nblocks
+
+        covered = np.zeros(bathymetry_grid.shape, dtype=int)
+        for (rows, cols), coords in bathymetry_grid.waka.iter_grid_coordinates(
+            block_size, tile_shape
+        ):
+            block = bathymetry_grid[rows, cols]
+            assert_array_almost_equal(coords, block.waka.grid_coordinates())
+            covered[rows, cols] += 1
+        assert np.all(covered == 1)
+
+        scaled = bathymetry_grid.waka.iter_grid_coordinates(
+            block_size, tile_shape, scaled=True
+        )
+        (rows, cols), coords = next(scaled)
+        assert_array_almost_equal(
+            coords,
+            bathymetry_grid[rows, cols].waka.grid_coordinates_scaled((0, 0, 5, 5)),
+        )
+
     def test_grid_coordinates_scaled(self, bathymetry_grid):
         coords = bathymetry_grid.waka.grid_coordinates_scaled()
         assert isinstance(coords, np.ndarray)
@@ -1,10 +1,14 @@
+import pickle
+
 import geopandas as gpd
 import numpy as np
+import pandas as pd
 import pytest
 import xarray as xr
-from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_array_almost_equal, assert_array_equal
 
 import wakatools as waka
+from wakatools.utils.spatial import GridSpecs
 
 
 @pytest.fixture
@@ -156,3 +160,600 @@ def test_rbf_multiple_inputs(xyz_dataframe, extra_xyz_points, bathymetry_grid):
             [-0.56029485, -0.1429627, -0.17260795, -0.18272512, 0.20799584],
         ],
     )
+
+
+@pytest.mark.unittest
+def test_tin_interpolator(xyz_dataframe, bathymetry_grid):
+    tin = waka.interpolation.TinInterpolator(xyz_dataframe.waka.coordinates())
+    query_points = bathymetry_grid.waka.grid_coordinates()
+
+    simplices, bary_coords = tin.weights(query_points)
+    assert simplices.shape == (25,)
+    assert bary_coords.shape == (25, 3)
+    assert_array_almost_equal(bary_coords[simplices >= 0].sum(axis=1), 1.0)
+
+    expected = waka.interpolation.tin_surface(
+        xyz_dataframe, value="z", target_grid=bathymetry_grid
+    )
+    result = tin.interpolate(
+        xyz_dataframe["z"].values, weights=(simplices, bary_coords)
+    )
+    assert_array_almost_equal(result, expected.values.ravel())
+
+    # Other values on the same points and weights
+    result = tin.interpolate(
+        np.ones(len(xyz_dataframe)), weights=(simplices, bary_coords)
+    )
+    assert_array_almost_equal(result[simplices >= 0], 1.0)
+    assert np.all(np.isnan(result[simplices < 0]))
+
+    # Triangulation can be reused after pickling
+    unpickled = pickle.loads(pickle.dumps(tin))
+    assert_array_almost_equal(
+        unpickled(xyz_dataframe["z"].values, query_points), expected.values.ravel()
+    )
+
+    with pytest.raises(ValueError, match="Expected 10 values for the triangulation"):
+        tin.interpolate(np.ones(3), query_points)
+
+    with pytest.raises(ValueError, match="Either 'query_points' or 'weights'"):
+        tin.interpolate(xyz_dataframe["z"].values)
+
+
+@pytest.mark.unittest
+def test_tin_surface_with_interpolator(xyz_dataframe, bathymetry_grid):
+    tin = waka.interpolation.TinInterpolator(xyz_dataframe.waka.coordinates())
+    result = waka.interpolation.tin_surface(
+        xyz_dataframe, value="z", target_grid=bathymetry_grid, interpolator=tin
+    )
+    expected = waka.interpolation.tin_surface(
+        xyz_dataframe, value="z", target_grid=bathymetry_grid
+    )
+    assert_array_almost_equal(result, expected)
+
+
+@pytest.mark.parametrize(
+    "interpolator, kwargs",
+    [
+        (waka.interpolation.tin_surface, {}),
+        (waka.interpolation.griddata, {"method": "linear"}),
+        (waka.interpolation.rbf, {"kernel": "thin_plate_spline"}),
+    ],
+    ids=["tin_surface", "griddata", "rbf"],
+)
+def test_interpolate_multiple_values(
+    interpolator, kwargs, xyz_dataframe, bathymetry_grid
+):
+    xyz_dataframe["z2"] = xyz_dataframe["z"] * 2
+
+    result = interpolator(
+        xyz_dataframe, value=["z", "z2"], target_grid=bathymetry_grid, **kwargs
+    )
+    assert isinstance(result, xr.Dataset)
+    assert list(result.data_vars) == ["z", "z2"]
+    assert result["z"].dims == bathymetry_grid.dims
+    assert_array_almost_equal(result["x"], bathymetry_grid["x"])
+    assert_array_almost_equal(result["y"], bathymetry_grid["y"])
+
+    expected = interpolator(
+        xyz_dataframe, value="z", target_grid=bathymetry_grid, **kwargs
+    )
+    assert_array_almost_equal(result["z"], expected)
+    assert_array_almost_equal(result["z2"], expected * 2)
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 10, 100])
+def test_tin_surface_blocks(block_size, xyz_dataframe, bathymetry_grid):
+    expected = waka.interpolation.tin_surface(
+        xyz_dataframe, value="z", target_grid=bathymetry_grid
+    )
+    result = waka.interpolation.tin_surface(
+        xyz_dataframe, value="z", target_grid=bathymetry_grid, block_size=block_size
+    )
+    assert_array_almost_equal(result, expected)
+
+    xyz_dataframe["z2"] = xyz_dataframe["z"] * 2
+    result = waka.interpolation.tin_surface(
+        xyz_dataframe,
+        value=["z", "z2"],
+        target_grid=bathymetry_grid,
+        block_size=block_size,
+    )
+    assert_array_almost_equal(result["z"], expected)
+    assert_array_almost_equal(result["z2"], expected * 2)
+
+
+@pytest.mark.unittest
+def test_griddata_blocks(xyz_dataframe, bathymetry_grid):
+    expected = waka.interpolation.griddata(
+        xyz_dataframe, value="z", target_grid=bathymetry_grid
+    )
+    result = waka.interpolation.griddata(
+        xyz_dataframe, value="z", target_grid=bathymetry_grid, block_size=7
+    )
+    assert_array_almost_equal(result, expected)
+
+
+@pytest.mark.parametrize("method", ["linear", "nearest", "cubic"])
+def test_griddata_methods(method, xyz_dataframe, bathymetry_grid):
+    from scipy.interpolate import griddata as scipy_griddata
+
+    result = waka.interpolation.griddata(
+        xyz_dataframe, value="z", target_grid=bathymetry_grid, method=method
+    )
+    expected = scipy_griddata(
+        xyz_dataframe.waka.coordinates(),
+        xyz_dataframe["z"].values,
+        bathymetry_grid.waka.grid_coordinates(),
+        method=method,
+    )
+    assert_array_almost_equal(result.values.ravel(), expected)
+
+
+@pytest.mark.parametrize(
+    "interpolator, kwargs",
+    [
+        (waka.interpolation.tin_surface, {}),
+        (waka.interpolation.griddata, {"method": "linear"}),
+        (waka.interpolation.rbf, {"kernel": "thin_plate_spline"}),
+    ],
+    ids=["tin_surface", "griddata", "rbf"],
+)
+def test_interpolate_lazy(interpolator, kwargs, xyz_dataframe, bathymetry_grid):
+    pytest.importorskip("dask")
+
+    chunked_grid = bathymetry_grid.chunk({"y": 2, "x": 3})
+    result = interpolator(xyz_dataframe, value="z", target_grid=chunked_grid, **kwargs)
+    assert isinstance(result, xr.DataArray)
+    assert result.chunks == chunked_grid.chunks
+
+    expected = interpolator(
+        xyz_dataframe, value="z", target_grid=bathymetry_grid, **kwargs
+    )
+    assert_array_almost_equal(result.compute(), expected)
+
+    xyz_dataframe["z2"] = xyz_dataframe["z"] * 2
+    result = interpolator(
+        xyz_dataframe, value=["z", "z2"], target_grid=chunked_grid, **kwargs
+    )
+    assert isinstance(result, xr.Dataset)
+    assert result["z"].chunks == chunked_grid.chunks
+    result = result.compute()
+    assert_array_almost_equal(result["z"], expected)
+    assert_array_almost_equal(result["z2"], expected * 2)
+
+
+@pytest.mark.unittest
+def test_rbf_neighbors(xyz_dataframe, extra_xyz_points, bathymetry_grid):
+    # Using all points as neighbours gives the same result as the global model
+    result = waka.interpolation.rbf(
+        xyz_dataframe,
+        value="z",
+        target_grid=bathymetry_grid,
+        kernel="thin_plate_spline",
+        neighbors=len(xyz_dataframe),
+    )
+    expected = waka.interpolation.rbf(
+        xyz_dataframe,
+        value="z",
+        target_grid=bathymetry_grid,
+        kernel="thin_plate_spline",
+    )
+    assert_array_almost_equal(result, expected)
+
+    result = waka.interpolation.rbf(
+        xyz_dataframe,
+        extra_xyz_points,
+        value="z",
+        target_grid=bathymetry_grid,
+        kernel="thin_plate_spline",
+        neighbors=6,
+    )
+    assert result.shape == bathymetry_grid.shape
+    assert np.all(np.isfinite(result))
+
+
+@pytest.mark.parametrize("block_size", [None, 4])
+def test_rbf_workers(block_size, xyz_dataframe, bathymetry_grid):
+    expected = waka.interpolation.rbf(
+        xyz_dataframe,
+        value="z",
+        target_grid=bathymetry_grid,
+        kernel="thin_plate_spline",
+        neighbors=6,
+    )
+    result = waka.interpolation.rbf(
+        xyz_dataframe,
+        value="z",
+        target_grid=bathymetry_grid,
+        kernel="thin_plate_spline",
+        neighbors=6,
+        block_size=block_size,
+        workers=2,
+    )
+    assert_array_almost_equal(result, expected)
+
+
+@pytest.mark.unittest
+def test_tin_surface_compact_input(xyz_dataframe, bathymetry_grid):
+    compact = xyz_dataframe.astype({"z": "float32"})
+    compact["ID"] = pd.Categorical(["line1"] * len(compact))
+    result = waka.interpolation.tin_surface(
+        compact, value="z", target_grid=bathymetry_grid
+    )
+    expected = waka.interpolation.tin_surface(
+        xyz_dataframe, value="z", target_grid=bathymetry_grid
+    )
+    assert_array_almost_equal(result, expected, decimal=5)
+
+
+@pytest.mark.unittest
+def test_interpolate_gridspecs(xyz_dataframe, bathymetry_grid):
+    specs = GridSpecs(bbox=(0, 0, 5, 5), resolution=1)
+    for interpolate in (
+        waka.interpolation.tin_surface,
+        waka.interpolation.griddata,
+        waka.interpolation.rbf,
+    ):
+        expected = interpolate(xyz_dataframe, value="z", target_grid=bathymetry_grid)
+        result = interpolate(xyz_dataframe, value="z", target_grid=specs)
+        assert_array_almost_equal(result, expected)
+        assert result.rio.transform() == specs.transform
+
+
+@pytest.fixture
+def survey_points():
+    rng = np.random.default_rng(42)
+    x = rng.uniform(0, 80, 3000)
+    y = rng.uniform(0, 64, 3000)
+    return pd.DataFrame({"x": x, "y": y, "z": np.sin(x / 10) + np.cos(y / 10)})
+
+
+@pytest.mark.parametrize("method", ["tin", "griddata"])
+def test_interpolate_tiled_geotiff(method, survey_points, tmp_path):
+    rasterio = pytest.importorskip("rasterio")
+    specs = GridSpecs(bbox=(0, 0, 80, 64), resolution=1)
+    output = waka.interpolation.interpolate_tiled(
+        survey_points,
+        value="z",
+        target_grid=specs,
+        output=tmp_path / "surface.tif",
+        method=method,
+        tile_size=32,
+        halo=8,
+    )
+
+    expected = waka.interpolation.TILED_METHODS[method](
+        survey_points, value="z", target_grid=specs
+    )
+    with rasterio.open(output) as src:
+        assert src.block_shapes == [(32, 32)]
+        assert src.transform == specs.transform
+        assert_array_almost_equal(src.read(1), expected.values, decimal=5)
+
+    # All tiles are written, so a resumed job does not write anything
+    modified = output.stat().st_mtime_ns
+    waka.interpolation.interpolate_tiled(
+        survey_points,
+        value="z",
+        target_grid=specs,
+        output=output,
+        method=method,
+        tile_size=32,
+        halo=8,
+    )
+    assert output.stat().st_mtime_ns == modified
+    with pytest.raises(ValueError, match="Cannot resume"):
+        waka.interpolation.interpolate_tiled(
+            survey_points, value="z", target_grid=specs, output=output, tile_size=16
+        )
+
+
+@pytest.mark.unittest
+def test_interpolate_tiled_resume(survey_points, tmp_path):
+    rasterio = pytest.importorskip("rasterio")
+    specs = GridSpecs(bbox=(0, 0, 80, 64), resolution=1)
+    output = tmp_path / "surface.tif"
+    kwargs = dict(value="z", target_grid=specs, output=output, tile_size=32, halo=8)
+    waka.interpolation.interpolate_tiled(survey_points, **kwargs)
+    with rasterio.open(output) as src:
+        expected = src.read(1)
+
+    # Simulate an interrupted job where only the first tile was written
+    sidecar = tmp_path / "surface.tif.tiles"
+    header, first, *_ = sidecar.read_text().splitlines()
+    sidecar.write_text(f"{header}\n{first}\n")
+    with rasterio.open(output, "r+") as dst:
+        dst.write(
+            np.full((64, 48), np.nan, dtype="float32"), 1, window=((0, 64), (32, 80))
+        )
+
+    waka.interpolation.interpolate_tiled(survey_points, **kwargs)
+    with rasterio.open(output) as src:
+        assert_array_almost_equal(src.read(1), expected)
+    assert len(sidecar.read_text().splitlines()) == 7
+
+    # Tiles of another method, interpolator options or input are never reused
+    changed = survey_points.assign(z=survey_points["z"] + 1)
+    for data, options in [
+        (survey_points, {"method": "idw"}),
+        (survey_points, {"method": "griddata", "rescale": True}),
+        (changed, {}),
+    ]:
+        with pytest.raises(ValueError, match="Cannot resume"):
+            waka.interpolation.interpolate_tiled(data, **kwargs, **options)
+
+    with pytest.raises(ValueError, match="Unknown interpolation method: invalid"):
+        waka.interpolation.interpolate_tiled(survey_points, method="invalid", **kwargs)
+
+
+@pytest.mark.unittest
+def test_interpolate_tiled_zarr(survey_points, tmp_path):
+    pytest.importorskip("zarr")
+    pytest.importorskip("dask")
+    grid = GridSpecs(bbox=(0, 0, 80, 64), resolution=1).to_grid()
+    output = waka.interpolation.interpolate_tiled(
+        survey_points,
+        value="z",
+        target_grid=grid,
+        output=tmp_path / "surface.zarr",
+        tile_size=32,
+        halo=8,
+        n_jobs=2,
+    )
+
+    expected = waka.interpolation.tin_surface(
+        survey_points, value="z", target_grid=grid
+    )
+    result = xr.open_zarr(output)["z"]
+    assert result.chunks == ((32, 32), (32, 32, 16))
+    assert_array_almost_equal(result["x"], grid["x"])
+    assert_array_almost_equal(result.values, expected.values, decimal=5)
+
+
+@pytest.mark.unittest
+def test_tin_interpolator_add_points(survey_points):
+    base, new = survey_points.iloc[:2000], survey_points.iloc[2000:2010]
+    tin = waka.interpolation.TinInterpolator(base.waka.coordinates())
+    previous = {tuple(sorted(s)) for s in tin.simplices}
+
+    changed = tin.add_points(new.waka.coordinates())
+    assert tin.npoints == 2010
+    assert changed.shape == (len(tin.simplices),)
+    current = [tuple(sorted(s)) for s in tin.simplices]
+    assert_array_equal(changed, [s not in previous for s in current])
+
+    query = np.array([[10.0, 10.0], [40.0, 30.0]])
+    values = survey_points["z"].values[:2010]
+    expected = waka.interpolation.TinInterpolator(
+        survey_points.iloc[:2010].waka.coordinates()
+    )
+    assert_array_almost_equal(
+        tin.interpolate(values, query), expected.interpolate(values, query)
+    )
+
+
+@pytest.mark.parametrize("value", ["z", ["z", "z2"]])
+def test_update_tin_surface(value, survey_points):
+    survey_points["z2"] = survey_points["z"] * 2
+    grid = GridSpecs(bbox=(0, 0, 80, 64), resolution=1).to_grid()
+    base = survey_points.iloc[:2900]
+    tin = waka.interpolation.TinInterpolator(base.waka.coordinates())
+    surface = waka.interpolation.tin_surface(
+        base, value=value, target_grid=grid, interpolator=tin
+    )
+    before = surface.copy(deep=True)
+
+    # A new survey line across part of the grid
+    line = pd.DataFrame({"x": np.linspace(20, 40, 20), "y": np.linspace(10, 20, 20)})
+    line["z"] = 5.0
+    line["z2"] = 10.0
+    data = pd.concat([base, line], ignore_index=True)
+    dirty = waka.interpolation.update_tin_surface(
+        surface, base, line, value=value, interpolator=tin
+    )
+
+    expected = waka.interpolation.tin_surface(data, value=value, target_grid=grid)
+    result = surface["z"] if isinstance(value, list) else surface
+    if isinstance(value, list):
+        expected, before = expected["z"], before["z"]
+    assert_array_almost_equal(result, expected)
+
+    changed = ~((result == before) | (result.isnull() & before.isnull()))
+    assert dirty.dtype == bool
+    assert 0 < dirty.sum() < dirty.size / 4
+    assert not (changed & ~dirty).any()
+
+    xmin, ymin, xmax, ymax = dirty.attrs["dirty_bbox"]
+    assert xmin <= 20 and ymin <= 10 and xmax >= 40 and ymax >= 20
+    assert not dirty.where((dirty["x"] < xmin) | (dirty["x"] > xmax), False).any()
+
+    # Without new points nothing is updated
+    dirty = waka.interpolation.update_tin_surface(
+        surface, data, value=value, interpolator=tin
+    )
+    assert not dirty.any()
+    assert dirty.attrs["dirty_bbox"] is None
+
+
+@pytest.mark.unittest
+def test_idw():
+    points = pd.DataFrame(
+        {"x": [0.5, 2.5, 0.5, 2.5], "y": [0.5, 0.5, 2.5, 2.5], "z": [1.0, 2, 3, 4]}
+    )
+    grid = GridSpecs(bbox=(0, 0, 3, 3), resolution=1).to_grid()
+    result = waka.interpolation.idw(points, value="z", target_grid=grid)
+
+    # Grid cells on an input point take its value and the centre weighs all equally
+    assert_array_almost_equal(
+        result.sel(x=[0.5, 2.5], y=[2.5, 0.5]), [[3.0, 4.0], [1.0, 2.0]]
+    )
+    assert result.sel(x=1.5, y=1.5) == pytest.approx(2.5)
+
+    nearest = waka.interpolation.idw(points, value="z", target_grid=grid, k=1)
+    assert nearest.sel(x=1.5, y=0.5) in (1.0, 2.0)
+
+    result = waka.interpolation.idw(
+        points, value="z", target_grid=grid, max_distance=0.5
+    )
+    assert result.notnull().sum() == 4
+
+
+@pytest.mark.parametrize(
+    "method", ["idw", "natural_neighbour"], ids=["idw", "natural_neighbour"]
+)
+def test_kdtree_interpolators(method, survey_points):
+    survey_points["z2"] = survey_points["z"] * 2
+    interpolate = getattr(waka.interpolation, method)
+    grid = GridSpecs(bbox=(0, 0, 80, 64), resolution=0.5).to_grid()
+
+    result = interpolate(
+        survey_points, value="z", target_grid=grid, max_distance=5, block_size=20_000
+    )
+    whole = interpolate(
+        survey_points, value="z", target_grid=grid, max_distance=5, block_size=10**6
+    )
+    assert_array_almost_equal(result, whole)
+
+    # Blocks overlap enough without max_distance
+    result = interpolate(survey_points, value="z", target_grid=grid, block_size=20_000)
+    whole = interpolate(survey_points, value="z", target_grid=grid)
+    assert_array_almost_equal(result, whole)
+
+    # Chunks are interpolated lazily with the same overlap as blocks
+    pytest.importorskip("dask")
+    chunked = grid.chunk({"y": 50, "x": 60})
+    for kwargs in ({}, {"max_distance": 5}):
+        result = interpolate(survey_points, value="z", target_grid=chunked, **kwargs)
+        assert result.chunks == chunked.chunks
+        whole = interpolate(survey_points, value="z", target_grid=grid, **kwargs)
+        assert_array_almost_equal(result.compute(), whole)
+
+    truth = np.sin(grid["x"] / 10) + np.cos(grid["y"] / 10)
+    assert float(abs(result - truth).mean()) < 0.1
+
+    multi = interpolate(survey_points, value=["z", "z2"], target_grid=grid)
+    assert isinstance(multi, xr.Dataset)
+    assert_array_almost_equal(multi["z2"], 2 * multi["z"])
+
+    # Grid cells far away from the input points are not interpolated
+    far = pd.DataFrame({"x": [1.0, 2.0, 1.0], "y": [1.0, 1.0, 2.0], "z": [1.0, 2, 3]})
+    result = interpolate(far, value="z", target_grid=grid, max_distance=5)
+    assert result.sel(x=60, y=60, method="nearest").isnull()
+    assert result.sel(x=1.25, y=1.25).notnull()
+
+
+@pytest.mark.unittest
+def test_variogram():
+    variogram = waka.interpolation.Variogram("spherical", nugget=0.1, sill=1, range=10)
+    assert_array_almost_equal(variogram([0, 5, 10, 20]), [0, 0.7188, 1, 1], decimal=4)
+    assert_array_almost_equal(variogram.covariance([0, 20]), [1, 0])
+
+    for model in ["exponential", "gaussian"]:
+        variogram = waka.interpolation.Variogram(model, sill=2, range=10)
+        assert variogram(10) == pytest.approx(2 * (1 - np.exp(-3)))
+
+    with pytest.raises(ValueError, match="Unknown variogram model"):
+        waka.interpolation.Variogram("linear")
+
+
+@pytest.mark.unittest
+def test_empirical_variogram(survey_points):
+    points = survey_points.iloc[:300]
+    empirical = waka.interpolation.empirical_variogram(
+        points, value="z", n_lags=5, max_lag=20, block_size=64
+    )
+
+    xy, z = points.waka.coordinates(), points["z"].values
+    i, j = np.triu_indices(len(points), k=1)
+    distance = np.hypot(*(xy[i] - xy[j]).T)
+    pairs = distance < 20
+    bins = (distance[pairs] / 4).astype(int)
+    semivariance = 0.5 * (z[i] - z[j])[pairs] ** 2
+
+    assert_array_equal(empirical["npairs"], np.bincount(bins))
+    assert_array_almost_equal(
+        empirical["semivariance"],
+        np.bincount(bins, semivariance) / np.bincount(bins),
+    )
+    assert_array_almost_equal(
+        empirical["lag"], np.bincount(bins, distance[pairs]) / np.bincount(bins)
+    )
+
+    sampled = waka.interpolation.empirical_variogram(
+        survey_points, value="z", sample_size=500, seed=0
+    )
+    assert sampled["npairs"].sum() <= 500 * 499 / 2
+
+
+@pytest.mark.unittest
+def test_variogram_fit():
+    true = waka.interpolation.Variogram("exponential", nugget=0.2, sill=1.5, range=30)
+    lag = np.linspace(1, 60, 20)
+    empirical = pd.DataFrame(
+        {"lag": lag, "semivariance": true(lag), "npairs": np.full(20, 100)}
+    )
+    fitted = waka.interpolation.Variogram.fit(empirical, model="exponential")
+    assert fitted.nugget == pytest.approx(0.2, abs=1e-4)
+    assert fitted.sill == pytest.approx(1.5, abs=1e-4)
+    assert fitted.range == pytest.approx(30, abs=1e-2)
+
+
+def test_kriging(survey_points):
+    grid = GridSpecs(bbox=(0, 0, 80, 64), resolution=0.5).to_grid()
+    result = waka.interpolation.kriging(
+        survey_points, value="z", target_grid=grid, variogram="gaussian", seed=0
+    )
+    assert isinstance(result, xr.Dataset)
+    assert set(result.data_vars) == {"estimate", "variance"}
+    assert result.attrs["variogram_model"] == "gaussian"
+
+    truth = np.sin(grid["x"] / 10) + np.cos(grid["y"] / 10)
+    assert float(abs(result["estimate"] - truth).mean()) < 0.01
+    assert (result["variance"] >= 0).all()
+
+    blocks = waka.interpolation.kriging(
+        survey_points,
+        value="z",
+        target_grid=grid,
+        variogram="gaussian",
+        seed=0,
+        block_size=1234,
+    )
+    assert_array_almost_equal(result["estimate"], blocks["estimate"])
+
+    # Exact at the input points, where the variance grows away from the points
+    variogram = waka.interpolation.Variogram("spherical", sill=1, range=20)
+    points = pd.DataFrame({"x": [10.25, 30.25], "y": [10.25, 30.25], "z": [1.0, 2]})
+    result = waka.interpolation.kriging(
+        points, value="z", target_grid=grid, variogram=variogram, max_distance=40
+    )
+    on_points = result.sel(x=[10.25, 30.25], y=[10.25, 30.25])
+    assert_array_almost_equal(np.diag(on_points["estimate"]), [1, 2])
+    assert_array_almost_equal(np.diag(on_points["variance"]), [0, 0])
+    assert result["variance"].sel(x=20.25, y=20.25) > 0.5
+    assert result["estimate"].sel(x=79.75, y=0.25, method="nearest").isnull()
+
+
+@pytest.mark.parametrize("thin_method", ["grid", "merge"])
+@pytest.mark.parametrize("method", ["tin_surface", "rbf"])
+def test_interpolate_thin(method, thin_method, survey_points):
+    # Overlapping survey with the same points, slightly shifted
+    shifted = survey_points.assign(x=survey_points["x"] + 1e-4)
+    grid = GridSpecs(bbox=(0, 0, 80, 64), resolution=1).to_grid()
+    interpolate = getattr(waka.interpolation, method)
+    kwargs = {"neighbors": 20} if method == "rbf" else {}
+
+    result = interpolate(
+        survey_points,
+        shifted,
+        value="z",
+        target_grid=grid,
+        thin=0.01,
+        thin_method=thin_method,
+        **kwargs,
+    )
+    expected = interpolate(survey_points, value="z", target_grid=grid, **kwargs)
+    # Grid cells can split a point and its shifted copy, which then both remain
+    decimal = 2 if thin_method == "grid" else 3
+    assert_array_almost_equal(result, expected, decimal=decimal)
@@ -15,6 +15,52 @@ def test_geocard7(testdatadir):
     assert_array_equal(df["reflector"].unique(), ["1st reflector", "2nd reflector"])
     assert {"x", "y", "time", "ID"}.issubset(df.columns)
     assert len(df) == 8864  # Assert if all data is read
+    assert df.dtypes.to_dict() == {
+        column: kingdom_exports.COLUMN_DTYPE_SCHEMA[column] for column in df.columns
+    }
+
+
+@pytest.mark.unittest
+def test_geocard7_sections(tmp_path):
+    file = tmp_path / "geocard7.dat"
+    file.write_text(
+        "PROFILE horizon A (t TYPE 1 44\n"
+        "SNAPPING PARAMETERS 2    20 2\n"
+        "  1.0E+05  3.0E+05  5.08  1.00  1  -1108.8 2 line1\n"
+        "  2.0E+05  4.0E+05  5.09  2.00  2  -316.7 2 line1\n"
+        "EOD horizon A (top)\n"
+        "PROFILE horizon B (b TYPE 1 6\n"
+        "SNAPPING PARAMETERS 2    20 2\n"
+        "PROFILE no title\n"
+        "SNAPPING PARAMETERS 2    20 2\n"
+        "  3.0E+05  5.0E+05  6.84  3.00  3  293.1 2 line2\n"
+    )
+    df = kingdom_exports.geocard7(file)
+    assert_array_equal(df["reflector"], ["horizon A", "horizon A", "unknown"])
+    assert_array_equal(df["x"], [1.0e5, 2.0e5, 3.0e5])
+    assert_array_equal(df["pointcountint"], [1, 2, 3])
+    assert_array_equal(df["ID"], ["line1", "line1", "line2"])
+
+    empty = tmp_path / "empty.dat"
+    empty.write_text("")
+    with pytest.raises(ValueError, match="No PROFILE sections found"):
+        kingdom_exports.geocard7(empty)
+
+
+@pytest.mark.unittest
+def test_geocard7_encoding(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        kingdom_exports.locale, "getpreferredencoding", lambda _: "cp1252"
+    )
+    file = tmp_path / "geocard7.dat"
+    file.write_bytes(
+        "PROFILE Höhe (t TYPE 1 44\n"
+        "SNAPPING PARAMETERS 2    20 2\n"
+        "  1.0E+05  3.0E+05  5.08  1.00  1  -1108.8 2 Straße\n".encode("cp1252")
+    )
+    df = kingdom_exports.geocard7(file)
+    assert_array_equal(df["reflector"], ["Höhe"])
+    assert_array_equal(df["ID"], ["Straße"])
 
 
 @pytest.mark.unittest
@@ -23,16 +69,111 @@ def test_single_horizon(testdatadir):
     df = kingdom_exports.single_horizon(xyltta_file)
     assert isinstance(df, pd.DataFrame)
     assert {"x", "y", "time", "ID"}.issubset(df.columns)
-    assert len(df) == 4842  # Assert if all data is read
+    assert len(df) == 4843  # Assert if all data is read
 
     df = kingdom_exports.single_horizon(
         xyltta_file, columns=["x", "y", "ID", "trace", "time", "amplitude"]
     )
     assert isinstance(df, pd.DataFrame)
     assert {"x", "y", "ID", "trace", "time", "amplitude"}.issubset(df.columns)
-    assert len(df) == 4842
+    assert len(df) == 4843
 
     with pytest.raises(ValueError, match="Expected 5 columns, got 6"):
         kingdom_exports.single_horizon(
             xyltta_file, columns=["x", "y", "ID", "trace", "time"]
         )
+
+
+@pytest.mark.parametrize("float32", [False, True])
+def test_geocard7_compact(float32, testdatadir):
+    geocard7_file = testdatadir / "geocard7.dat"
+    expected = kingdom_exports.geocard7(geocard7_file)
+    df = kingdom_exports.geocard7(geocard7_file, compact=True, float32=float32)
+    assert len(df) == len(expected)
+    assert isinstance(df["ID"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["reflector"].dtype, pd.CategoricalDtype)
+    assert_array_equal(
+        df["reflector"].cat.categories, ["1st reflector", "2nd reflector"]
+    )
+    assert df["pointcount"].dtype == "int32"
+    assert df["pointcountint"].dtype == "int32"
+    assert df["time"].dtype == ("float32" if float32 else "float64")
+    assert df["amplitude"].dtype == ("float32" if float32 else "float64")
+    assert df["x"].dtype == "float64"
+    assert_array_equal(df["ID"].astype(str), expected["ID"].astype(str))
+    assert_array_equal(df["pointcount"], expected["pointcount"])
+
+    saved = expected.memory_usage(deep=True).sum() - df.memory_usage(deep=True).sum()
+    assert df.attrs["memory_saved"] == saved
+    assert saved > 0
+
+
+@pytest.mark.unittest
+def test_single_horizon_compact(testdatadir):
+    xyltta_file = testdatadir / "xylinetracetimeamplitude.dat"
+    df = kingdom_exports.single_horizon(xyltta_file, compact=True, float32=True)
+    assert len(df) == 4843
+    assert isinstance(df["ID"].dtype, pd.CategoricalDtype)
+    assert df["trace"].dtype == "int32"
+    assert df["time"].dtype == "float32"
+    assert df.attrs["memory_saved"] > 0
+
+
+@pytest.mark.unittest
+def test_to_compact():
+    df = pd.DataFrame(
+        {
+            "ID": ["a", "a", "b"],
+            "trace": [1.0, 2.0, 3.5],
+            "pointcountint": [1, 2, 3],
+            "time": [0.1, 0.2, 0.3],
+        }
+    )
+    compact = kingdom_exports.to_compact(df)
+    assert isinstance(compact["ID"].dtype, pd.CategoricalDtype)
+    assert compact["trace"].dtype == "float64"  # Not converted, not whole numbers
+    assert compact["pointcountint"].dtype == "int32"
+    assert compact["time"].dtype == "float64"
+    assert df["ID"].dtype != compact["ID"].dtype  # Input is not modified
+
+
+@pytest.mark.unittest
+def test_write_geocard7(testdatadir, tmp_path):
+    geocard7_file = testdatadir / "geocard7.dat"
+    df = kingdom_exports.geocard7(geocard7_file)
+
+    outfile = tmp_path / "geocard7.dat"
+    kingdom_exports.write_geocard7(df, outfile)
+
+    # Data lines are written in the same layout as the Kingdom export
+    def data_lines(file):
+        keywords = ("PROFILE", "SNAPPING", "EOD")
+        return [line for line in open(file) if not line.startswith(keywords)]
+
+    assert data_lines(outfile) == data_lines(geocard7_file)
+
+    result = kingdom_exports.geocard7(outfile)
+    pd.testing.assert_frame_equal(result, df)
+
+    rewritten = tmp_path / "rewritten.dat"
+    kingdom_exports.write_geocard7(result, rewritten)
+    assert rewritten.read_bytes() == outfile.read_bytes()
+
+    with pytest.raises(ValueError, match="missing required columns: \\['reflector'\\]"):
+        kingdom_exports.write_geocard7(df.drop(columns="reflector"), outfile)
+
+
+@pytest.mark.unittest
+def test_write_single_horizon(testdatadir, tmp_path):
+    xyltta_file = testdatadir / "xylinetracetimeamplitude.dat"
+    df = kingdom_exports.single_horizon(xyltta_file)
+
+    outfile = tmp_path / "single_horizon.dat"
+    kingdom_exports.write_single_horizon(df, outfile)
+    assert outfile.read_bytes() == xyltta_file.read_bytes()
+
+    renamed = df.rename(columns={"ID": "line"})
+    kingdom_exports.write_single_horizon(
+        renamed, outfile, columns=["x", "y", "line", "trace", "time", "amplitude"]
+    )
+    assert outfile.read_bytes() == xyltta_file.read_bytes()
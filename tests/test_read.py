@@ -1,9 +1,13 @@
+import os
+
 import geost
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import pytest
 from numpy.testing import assert_array_equal
 
-from wakatools.io import read
+from wakatools.io import cache, read
 
 
 @pytest.mark.parametrize(
@@ -60,3 +64,108 @@ def test_bro_bhrg_in(buffer, nbhrg):
     bhrg = read.bro_bhrg_in(bbox=bbox, buffer=buffer)
     assert isinstance(bhrg, geost.Collection)
     assert len(bhrg) == nbhrg
+
+
+@pytest.mark.unittest
+def test_read_seismics_multiple_files(testdatadir):
+    files = [testdatadir / "geocard7.dat", str(testdatadir / "geocard7.dat")]
+    data = read.read_seismics(files, "multi-horizon", n_jobs=2)
+    assert len(data) == 2 * 8864
+    assert isinstance(data["ID"].dtype, pd.CategoricalDtype)
+    assert isinstance(data["reflector"].dtype, pd.CategoricalDtype)
+    assert_array_equal(data["source"].unique(), [str(files[0])])
+    assert data.attrs["read_errors"] == {}
+
+    data = read.read_seismics(testdatadir / "geocard*.dat", "multi-horizon")
+    assert len(data) == 8864
+    assert_array_equal(data["source"].unique(), [str(testdatadir / "geocard7.dat")])
+
+    with pytest.raises(ValueError, match="No files found matching"):
+        read.read_seismics(testdatadir / "nonexistent*.dat", "multi-horizon")
+
+
+@pytest.mark.unittest
+def test_read_seismics_failure_report(testdatadir):
+    files = [testdatadir / "geocard7.dat", testdatadir / "87078_HB008.xml"]
+    with pytest.warns(UserWarning, match="Skipped 1 of 2 seismic files"):
+        data = read.read_seismics(files, "multi-horizon")
+    assert len(data) == 8864
+    assert list(data.attrs["read_errors"]) == [str(testdatadir / "87078_HB008.xml")]
+
+    with pytest.raises(ValueError, match="None of the seismic files could be read"):
+        read.read_seismics(files[1:], "multi-horizon")
+
+
+@pytest.mark.unittest
+def test_read_seismics_cache(testdatadir, tmp_path):
+    cache.set_cache(tmp_path / "cache")
+    try:
+        file = testdatadir / "geocard7.dat"
+        expected = read.read_seismics(file, "multi-horizon")
+
+        data = read.read_seismics(file, "multi-horizon", cache=True)
+        cached_files = list((tmp_path / "cache").glob("geocard7-*.feather"))
+        assert len(cached_files) == 1
+        pd.testing.assert_frame_equal(data, expected)
+
+        # Second read loads from the cache
+        data = read.read_seismics(file, "multi-horizon", cache=True)
+        pd.testing.assert_frame_equal(data, expected)
+        assert list((tmp_path / "cache").glob("*.feather")) == cached_files
+
+        # Different reader options use a different cache file
+        read.read_seismics(
+            testdatadir / "xylinetracetimeamplitude.dat", "single-horizon", cache=True
+        )
+        read.read_seismics(
+            testdatadir / "xylinetracetimeamplitude.dat",
+            "single-horizon",
+            cache=True,
+            columns=["x", "y", "line", "trace", "time", "amplitude"],
+        )
+        assert len(list((tmp_path / "cache").glob("*.feather"))) == 3
+
+        # Least recently used files are evicted when the size limit is exceeded
+        for f in (tmp_path / "cache").glob("xylinetracetimeamplitude-*.feather"):
+            os.utime(f, ns=(0, 0))
+        cache.evict(tmp_path / "cache", max_size=cached_files[0].stat().st_size)
+        assert list((tmp_path / "cache").glob("*.feather")) == cached_files
+
+        cache.clear()
+        assert len(list((tmp_path / "cache").glob("*.feather"))) == 0
+
+        # Settings that are not given are kept
+        cache.set_cache(max_size=1024)
+        assert cache.settings.directory == tmp_path / "cache"
+        assert cache.settings.max_size == 1024
+    finally:
+        cache.set_cache(reset=True)
+    assert cache.settings == cache.CacheSettings()
+
+
+@pytest.mark.unittest
+def test_cache_memory_map(tmp_path):
+    data = pd.DataFrame({"x": np.arange(100_000.0), "line": np.arange(100_000)})
+    path = tmp_path / "data.feather"
+    cache._store(data, path)
+
+    allocated = pa.total_allocated_bytes()
+    cached = cache._load(path)
+    pd.testing.assert_frame_equal(cached, data)
+
+    # Numeric columns are read-only views of the memory map instead of copies
+    assert pa.total_allocated_bytes() - allocated < data.memory_usage().sum() / 100
+    assert not cached["x"].to_numpy().flags.writeable
+
+
+@pytest.mark.unittest
+def test_read_seismics_cache_compact(testdatadir, tmp_path):
+    cache.set_cache(tmp_path / "cache")
+    try:
+        file = testdatadir / "geocard7.dat"
+        fresh = read.read_seismics(file, "multi-horizon", cache=True, compact=True)
+        cached = read.read_seismics(file, "multi-horizon", cache=True, compact=True)
+        assert fresh.dtypes.equals(cached.dtypes)
+        pd.testing.assert_frame_equal(cached, fresh)
+    finally:
+        cache.set_cache(reset=True)
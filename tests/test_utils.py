@@ -1,10 +1,14 @@
+import geopandas as gpd
 import numpy as np
 import pandas as pd
 import pytest
 import rioxarray as rio
-from numpy.testing import assert_array_almost_equal
+import shapely
+import xarray as xr
+from affine import Affine
+from numpy.testing import assert_array_almost_equal, assert_array_equal
 
-from wakatools.utils import conversion, scaling, spatial
+from wakatools.utils import conversion, profiling, scaling, spatial
 
 
 @pytest.mark.parametrize(
@@ -39,6 +43,27 @@ def test_add_depth_column(seismic_data):
     )
 
 
+@pytest.mark.unittest
+def test_add_depth_column_methods(seismic_data):
+    vectorised = conversion.calculate_depth(seismic_data, method="vectorised")
+    loop = conversion.calculate_depth(seismic_data, method="loop")
+    assert_array_almost_equal(vectorised, loop)
+    assert_array_equal(vectorised.index, loop.index)
+
+
+@pytest.mark.parametrize("method", ["vectorised", "loop"])
+def test_calculate_absolute_time(method):
+    bathymetry = shapely.LineString([(0, 0, 4.0), (2, 0, 6.0), (2, 2, 8.0)])
+    reflector = shapely.LineString(
+        [(-1, 1, 10.0), (0.5, 0.5, 10.0), (1.5, 1.0, 9.0), (3, 1, 12.0), (3, 3, 12.0)]
+    )
+    time = conversion.calculate_absolute_time(bathymetry, reflector, method=method)
+    assert_array_almost_equal(time, [6.0, 5.5, 2.0, 5.0, 4.0])
+
+    with pytest.raises(ValueError, match="Unknown conversion method: invalid"):
+        conversion.calculate_absolute_time(bathymetry, reflector, method="invalid")
+
+
 @pytest.mark.parametrize(
     "value, resolution, expected",
     (
@@ -83,6 +108,7 @@ def test_target_grid_from(xyz_dataframe, resolution, expected_bounds):
 
     assert grid.rio.bounds() == expected_bounds
     assert grid.rio.resolution() == (resolution, -resolution)
+    assert grid.values.flags.writeable
 
     minx, miny, maxx, maxy = grid.rio.bounds()
     assert np.all(
@@ -91,3 +117,248 @@ def test_target_grid_from(xyz_dataframe, resolution, expected_bounds):
         & (xyz_dataframe["y"] >= miny)
         & (xyz_dataframe["y"] <= maxy)
     )
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_add_depth_column_parallel(executor, seismic_data):
+    expected = conversion.calculate_depth(seismic_data)
+    depth = conversion.calculate_depth(seismic_data, n_jobs=2, executor=executor)
+    assert_array_almost_equal(depth, expected)
+    assert_array_equal(depth.index, expected.index)
+
+    with pytest.raises(ValueError, match="Unknown executor: invalid"):
+        conversion.calculate_depth(seismic_data, n_jobs=2, executor="invalid")
+
+
+@pytest.mark.unittest
+def test_add_depth_column_compact(seismic_data):
+    expected = conversion.calculate_depth(seismic_data)
+    compact = seismic_data.astype(
+        {"ID": "category", "reflector": "category", "time": "float32"}
+    )
+    depth = conversion.calculate_depth(compact)
+    assert_array_almost_equal(depth, expected)
+
+
+@pytest.mark.unittest
+def test_sample_raster(bathymetry_grid):
+    x = np.array([0.5, 1.2, 2.25, 4.5, 0.2, 4.9, 3.0])
+    y = np.array([4.5, 4.2, 1.5, 0.5, 3.0, 3.0, 5.2])
+
+    sampled = spatial.sample_raster(bathymetry_grid, x, y, method="bilinear")
+    assert_array_almost_equal(sampled, [0.0, 0.1, 0.475, 0.8, np.nan, np.nan, np.nan])
+
+    sampled = spatial.sample_raster(bathymetry_grid, x, y, method="nearest")
+    assert_array_almost_equal(sampled, [0.0, 0.1, 0.5, 0.8, 0.2, 0.6, np.nan])
+
+    # NaN cells only affect points with a non-zero weight for that cell
+    grid = bathymetry_grid.copy()
+    grid[0, 1] = np.nan
+    sampled = spatial.sample_raster(grid, x, y, method="bilinear")
+    assert_array_almost_equal(
+        sampled, [0.0, np.nan, 0.475, 0.8, np.nan, np.nan, np.nan]
+    )
+
+    with pytest.raises(ValueError, match="Unknown sampling method: invalid"):
+        spatial.sample_raster(bathymetry_grid, x, y, method="invalid")
+
+
+@pytest.mark.unittest
+def test_is_regular(bathymetry_grid):
+    assert spatial.is_regular(bathymetry_grid)
+    assert not spatial.is_regular(
+        bathymetry_grid.assign_coords(y=[4.5, 3.5, 2.5, 1.5, 0.0])
+    )
+
+
+@pytest.fixture
+def tiled_raster(tmp_path):
+    rng = np.random.default_rng(0)
+    data = rng.random((48, 40))
+    data[20, 5] = -9999
+    raster = xr.DataArray(
+        data, coords={"y": np.arange(48, 0, -1) - 0.5, "x": np.arange(40) + 0.5}
+    )
+    raster = raster.rio.write_nodata(-9999)
+    file = tmp_path / "raster.tif"
+    raster.rio.to_raster(file, tiled=True, blockxsize=16, blockysize=16)
+    return file, raster.where(raster != -9999)
+
+
+@pytest.mark.unittest
+def test_raster_blocks(tiled_raster):
+    file, raster = tiled_raster
+    opened = spatial.open_raster(file)
+    assert opened.dims == ("y", "x")
+
+    rows, cols = spatial.raster_blocks(opened)
+    assert_array_equal(rows, [0, 16, 32, 48])
+    assert_array_equal(cols, [0, 16, 32, 40])
+
+    rows, cols = spatial.raster_blocks(raster)
+    assert_array_equal(rows, [0, 48])
+    assert_array_equal(cols, [0, 40])
+
+
+@pytest.mark.parametrize("method", ["bilinear", "nearest"])
+def test_sample_raster_file(tiled_raster, method):
+    file, raster = tiled_raster
+    rng = np.random.default_rng(1)
+    x = rng.uniform(-2, 42, 500)
+    y = rng.uniform(-2, 50, 500)
+    x[:3] = [16.0, 5.2, 31.9]  # On a block edge, next to the nodata cell, within halo
+    y[:3] = [31.6, 27.4, 16.2]
+
+    sampled = spatial.sample_raster(file, x, y, method=method)
+    expected = spatial.sample_raster(raster, x, y, method=method)
+    assert_array_almost_equal(sampled, expected)
+    assert np.isnan(sampled[1])
+
+
+@pytest.mark.parametrize(
+    "kwargs, shape, bbox",
+    [
+        ({"bbox": (0.3, 0.2, 4.9, 4.8), "resolution": 1.0}, (5, 5), (0, 0, 5, 5)),
+        ({"bbox": (0.3, 0.2, 4.9, 4.8), "resolution": (2, 1)}, (5, 3), (0, 0, 6, 5)),
+        (
+            {"bbox": (0.3, 0.2, 4.9, 4.8), "resolution": 1.0, "align": "corner"},
+            (5, 5),
+            (0.3, -0.2, 5.3, 4.8),
+        ),
+        ({"bbox": (0, 0, 10, 5), "shape": (5, 4)}, (5, 4), (0, 0, 10, 5)),
+        (
+            {"transform": Affine(0.5, 0, 1, 0, -0.5, 3), "shape": (4, 6)},
+            (4, 6),
+            (1, 1, 4, 3),
+        ),
+    ],
+)
+def test_gridspecs(kwargs, shape, bbox):
+    specs = spatial.GridSpecs(**kwargs)
+    assert specs.shape == shape
+    assert_array_almost_equal(specs.bbox, bbox)
+
+    grid = specs.to_grid()
+    assert grid.shape == shape
+    assert_array_almost_equal(grid.rio.transform()[:6], specs.transform[:6])
+    assert_array_almost_equal(grid.rio.bounds(), bbox)
+    assert_array_almost_equal(grid["x"], specs.x)
+    assert_array_almost_equal(grid["y"], specs.y)
+    assert grid.values.strides == (0, 0)  # The zeros are not allocated
+
+
+@pytest.mark.unittest
+def test_gridspecs_invalid():
+    with pytest.raises(ValueError, match="GridSpecs requires either"):
+        spatial.GridSpecs(bbox=(0, 0, 1, 1))
+    with pytest.raises(ValueError, match="also requires a 'shape'"):
+        spatial.GridSpecs(transform=Affine.identity())
+    with pytest.raises(ValueError, match="Unknown grid alignment: edge"):
+        spatial.GridSpecs(bbox=(0, 0, 1, 1), resolution=1, align="edge")
+
+
+@pytest.mark.unittest
+def test_gridspecs_from_coordinates(xyz_dataframe):
+    specs = spatial.GridSpecs.from_coordinates(xyz_dataframe, resolution=0.5)
+    assert specs.bbox == (0.0, 0.0, 5.0, 5.0)
+    assert specs.crs is None
+
+    gdf = gpd.GeoDataFrame(
+        xyz_dataframe,
+        geometry=gpd.points_from_xy(xyz_dataframe["x"], xyz_dataframe["y"]),
+        crs=28992,
+    )
+    specs = spatial.GridSpecs.from_coordinates(gdf, resolution=0.5)
+    assert specs.crs == gdf.crs
+    assert specs.to_grid().rio.crs.to_epsg() == 28992
+
+    coordinates = xyz_dataframe.waka.coordinates()
+    specs = spatial.GridSpecs.from_coordinates(coordinates, resolution=0.5)
+    assert specs.bbox == (0.0, 0.0, 5.0, 5.0)
+
+
+@pytest.mark.unittest
+def test_gridspecs_lazy():
+    pytest.importorskip("dask")
+    grid = spatial.GridSpecs(bbox=(0, 0, 1000, 1000), resolution=1, chunks=250)
+    grid = grid.to_grid()
+    assert grid.chunks == ((250,) * 4, (250,) * 4)
+    assert grid.rio.bounds() == (0.0, 0.0, 1000.0, 1000.0)
+
+
+@pytest.mark.unittest
+def test_profiling_stage():
+    with profiling.stage("disabled", n_items=1) as record:
+        record["n_rows"] = 2
+    assert not profiling.get_profiler().records
+
+    with profiling.profile() as profiler:
+        with profiling.stage("outer", n_items=3) as record:
+            small = np.ones(1000)
+            with profiling.stage("inner"):
+                large = np.ones(1_000_000)
+            del large
+            record["n_rows"] = len(small)
+
+    assert not profiling.settings.enabled
+    records = profiler.to_dataframe()
+    assert records.columns[:4].tolist() == [
+        "stage",
+        "parent",
+        "wall_time",
+        "peak_memory",
+    ]
+    assert records["stage"].tolist() == ["inner", "outer"]
+    assert records["parent"].iloc[0] == "outer"
+    assert pd.isna(records["parent"].iloc[1])
+    assert (records["wall_time"] > 0).all()
+
+    # The peak of the outer stage includes the peak of the inner stage
+    assert records["peak_memory"].iloc[0] >= 8_000_000
+    assert records["peak_memory"].iloc[1] >= records["peak_memory"].iloc[0]
+    assert records["n_items"].iloc[1] == 3
+    assert records["n_rows"].iloc[1] == 1000
+
+    summary = profiler.summary()
+    assert summary.loc["inner", "calls"] == 1
+
+    with profiling.profile(memory=False) as profiler:
+        with profiling.stage("no_memory"):
+            pass
+    assert profiler.records[0]["peak_memory"] is None
+
+
+@pytest.mark.unittest
+def test_profiling_to_json(tmp_path):
+    with profiling.profile() as profiler:
+        with profiling.stage("stage", line=np.int64(1)):
+            pass
+
+    text = profiler.to_json(tmp_path / "profile.json")
+    assert (tmp_path / "profile.json").read_text() == text
+    records = pd.read_json(tmp_path / "profile.json")
+    assert records["stage"].tolist() == ["stage"]
+
+
+@pytest.mark.unittest
+def test_profiling_instrumentation(testdatadir, seismic_data):
+    from wakatools import interpolation, read_seismics
+
+    with profiling.profile() as profiler:
+        data = read_seismics(testdatadir / "geocard7.dat", "multi-horizon")
+        grid = spatial.target_grid_from(data, 1)
+        interpolation.tin_surface(
+            data.iloc[:200], value="time", target_grid=grid.isel(x=slice(50))
+        )
+        conversion.calculate_depth(seismic_data)
+
+    records = profiler.to_dataframe().set_index("stage")
+    assert records.loc["read_seismics", "n_rows"] == len(data)
+    assert records.loc["read_seismics.file", "parent"] == "read_seismics"
+    assert records.loc["target_grid_from", "n_cells"] == grid.size
+    for stage in ["tin.triangulate", "tin.find_simplex", "tin.weighting"]:
+        assert stage in records.index
+
+    lines = records.loc["calculate_depth.line"]
+    assert sorted(lines["line"]) == ["line1", "line2"]
+    assert (lines["parent"] == "calculate_depth").all()
@@ -90,3 +90,19 @@ def test_validation_fails_multiple(dummy_target):
         match=r"Interpolation data DataFrame is missing required columns: \['x', 'y'\]",
     ):
         interpolation_validation_passes(df1, df2, value="z", target_grid=dummy_target)
+
+
+@pytest.mark.unittest
+def test_validation_multiple_values(dummy_target):
+    df = pd.DataFrame({"x": [1, 2], "y": [3, 4], "z": [5, 6], "time": [7, 8]})
+    assert interpolation_validation_passes(
+        df, value=["z", "time"], target_grid=dummy_target
+    )
+
+    with pytest.raises(
+        MissingColumnsError,
+        match=r"Interpolation data DataFrame is missing required columns: \['depth'\]",
+    ):
+        interpolation_validation_passes(
+            df, value=["z", "depth"], target_grid=dummy_target
+        )